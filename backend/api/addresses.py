@@ -0,0 +1,165 @@
+"""
+Address autocomplete index for /api/addresses/suggest, built from the addresses table that
+ingest fills (services.ingest.addresses).
+
+Keys are normalized addresses in sorted arrays, so a prefix is one bisect plus a slice:
+  full keys      "1200 w broadway", matched first
+  street keys    every later word onward ("w broadway", "broadway"), so a street name
+                 finds its addresses too; each entry points back at its address
+
+The table is read at startup and again, in the background, after an ingest generation
+newer than the loaded one; requests keep using the current index while it reloads.
+"""
+
+import asyncio
+import bisect
+import logging
+from array import array
+from typing import Any, NamedTuple, Optional
+
+from api.generation import generation_watcher
+from services.ingest.addresses import ABBREVIATIONS, ADDRESS_TABLE, normalize_address
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+# Street keys start at most this many words in; longer tails add little
+MAX_STREET_KEYS = 4
+
+
+class Address(NamedTuple):
+    label: str
+    lon: float
+    lat: float
+    local_area: Optional[str]
+
+
+class AddressIndex:
+    """Sorted-array prefix index over normalized addresses."""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        rows = sorted(rows, key=lambda row: row["address"])
+        self.addresses = [
+            Address(row["label"], float(row["lon"]), float(row["lat"]), row.get("local_area")) for row in rows
+        ]
+        self._full = [row["address"] for row in rows]
+        street = []
+        for i, key in enumerate(self._full):
+            words = key.split(" ")
+            for start in range(1, min(len(words), MAX_STREET_KEYS + 1)):
+                street.append((" ".join(words[start:]), i))
+        street.sort()
+        self._street = [key for key, _ in street]
+        self._street_refs = array("i", (i for _, i in street))
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    @staticmethod
+    def _range(keys: list[str], prefix: str) -> tuple[int, int]:
+        return bisect.bisect_left(keys, prefix), bisect.bisect_left(keys, prefix + "\U0010ffff")
+
+    @staticmethod
+    def prefix_keys(prefix: str) -> list[str]:
+        """
+        Normalized forms of a typed prefix. The last word is kept as typed, since it may be
+        unfinished; when it is already a whole street word ("street", "west"), its short
+        form is searched too.
+        """
+        key = normalize_address(prefix, partial=True)
+        if not key.strip():
+            return []
+        head, _, last = key.rpartition(" ")
+        short = ABBREVIATIONS.get(last)
+        if short is None:
+            return [key]
+        return [key, f"{head} {short}" if head else short]
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[Address]:
+        """
+        Up to `limit` addresses whose normalized form, or street part, starts with the
+        prefix: whole-address matches first, then street matches.
+        """
+        keys = self.prefix_keys(prefix)
+        found: list[int] = []
+        seen: set[int] = set()
+        for index, refs in ((self._full, None), (self._street, self._street_refs)):
+            for key in keys:
+                lo, hi = self._range(index, key)
+                for i in range(lo, hi):
+                    ref = i if refs is None else refs[i]
+                    if ref in seen:
+                        continue
+                    seen.add(ref)
+                    found.append(ref)
+                    if len(found) == limit:
+                        return [self.addresses[i] for i in found]
+        return [self.addresses[i] for i in found]
+
+
+class AddressStore:
+    """Current AddressIndex, reloaded in the background when ingest moves on."""
+
+    def __init__(self) -> None:
+        self.index: Optional[AddressIndex] = None
+        self.generation = -1
+        self.loads = 0
+        self.suggestions = 0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.index is not None
+
+    async def load(self, client) -> None:
+        async with self._lock:
+            generation = await generation_watcher.current(client)
+            rows: list[dict[str, Any]] = []
+            last: Optional[str] = None
+            while True:
+                q = client.table(ADDRESS_TABLE).select("address, label, lon, lat, local_area")
+                if last is not None:
+                    q = q.gt("address", last)
+                r = await q.order("address").limit(PAGE_SIZE).execute()
+                batch = r.data or []
+                rows.extend(batch)
+                if len(batch) < PAGE_SIZE:
+                    break
+                last = batch[-1]["address"]
+            self.index = await asyncio.to_thread(AddressIndex, rows)
+            self.generation = generation
+            self.loads += 1
+            logger.info("Loaded %s address(es)", len(rows))
+
+    async def _reload(self, client) -> None:
+        try:
+            await self.load(client)
+        except Exception as e:
+            logger.warning("Could not load addresses: %s", e)
+        finally:
+            self._task = None
+
+    async def ensure(self, client) -> None:
+        """Load on first use; after a newer ingest generation, reload in the background."""
+        if self._task is None and (self.index is None or await generation_watcher.current(client) > self.generation):
+            self._task = asyncio.ensure_future(self._reload(client))
+        if self.index is None and self._task is not None:
+            # Concurrent first requests share one load
+            await asyncio.shield(self._task)
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[Address]:
+        self.suggestions += 1
+        return self.index.suggest(prefix, limit)
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "addresses": len(self.index) if self.index else 0,
+            "generation": self.generation,
+            "loads": self.loads,
+            "suggestions": self.suggestions,
+        }
+
+
+address_store = AddressStore()
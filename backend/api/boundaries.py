@@ -0,0 +1,145 @@
+"""
+Neighbourhood boundaries held in the API process.
+
+The seeded neighborhoods.boundary polygons (van_local_area_boundary) are read once at
+startup and re-read every NEIGHBOURHOODS_BOUNDARY_TTL seconds (default 3600; the seed
+does not bump the ingest generation). Each load builds:
+  - a prepared PolygonIndex, so /api/neighbourhoods/locate answers without a database round trip;
+  - the /api/neighbourhoods/boundaries GeoJSON for every zoom band, simplified to about one
+    pixel at the band's zoom with shared edges kept shared, rounded to that precision and
+    serialized and precompressed once.
+Both are built in a worker thread and swapped in together; requests keep using the previous
+boundaries while a reload runs.
+
+Needs numpy for the index; both endpoints report 503 when it is missing.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, NamedTuple, Optional
+
+from api.compression import precompress
+from api.http_cache import body_etag
+
+logger = logging.getLogger(__name__)
+
+try:
+    from api.geo.polygons import PolygonIndex
+    from api.geo.simplify import Coverage, decimals_for, pixel_tolerance_deg
+except ImportError:  # numpy missing
+    PolygonIndex = None
+
+# Each zoom is served from the highest band at or below it (zooms under the first use the first)
+ZOOM_BANDS = (8, 10, 12, 14, 16)
+
+
+class Boundary(NamedTuple):
+    id: str
+    name: str
+    geometry: Any
+
+
+class Shapes(NamedTuple):
+    body: bytes
+    etag: str
+    encoded: dict[str, bytes]
+    # (boundary, simplified GeoJSON geometry) pairs behind the body, reused by /tiles
+    features: list[tuple[Boundary, dict]]
+
+
+def zoom_band(zoom: int) -> int:
+    return max([b for b in ZOOM_BANDS if b <= zoom], default=ZOOM_BANDS[0])
+
+
+def build_shapes(boundaries: list[Boundary]) -> dict[int, Shapes]:
+    """GeoJSON FeatureCollection bytes per zoom band."""
+    coverage = Coverage([b.geometry for b in boundaries])
+    shapes = {}
+    for band in ZOOM_BANDS:
+        tolerance = pixel_tolerance_deg(band, coverage.mid_lat)
+        geometries = coverage.simplified(tolerance, decimals_for(tolerance))
+        kept = [(b, geometry) for b, geometry in zip(boundaries, geometries) if geometry is not None]
+        features = [
+            {"type": "Feature", "id": b.id, "properties": {"id": b.id, "name": b.name}, "geometry": geometry}
+            for b, geometry in kept
+        ]
+        body = json.dumps({"type": "FeatureCollection", "features": features}, separators=(",", ":")).encode()
+        shapes[band] = Shapes(body, body_etag(body), precompress(body), kept)
+    return shapes
+
+
+class BoundaryStore:
+    """Current boundaries plus their point-in-polygon index, reloaded after `ttl` seconds."""
+
+    def __init__(self, ttl: float = 3600.0, grid: int = 256) -> None:
+        self.ttl = ttl
+        self.grid = grid
+        self.boundaries: list[Boundary] = []
+        self.index: Optional["PolygonIndex"] = None
+        self.shapes: dict[int, Shapes] = {}
+        self.version = 0
+        self._loaded_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self.loads = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.index is not None
+
+    def _build(self, boundaries: list[Boundary]) -> tuple[Optional["PolygonIndex"], dict[int, Shapes]]:
+        """Index and per-band shapes for `boundaries`; runs in a worker thread."""
+        if PolygonIndex is None:
+            return None, {}
+        return PolygonIndex([b.geometry for b in boundaries], self.grid), build_shapes(boundaries)
+
+    async def load(self, client) -> None:
+        r = await client.table("neighborhoods").select("id, name, boundary").execute()
+        boundaries = [Boundary(str(row["id"]), row["name"], row.get("boundary")) for row in r.data or []]
+        index, shapes = await asyncio.to_thread(self._build, boundaries)
+        self.boundaries, self.index, self.shapes = boundaries, index, shapes
+        self.version += 1
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+        logger.info("Loaded %s neighbourhood boundaries", len(boundaries))
+
+    async def ensure(self, client) -> None:
+        """
+        Load on first use and after the TTL; a failed reload keeps the previous boundaries.
+        Once loaded, requests do not wait for a reload another request is running.
+        """
+        if time.monotonic() - self._loaded_at < self.ttl or (self.ready and self._lock.locked()):
+            return
+        async with self._lock:
+            if time.monotonic() - self._loaded_at < self.ttl:
+                return
+            try:
+                await self.load(client)
+            except Exception as e:
+                logger.warning("Could not load neighbourhood boundaries: %s", e)
+                if self.boundaries:
+                    self._loaded_at = time.monotonic()
+
+    def locate(self, lng: float, lat: float) -> Optional[Boundary]:
+        i = self.index.locate(lng, lat)
+        return None if i is None else self.boundaries[i]
+
+    def locate_many(self, lngs, lats) -> list[Optional[Boundary]]:
+        return [None if i is None else self.boundaries[i] for i in self.index.locate_many(lngs, lats)]
+
+    def shapes_for(self, zoom: int) -> Shapes:
+        return self.shapes[zoom_band(zoom)]
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "boundaries": len(self.boundaries),
+            "loads": self.loads,
+            "boundary_cells": len(self.index.cell_edges) if self.index else 0,
+            "shape_bytes": {band: len(shapes.body) for band, shapes in self.shapes.items()},
+        }
+
+
+boundary_store = BoundaryStore(ttl=float(os.environ.get("NEIGHBOURHOODS_BOUNDARY_TTL", 3600)))
@@ -0,0 +1,137 @@
+"""
+Bounded in-process LRU cache with per-entry TTL for API responses.
+Entries are tagged with the ingest generation they were built from; a lookup
+under a newer generation treats the entry as stale, so new data shows up as soon
+as the ingest lands instead of when the TTL runs out.
+SingleFlight coalesces concurrent identical upstream calls on a cold cache.
+Sizing via env: EVENTS_CACHE_MAXSIZE (entries), EVENTS_CACHE_TTL (seconds);
+NEIGHBOURHOODS_CACHE_TTL for the neighbourhood list.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple
+
+MISSING = object()
+
+
+class _Entry(NamedTuple):
+    value: Any
+    generation: int
+    expires_at: float
+
+
+class TTLCache:
+    """LRU cache: at most `maxsize` entries, each valid for `ttl` seconds and one generation."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_env(cls, prefix: str, maxsize: int = 256, ttl: float = 300.0) -> "TTLCache":
+        return cls(
+            maxsize=int(os.environ.get(f"{prefix}_MAXSIZE", maxsize)),
+            ttl=float(os.environ.get(f"{prefix}_TTL", ttl)),
+        )
+
+    def get(self, key: Hashable, generation: int) -> Any:
+        """Cached value for key under `generation`, or MISSING."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            if entry.generation != generation:
+                del self._data[key]
+                self.invalidations += 1
+                self.misses += 1
+                return MISSING
+            if entry.expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        with self._lock:
+            self._data[key] = _Entry(value, generation, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+
+class SingleFlight:
+    """
+    At most one in-flight call per key: concurrent callers with the same key await the
+    first caller's task instead of starting their own. The shared task is shielded, so a
+    disconnecting caller does not cancel the call for the others.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self.executions += 1
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+events_cache = TTLCache.from_env("EVENTS_CACHE")
+# Neighbourhoods change only when the boundary seed runs; one entry, long TTL
+neighbourhoods_cache = TTLCache.from_env("NEIGHBOURHOODS_CACHE", maxsize=1, ttl=3600.0)
+events_flight = SingleFlight()
@@ -0,0 +1,144 @@
+"""
+Change log behind GET /api/events/changes (delta sync).
+
+A sync token carries a keyset position over (change stamp, id) plus the wall-clock time of
+the sync that issued it. The change stamp is max(updated_at, created_at), or, for rows with
+neither, the ingest generation that first wrote the row's current content
+(api.replica.change_stamp). Rows past that position come straight from the
+replica in keyset order. Rows at or before it cannot be found that way when they change
+again, so this log records, by detection time, what the replica sees:
+
+  deleted   ids that vanish from a full reload (the events table keeps no tombstones)
+  changed   rows that are new or differ from their last seen copy; a sync takes the ones
+            its keyset has already passed: source timestamps that predate the watermark,
+            edits that left updated_at alone, rows that changed mid-sync
+
+A sync returns the entries detected after the token's sync time. History starts at the
+first full load of this process and is kept for EVENTS_CHANGES_RETENTION seconds
+(default 7 days); tokens issued before that can no longer be brought up to date.
+
+Each worker keeps its own log and refreshes its own replica, so detection times differ
+between workers: another worker may have detected a change or deletion only up to a full
+reload interval (plus the pull overlap) after this one. A token names the process that
+issued it, and a token from another process is replayed from that much earlier. Entries
+are resent rather than missed, and replaying them is harmless.
+
+The log also remembers when each event was first seen, so a sync only sends tombstones
+for events that existed when its token was issued.
+"""
+
+import os
+import time
+import uuid
+from typing import Any, Optional
+
+from api.feed import fingerprint
+from api.replica import event_replica
+
+
+def now_us() -> int:
+    return time.time_ns() // 1000
+
+
+class ChangeLog:
+    """Deletions and changes seen by the replica, by detection time."""
+
+    def __init__(self, retention: float = 7 * 86400.0) -> None:
+        self.retention_us = int(retention * 1_000_000)
+        self.since_us: Optional[int] = None
+        self._seen: dict[str, int] = {}
+        self._deleted: dict[str, int] = {}
+        self._changed: dict[str, int] = {}
+        self._born: dict[str, int] = {}
+        # Names this process in the tokens it issues
+        self.issuer = uuid.uuid4().hex[:12]
+
+    @classmethod
+    def from_env(cls) -> "ChangeLog":
+        return cls(float(os.environ.get("EVENTS_CHANGES_RETENTION", 7 * 86400)))
+
+    def covers(self, synced_us: int, now: Optional[int] = None) -> bool:
+        """True when every change after `synced_us` is still known."""
+        now = now_us() if now is None else now
+        return self.since_us is not None and self.since_us <= synced_us and synced_us >= now - self.retention_us
+
+    @staticmethod
+    def _lag_us() -> int:
+        """How much later than this worker another one may detect the same change."""
+        return int(event_replica.full_reload_interval * 1_000_000) + event_replica.pull_overlap_us
+
+    def replay_from(self, synced_us: int, issuer: Optional[str]) -> int:
+        """Detection time to replay a token from: its sync time, moved back when another process issued it."""
+        return synced_us if issuer == self.issuer else synced_us - self._lag_us()
+
+    def could_have_sent(self, event_id: str, synced_us: int, issuer: Optional[str]) -> bool:
+        """
+        False when the event was first seen after the token's sync, so no sync up to then
+        sent it; another process may have seen it up to the lag earlier.
+        """
+        born = self._born.get(event_id)
+        if born is None:
+            return False
+        return born <= (synced_us if issuer == self.issuer else synced_us + self._lag_us())
+
+    def record(self, rows: list[dict[str, Any]], full: bool, replica=None):
+        """
+        Replica listener: diff the rows (and, on full reloads, find deletions) off the loop;
+        the returned commit logs them, timed when the refresh becomes visible.
+        """
+        primed = self.since_us is not None
+        seen = {} if full else self._seen
+        changed = []
+        for row in rows:
+            event_id = str(row["id"])
+            current = fingerprint(row)
+            if primed and self._seen.get(event_id) != current:
+                changed.append(event_id)
+            seen[event_id] = current
+        revived = [i for i in seen if i in self._deleted] if full else [str(r["id"]) for r in rows]
+        deleted = list(self._seen.keys() - seen.keys()) if full and primed else []
+        born = [i for i in (seen if full else revived) if i not in self._born]
+        self._seen = seen
+
+        def commit() -> None:
+            now = now_us()
+            for event_id in revived:
+                self._deleted.pop(event_id, None)
+            for event_id in changed:
+                self._changed[event_id] = now
+            for event_id in born:
+                self._born[event_id] = now
+            for event_id in deleted:
+                self._deleted[event_id] = now
+                self._changed.pop(event_id, None)
+                self._born.pop(event_id, None)
+            if not primed:
+                self.since_us = now
+            self._prune(now)
+
+        return commit
+
+    def _prune(self, now: int) -> None:
+        horizon = now - self.retention_us
+        for log in (self._deleted, self._changed):
+            for event_id in [i for i, at in log.items() if at < horizon]:
+                del log[event_id]
+
+    def deleted_between(self, lo_us: int, hi_us: int) -> list[str]:
+        """Ids deleted after lo_us, up to and including hi_us."""
+        return [i for i, at in self._deleted.items() if lo_us < at <= hi_us]
+
+    def changed_between(self, lo_us: int, hi_us: int) -> list[str]:
+        """Ids changed after lo_us, up to and including hi_us."""
+        return [i for i, at in self._changed.items() if lo_us < at <= hi_us]
+
+    def stats(self) -> dict:
+        return {
+            "tracked": len(self._seen),
+            "deleted": len(self._deleted),
+            "changed": len(self._changed),
+        }
+
+
+change_log = ChangeLog.from_env()
+event_replica.subscribe(change_log.record)
@@ -0,0 +1,209 @@
+"""
+Response compression: Accept-Encoding negotiation, a middleware for bodies built per
+request, and precompressed variants for bodies that are cached and served many times.
+
+CompressionMiddleware compresses responses of compressible media types at or above
+COMPRESS_MIN_SIZE bytes (default 1024) with brotli (when installed) or gzip, as the client
+prefers. Streamed responses are compressed chunk by chunk and flushed after each chunk, so
+NDJSON rows still reach the client as they are written. Responses that already carry a
+Content-Encoding, e.g. a precompressed cached body, pass through untouched. A compressed
+response's strong ETag gets the coding as a suffix ("abc" -> "abc-gzip"), since the
+coded bytes are a different representation.
+
+precompress() builds those cached variants once, at higher levels than the middleware
+uses, so a cache hit costs no compression CPU at all.
+
+Configure via env:
+  COMPRESS_MIN_SIZE         smallest body worth compressing, in bytes (default 1024)
+  COMPRESS_GZIP_LEVEL       gzip level per request (default 6; precompressed: 9)
+  COMPRESS_BROTLI_QUALITY   brotli quality per request (default 5; precompressed: 9)
+"""
+
+import os
+import zlib
+from typing import Optional
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+GZIP_LEVEL = int(os.environ.get("COMPRESS_GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", 5))
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 9
+# Bodies this large are compressed off the event loop
+THREAD_MIN_SIZE = 128 * 1024
+
+# Preferred first when the client accepts both at the same q
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/geo+json",
+    "application/x-ndjson",
+    "application/vnd.mapbox-vector-tile",
+    "application/vnd.apache.arrow.file",
+)
+
+
+def compressible(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    # Not text/event-stream: SSE messages are tiny and some proxies buffer encoded streams
+    return media_type in COMPRESSIBLE_TYPES or (media_type.startswith("text/") and media_type != "text/event-stream")
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    The encoding to use for an Accept-Encoding header, or None for identity.
+    Highest q wins, ties go to ENCODINGS order; q=0 refuses an encoding and * stands for
+    any encoding not listed.
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding.lower()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in ENCODINGS:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, precompressed: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=PRECOMPRESS_BROTLI_QUALITY if precompressed else BROTLI_QUALITY)
+    compressor = _gzip_compressor(PRECOMPRESS_GZIP_LEVEL if precompressed else GZIP_LEVEL)
+    return compressor.compress(body) + compressor.flush()
+
+
+def _gzip_compressor(level: int):
+    # wbits 31: gzip container (header and CRC), as Content-Encoding: gzip expects
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def precompress(body: bytes | memoryview) -> dict[str, bytes]:
+    """Every supported encoding of a cached body, keeping only variants that are smaller."""
+    if len(body) < MIN_SIZE:
+        return {}
+    body = bytes(body)
+    variants = {encoding: compress(body, encoding, precompressed=True) for encoding in ENCODINGS}
+    return {encoding: data for encoding, data in variants.items() if len(data) < len(body)}
+
+
+def coded_etag(etag: str, encoding: str) -> str:
+    """ETag of the encoding-coded variant of a representation: "abc" -> "abc-br"."""
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def add_vary(headers: MutableHeaders, field: str) -> None:
+    """Append a field to Vary unless it is already listed."""
+    current = [v.strip() for v in headers.get("vary", "").split(",") if v.strip()]
+    if field.lower() not in (v.lower() for v in current):
+        headers["Vary"] = ", ".join(current + [field])
+
+
+class _StreamCompressor:
+    """Incremental compressor whose output is decodable up to every flushed chunk."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._gz = _gzip_compressor(GZIP_LEVEL)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._br.finish()
+        return self._gz.flush()
+
+
+class CompressionMiddleware:
+    """Compress eligible responses with the client's preferred encoding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = MIN_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        start: Optional[Message] = None
+        stream: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, stream, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                eligible = compressible(headers.get("content-type", "")) and message["status"] not in (204, 206, 304)
+                if eligible and "content-encoding" not in headers:
+                    add_vary(headers, "Accept-Encoding")
+                if not eligible or encoding is None or "content-encoding" in headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message  # held until the first body chunk decides
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is None and start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                if "etag" in headers:
+                    headers["ETag"] = coded_etag(headers["etag"], encoding)
+                if not more_body:
+                    if len(body) >= THREAD_MIN_SIZE:
+                        compressed = await anyio.to_thread.run_sync(compress, body, encoding)
+                    else:
+                        compressed = compress(body, encoding)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                headers["Content-Encoding"] = encoding
+                del headers["Content-Length"]
+                await send(start)
+                start = None
+                stream = _StreamCompressor(encoding)
+            data = stream.chunk(body) if body else b""
+            if not more_body:
+                data += stream.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,87 @@
+"""
+Per-day event counters shared by the stats rollups (api.rollups) and the heatmap hex bins
+(api.geo.hexgrid).
+
+Each event counts once per layer on one day (start_date, else published_at, UTC), under
+one key per layer. Counts are kept as layer -> day -> {key: count}, plus a per-layer
+total across days, and every event's current contribution is remembered by id. A changed
+event replaces its previous contribution instead of adding to it, so updates and moves
+never double-count, and a query sums only the day buckets inside its window.
+"""
+
+from collections import Counter
+from typing import Any, Hashable, Iterable, Iterator, Optional
+
+from api.replica import epoch_day
+
+# An event's contribution: its day and one key per layer
+Contribution = tuple[int, tuple[Hashable, ...]]
+
+
+def event_day(row: dict[str, Any]) -> Optional[int]:
+    """The day an event counts on: its start_date, else its published_at (epoch day, UTC)."""
+    return epoch_day(row.get("start_date") or row.get("published_at"))
+
+
+class DayCounts:
+    """Exact, updatable counts by layer, day and key."""
+
+    def __init__(self, layers: int = 1) -> None:
+        self.layers = layers
+        self.reset()
+
+    def reset(self) -> None:
+        self._days: list[dict[int, Counter]] = [{} for _ in range(self.layers)]
+        self._totals: list[Counter] = [Counter() for _ in range(self.layers)]
+        self._contrib: dict[str, Contribution] = {}
+
+    def __len__(self) -> int:
+        return len(self._contrib)
+
+    def _add(self, day: int, keys: tuple[Hashable, ...], sign: int) -> None:
+        for layer, key in enumerate(keys):
+            days = self._days[layer]
+            counter = days.setdefault(day, Counter())
+            for c in (counter, self._totals[layer]):
+                c[key] += sign
+                if c[key] <= 0:
+                    del c[key]
+            if not counter:
+                del days[day]
+
+    def apply(self, contributions: Iterable[tuple[str, Optional[Contribution]]]) -> None:
+        """
+        Set each event's contribution, given as (event id, (day, keys) or None); None drops
+        the event. An id repeated in the batch counts once, with its last contribution.
+        """
+        for event_id, contribution in contributions:
+            old = self._contrib.pop(event_id, None)
+            if old is not None:
+                self._add(*old, sign=-1)
+            if contribution is not None:
+                self._contrib[event_id] = contribution
+                self._add(*contribution, sign=1)
+
+    def days(
+        self, layer: int = 0, start_day: Optional[int] = None, end_day: Optional[int] = None
+    ) -> Iterator[tuple[int, Counter]]:
+        """(day, key counts) of a layer, within [start_day, end_day] when given."""
+        for day, counter in self._days[layer].items():
+            if start_day is None or start_day <= day <= end_day:
+                yield day, counter
+
+    def counters(
+        self, layer: int = 0, start_day: Optional[int] = None, end_day: Optional[int] = None
+    ) -> list[Counter]:
+        """Key counts to sum for a window: the layer total when there is no window."""
+        if start_day is None:
+            return [self._totals[layer]]
+        return [counter for _, counter in self.days(layer, start_day, end_day)]
+
+    def keys(self, layer: int = 0) -> int:
+        """Number of distinct keys with a count in a layer."""
+        return len(self._totals[layer])
+
+    def day_count(self, layer: int = 0) -> int:
+        """Number of days with a count in a layer."""
+        return len(self._days[layer])
@@ -1,11 +1,20 @@
 """
 Supabase client and env loading for the API.
 Reuses the same env vars as services.ingest.load_events.
+
+One async client is built per process in the app lifespan (see api.main) and shared by
+all requests, so PostgREST calls reuse pooled keep-alive connections instead of
+paying client construction and a TLS handshake on every request.
+Pool sizing via env: SUPABASE_POOL_MAX_CONNECTIONS, SUPABASE_POOL_MAX_KEEPALIVE,
+SUPABASE_POOL_KEEPALIVE_EXPIRY (seconds), SUPABASE_HTTP2 (1/0), SUPABASE_TIMEOUT (seconds).
 """
 
 import os
+from dataclasses import dataclass
 from pathlib import Path
 
+from fastapi import Request
+
 _REPO_ROOT = Path(__file__).resolve().parent.parent.parent
 
 
@@ -20,12 +29,53 @@ def _load_dotenv() -> None:
 _load_dotenv()
 
 
-def get_supabase():
-    """
-    Build Supabase client from sb_url/sb_secret or SUPABASE_URL/SUPABASE_SERVICE_ROLE_KEY.
-    Read-only usage from API is fine with service_role.
-    """
-    from supabase import create_client
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 keep-alive."""
+    if os.environ.get("SUPABASE_HTTP2", "1").strip().lower() in ("0", "false", "no"):
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool limits for the shared PostgREST HTTP client."""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    timeout: float = 30.0
+    http2: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            max_connections=_env_int("SUPABASE_POOL_MAX_CONNECTIONS", cls.max_connections),
+            max_keepalive_connections=_env_int("SUPABASE_POOL_MAX_KEEPALIVE", cls.max_keepalive_connections),
+            keepalive_expiry=_env_float("SUPABASE_POOL_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+            timeout=_env_float("SUPABASE_TIMEOUT", cls.timeout),
+            http2=_http2_available(),
+        )
+
+
+def _credentials() -> tuple[str, str]:
     url = os.environ.get("sb_url") or os.environ.get("SUPABASE_URL")
     key = os.environ.get("sb_secret") or os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
     if not url or not key:
@@ -33,4 +83,46 @@ def get_supabase():
             "Missing sb_url or sb_secret (or SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY) in environment. "
             "Use the service_role key (Settings → API in Supabase), not the anon key."
         )
-    return create_client(url, key)
+    return url, key
+
+
+async def open_supabase(settings: PoolSettings | None = None):
+    """
+    Build the process-wide async Supabase client on top of one pooled httpx.AsyncClient.
+    Read-only usage from API is fine with service_role. Close with close_supabase().
+    """
+    import httpx
+    from supabase import acreate_client
+    from supabase.lib.client_options import AsyncClientOptions
+
+    url, key = _credentials()
+    settings = settings or PoolSettings.from_env()
+    http_client = httpx.AsyncClient(
+        http2=settings.http2,
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        timeout=settings.timeout,
+    )
+    return await acreate_client(url, key, AsyncClientOptions(httpx_client=http_client))
+
+
+async def close_supabase(client) -> None:
+    """Release the pooled connections held by a client from open_supabase()."""
+    http_client = getattr(getattr(client, "options", None), "httpx_client", None)
+    if http_client is not None:
+        await http_client.aclose()
+
+
+async def get_supabase(request: Request):
+    """
+    FastAPI dependency: the shared client created in the app lifespan.
+    Built lazily if the lifespan did not run (e.g. app mounted without startup).
+    """
+    client = getattr(request.app.state, "supabase", None)
+    if client is None:
+        client = await open_supabase()
+        request.app.state.supabase = client
+    return client
@@ -0,0 +1,127 @@
+"""
+Live feed of new and changed events for GET /api/events/stream.
+
+Fed by the event replica: each refresh (woken by the ingest generation, or at once by an
+INGEST_NOTIFY_PATH notification) hands its rows to the feed, which forwards the ones that
+are new or differ from the last copy it saw to every matching subscriber. Rows are
+compared by fingerprint rather than by timestamp, so a full reload pushes only what
+actually changed and the initial load pushes nothing.
+
+Each subscriber has a bounded queue. One that falls MAX_PENDING batches behind has its
+backlog replaced by a single reset, telling the client to refetch its window.
+"""
+
+import asyncio
+import logging
+from typing import Any, NamedTuple, Optional
+
+from api.replica import event_replica
+
+logger = logging.getLogger(__name__)
+
+MAX_PENDING = 64
+_FINGERPRINT_FIELDS = (
+    "neighborhood_id", "title", "type", "summary", "source",
+    "location", "start_date", "end_date", "published_at", "updated_at",
+)
+
+
+class FeedMessage(NamedTuple):
+    kind: str  # "events" (rows in `rows`) or "reset"
+    generation: int
+    rows: list[dict[str, Any]]
+
+
+def fingerprint(row: dict[str, Any]) -> int:
+    return hash(tuple(str(row.get(f)) for f in _FINGERPRINT_FIELDS))
+
+
+class Subscription:
+    def __init__(self, event_type: Optional[str], neighborhood_id: Optional[str]) -> None:
+        self.event_type = event_type
+        self.neighborhood_id = neighborhood_id
+        self.queue: asyncio.Queue[FeedMessage] = asyncio.Queue(MAX_PENDING)
+
+    def matches(self, row: dict[str, Any]) -> bool:
+        if self.event_type is not None and row.get("type") != self.event_type:
+            return False
+        if self.neighborhood_id is not None and str(row.get("neighborhood_id")) != self.neighborhood_id:
+            return False
+        return True
+
+    def put(self, message: FeedMessage) -> bool:
+        """Queue a message; on overflow, collapse the backlog into one reset. False on overflow."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(FeedMessage("reset", message.generation, []))
+            return False
+
+
+class EventFeed:
+    """Fan-out of changed replica rows to live subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: set[Subscription] = set()
+        self._seen: dict[str, int] = {}
+        self._primed = False
+        self.published = 0
+        self.overflows = 0
+
+    def subscribe(self, event_type: Optional[str] = None, neighborhood_id: Optional[str] = None) -> Subscription:
+        subscription = Subscription(event_type, neighborhood_id)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def changed_rows(self, rows: list[dict[str, Any]], full: bool) -> list[dict[str, Any]]:
+        """Rows that are new or differ from their last seen copy; remembers the new copies."""
+        changed = {}
+        seen = {} if full else self._seen
+        for row in rows:
+            event_id = str(row["id"])
+            current = fingerprint(row)
+            if self._seen.get(event_id) != current:
+                changed[event_id] = row
+            seen[event_id] = current
+        self._seen = seen
+        if not self._primed:
+            self._primed = True
+            return []
+        return list(changed.values())
+
+    def publish(self, rows: list[dict[str, Any]], full: bool, replica=None):
+        """
+        Replica listener: diff the rows off the loop; the returned commit forwards the
+        changed ones to each subscriber they match once the refresh is visible.
+        """
+        changed = self.changed_rows(rows, full)
+        if not changed:
+            return None
+        return lambda: self._fan_out(changed)
+
+    def _fan_out(self, changed: list[dict[str, Any]]) -> None:
+        generation = event_replica.generation
+        for subscription in list(self._subscribers):
+            matching = [row for row in changed if subscription.matches(row)]
+            if matching and not subscription.put(FeedMessage("events", generation, matching)):
+                self.overflows += 1
+        self.published += len(changed)
+        logger.info("Event feed: %s changed event(s) to %s subscriber(s)", len(changed), len(self._subscribers))
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "tracked": len(self._seen),
+            "published": self.published,
+            "overflows": self.overflows,
+        }
+
+
+event_feed = EventFeed()
+event_replica.subscribe(event_feed.publish)
@@ -0,0 +1,123 @@
+"""
+Ingest generation as seen by the API.
+services.ingest.load_events appends a row to ingest_generations after every upsert;
+the API reads the latest one at most every INGEST_GENERATION_POLL_INTERVAL seconds
+(default 5) so checking freshness costs one tiny PostgREST query per interval, not per request.
+
+When INGEST_NOTIFY_PATH names the file load_events appends its notifications to, the
+watcher tails it (every INGEST_NOTIFY_POLL_INTERVAL seconds, default 0.25) and wakes the
+background refreshers as soon as a new generation is written.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+from services.ingest.generation import GENERATION_TABLE, NOTIFY_PATH_ENV
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationWatcher:
+    """Caches the latest ingest generation for `poll_interval` seconds."""
+
+    def __init__(
+        self, poll_interval: float = 5.0, notify_path: Optional[str] = None, notify_interval: float = 0.25
+    ) -> None:
+        self.poll_interval = poll_interval
+        self.notify_path = notify_path
+        self.notify_interval = notify_interval
+        self.generation = 0
+        self.notifications = 0
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def current(self, client) -> int:
+        """Latest generation; re-read from Supabase when the cached value is older than poll_interval."""
+        if time.monotonic() - self._checked_at < self.poll_interval:
+            return self.generation
+        async with self._lock:
+            if time.monotonic() - self._checked_at < self.poll_interval:
+                return self.generation
+            try:
+                r = await (
+                    client.table(GENERATION_TABLE)
+                    .select("generation")
+                    .order("generation", desc=True)
+                    .limit(1)
+                    .execute()
+                )
+                if r.data:
+                    self.generation = int(r.data[0]["generation"])
+            except Exception as e:
+                # Keep serving with the last known generation; TTLs still bound staleness
+                logger.warning("Could not read ingest generation: %s", e)
+            self._checked_at = time.monotonic()
+        return self.generation
+
+    async def wait(self, timeout: float) -> None:
+        """Sleep up to `timeout` seconds, returning early when a notification arrives."""
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def notify(self, generation: int) -> None:
+        """Take a newer generation without a round trip and wake every waiter."""
+        if generation <= self.generation:
+            return
+        self.generation = generation
+        self._checked_at = time.monotonic()
+        self.notifications += 1
+        # Swap in a fresh event so later waiters block again
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def _tail(self) -> None:
+        offset = None
+        while True:
+            try:
+                size = os.path.getsize(self.notify_path)
+            except OSError:
+                size = 0
+            if offset is None or size < offset:
+                offset = size  # start at the end; a truncated file starts over
+            elif size > offset:
+                with open(self.notify_path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read(size - offset)
+                # Only whole lines; a partly written one is read on the next pass
+                complete = data[: data.rfind(b"\n") + 1]
+                offset += len(complete)
+                for line in complete.splitlines():
+                    try:
+                        self.notify(int(json.loads(line)["generation"]))
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning("Ignoring malformed ingest notification: %r", line[:200])
+            await asyncio.sleep(self.notify_interval)
+
+    def start(self) -> None:
+        if self.notify_path and self._task is None:
+            self._task = asyncio.ensure_future(self._tail())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+generation_watcher = GenerationWatcher(
+    float(os.environ.get("INGEST_GENERATION_POLL_INTERVAL", 5)),
+    notify_path=os.environ.get(NOTIFY_PATH_ENV) or None,
+    notify_interval=float(os.environ.get("INGEST_NOTIFY_POLL_INTERVAL", 0.25)),
+)
@@ -0,0 +1,190 @@
+"""
+Zoom-aware point clustering as a precomputed quadtree hierarchy.
+
+Points are projected to web mercator and sorted by their Morton (Z-order) key at
+LEAF_DEPTH. A cluster at zoom z is every point sharing the key prefix of depth
+z + CELL_DEPTH (a cell CLUSTER_PX pixels wide at that zoom), and with Z-ordering every
+cluster at every zoom is a contiguous run of the sorted points. Each zoom level is stored
+as (cell key, first point) runs, built once per replica refresh.
+
+Queries never recluster: a filter (date window, type) becomes a boolean mask in point
+order, and a cluster's filtered count, centroid and per-type breakdown are differences of
+prefix sums over its run.
+"""
+
+import math
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+from api.geo.mvt import mercator_xy
+
+MAX_CLUSTER_ZOOM = 16
+# Cluster cells are 2**-CELL_DEPTH of a 256px tile: 64px
+CELL_DEPTH = 2
+CLUSTER_PX = 256 >> CELL_DEPTH
+LEAF_DEPTH = MAX_CLUSTER_ZOOM + CELL_DEPTH
+
+
+def _spread_bits(v):
+    """Interleave zeros between the low 32 bits of v (uint64 arrays)."""
+    v = v & np.uint64(0xFFFFFFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+
+def _compact_bits(v):
+    """Inverse of _spread_bits."""
+    v = v & np.uint64(0x5555555555555555)
+    v = (v | (v >> np.uint64(1))) & np.uint64(0x3333333333333333)
+    v = (v | (v >> np.uint64(2))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v >> np.uint64(4))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v >> np.uint64(8))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v >> np.uint64(16))) & np.uint64(0x00000000FFFFFFFF)
+    return v
+
+
+class _Level(NamedTuple):
+    starts: np.ndarray  # first point of each cluster; the run ends at the next start
+    cx: np.ndarray  # cell column / row at this level's depth
+    cy: np.ndarray
+
+
+class Prefix(NamedTuple):
+    """Prefix sums over the point order for one filter mask."""
+
+    count: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    types: dict[int, np.ndarray]
+
+
+class ClusterIndex:
+    """Quadtree cluster hierarchy over (lon, lat) arrays indexed by replica position."""
+
+    def __init__(self) -> None:
+        self.positions = np.empty(0, dtype=np.int64)
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+        self._types = np.empty(0, dtype=np.int16)
+        self._levels: list[_Level] = []
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def build(self, lon, lat, types) -> None:
+        """Index every position whose lon/lat is not NaN; types is the per-position type code."""
+        positions = np.nonzero(~(np.isnan(lon) | np.isnan(lat)))[0]
+        x, y = mercator_xy(lon[positions], lat[positions])
+        side = 1 << LEAF_DEPTH
+        ix = np.clip((x * side).astype(np.int64), 0, side - 1).astype(np.uint64)
+        iy = np.clip((y * side).astype(np.int64), 0, side - 1).astype(np.uint64)
+        keys = _spread_bits(ix) | (_spread_bits(iy) << np.uint64(1))
+        order = np.argsort(keys, kind="stable")
+        self.positions = positions[order]
+        self._keys = keys[order]
+        self._x, self._y = x[order], y[order]
+        self._types = types[self.positions]
+        levels = []
+        for zoom in range(MAX_CLUSTER_ZOOM + 1):
+            shift = np.uint64(2 * (LEAF_DEPTH - zoom - CELL_DEPTH))
+            cell_keys = self._keys >> shift
+            if len(cell_keys):
+                starts = np.flatnonzero(np.r_[True, cell_keys[1:] != cell_keys[:-1]])
+            else:
+                starts = np.empty(0, dtype=np.int64)
+            run_keys = cell_keys[starts]
+            cx = _compact_bits(run_keys).astype(np.int64)
+            cy = _compact_bits(run_keys >> np.uint64(1)).astype(np.int64)
+            levels.append(_Level(starts, cx, cy))
+        self._levels = levels
+        self.version += 1
+
+    def prefix(self, mask: Optional[np.ndarray] = None) -> Prefix:
+        """Prefix sums for a mask over replica positions (None = every point)."""
+        keep = np.ones(len(self.positions), dtype=bool) if mask is None else mask[self.positions]
+        weights = keep.astype(np.float64)
+        count = np.r_[0, np.cumsum(keep, dtype=np.int64)]
+        types = {
+            int(code): np.r_[0, np.cumsum(keep & (self._types == code), dtype=np.int64)]
+            for code in np.unique(self._types[keep])
+        }
+        return Prefix(count, np.r_[0.0, np.cumsum(self._x * weights)], np.r_[0.0, np.cumsum(self._y * weights)], types)
+
+    def _expansion_zoom(self, first, last):
+        """
+        Lowest zoom at which the runs' first and last kept points fall in different clusters
+        (-1: they share a cell even at MAX_CLUSTER_ZOOM, e.g. events at one address).
+        """
+        diff = self._keys[first] ^ self._keys[last]
+        out = np.full(len(diff), -1, dtype=np.int64)
+        nonzero = diff > 0
+        # Highest differing bit -> Morton level at which the two keys' prefixes diverge
+        bit = np.floor(np.log2(diff[nonzero].astype(np.float64))).astype(np.int64)
+        out[nonzero] = LEAF_DEPTH - bit // 2 - CELL_DEPTH
+        return out
+
+    def clusters(
+        self,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        zoom: int,
+        prefix: Prefix,
+        limit: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Clusters of kept points intersecting the bbox at this zoom (at most `limit`). Above
+        MAX_CLUSTER_ZOOM the deepest level is used. Each item has lon/lat (centroid of kept
+        points), count, types (code -> count), the replica position when count is 1, and
+        expansion_zoom.
+        """
+        if not len(self.positions):
+            return []
+        level = self._levels[min(max(zoom, 0), MAX_CLUSTER_ZOOM)]
+        depth = min(max(zoom, 0), MAX_CLUSTER_ZOOM) + CELL_DEPTH
+        xs, ys = mercator_xy(np.array([min_lon, max_lon]), np.array([min_lat, max_lat]))
+        (x0, x1), (y1, y0) = xs, ys  # mercator y grows southward
+        side = 1 << depth
+        in_box = (
+            (level.cx >= math.floor(x0 * side)) & (level.cx <= math.floor(x1 * side))
+            & (level.cy >= math.floor(y0 * side)) & (level.cy <= math.floor(y1 * side))
+        )
+        runs = np.flatnonzero(in_box)
+        starts = level.starts[runs]
+        ends = np.append(level.starts, len(self.positions))[runs + 1]
+        counts = prefix.count[ends] - prefix.count[starts]
+        nonempty = counts > 0
+        starts, ends, counts = starts[nonempty][:limit], ends[nonempty][:limit], counts[nonempty][:limit]
+        if not len(counts):
+            return []
+        cx = (prefix.x[ends] - prefix.x[starts]) / counts
+        cy = (prefix.y[ends] - prefix.y[starts]) / counts
+        lon = cx * 360.0 - 180.0
+        lat = np.degrees(np.arctan(np.sinh(math.pi * (1 - 2 * cy))))
+        first = np.searchsorted(prefix.count, prefix.count[starts] + 1, side="left") - 1
+        last = np.searchsorted(prefix.count, prefix.count[ends], side="left") - 1
+        expansion = self._expansion_zoom(first, last)
+        type_counts = {code: cs[ends] - cs[starts] for code, cs in prefix.types.items()}
+
+        out = []
+        for i in range(len(counts)):
+            item: dict[str, Any] = {
+                "lon": float(lon[i]),
+                "lat": float(lat[i]),
+                "count": int(counts[i]),
+                "types": {code: int(c[i]) for code, c in type_counts.items() if c[i]},
+            }
+            if counts[i] == 1:
+                item["position"] = int(self.positions[first[i]])
+            else:
+                item["expansion_zoom"] = int(expansion[i]) if expansion[i] >= 0 else None
+            out.append(item)
+        return out
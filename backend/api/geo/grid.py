@@ -0,0 +1,171 @@
+"""
+Uniform lon/lat grid index over the event replica's coordinates.
+
+Points are bucketed into square cells of `cell_deg` degrees and stored sorted by cell key
+(row * n_cols + col). The cells of one grid row inside a bbox are a contiguous key range,
+so a bbox lookup is one pair of binary searches per grid row followed by an exact
+vectorized filter. Radius and k-nearest queries reuse the same ranges; a k-nearest query
+that has not settled after MAX_RINGS rings of cells (a selective mask, or a far outlier
+stretching the grid) measures every remaining point at once instead.
+The index is rebuilt from the replica's lon/lat columns after each replica refresh.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+from api.geo.points import EARTH_RADIUS_M, METERS_PER_DEG_LAT, radius_bbox
+
+MAX_RINGS = 32
+
+
+def haversine_m_vec(lon: float, lat: float, lons, lats):
+    """Vectorized great-circle distance in metres from (lon, lat) to arrays of points."""
+    phi1 = math.radians(lat)
+    phi2 = np.radians(lats)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GridIndex:
+    """Static grid over (lon, lat) arrays indexed by replica position."""
+
+    def __init__(self, cell_deg: float = 0.005) -> None:
+        self.cell_deg = cell_deg
+        self.n_cols = int(math.ceil(360.0 / cell_deg))
+        self._keys = np.empty(0, dtype=np.int64)
+        self._positions = np.empty(0, dtype=np.int64)
+        self._lon = np.empty(0, dtype=np.float64)
+        self._lat = np.empty(0, dtype=np.float64)
+        self._row_range = (0, -1)
+        self._col_range = (0, -1)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _cell(self, lon, lat):
+        col = np.floor((np.asarray(lon) + 180.0) / self.cell_deg).astype(np.int64)
+        row = np.floor((np.asarray(lat) + 90.0) / self.cell_deg).astype(np.int64)
+        return row, col
+
+    def build(self, lon, lat) -> None:
+        """Index every position whose lon/lat is not NaN."""
+        positions = np.nonzero(~(np.isnan(lon) | np.isnan(lat)))[0]
+        row, col = self._cell(lon[positions], lat[positions])
+        keys = row * self.n_cols + col
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._positions = positions[order]
+        self._lon = lon[self._positions]
+        self._lat = lat[self._positions]
+        self._row_range = (int(row.min()), int(row.max())) if len(row) else (0, -1)
+        self._col_range = (int(col.min()), int(col.max())) if len(col) else (0, -1)
+
+    def _slots_in_cells(self, row0: int, row1: int, col0: int, col1: int):
+        """Slots (indices into the sorted arrays) of points in the cell rectangle."""
+        row0 = max(row0, self._row_range[0])
+        row1 = min(row1, self._row_range[1])
+        if row1 < row0:
+            return np.empty(0, dtype=np.int64)
+        rows = np.arange(row0, row1 + 1, dtype=np.int64)
+        lo = np.searchsorted(self._keys, rows * self.n_cols + col0, side="left")
+        hi = np.searchsorted(self._keys, rows * self.n_cols + col1, side="right")
+        spans = [np.arange(a, b) for a, b in zip(lo, hi) if b > a]
+        return np.concatenate(spans) if spans else np.empty(0, dtype=np.int64)
+
+    def _bbox_slots(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float):
+        (row0, row1), (col0, col1) = zip(self._cell(min_lon, min_lat), self._cell(max_lon, max_lat))
+        slots = self._slots_in_cells(int(row0), int(row1), int(col0), int(col1))
+        lon, lat = self._lon[slots], self._lat[slots]
+        inside = (lon >= min_lon) & (lon <= max_lon) & (lat >= min_lat) & (lat <= max_lat)
+        return slots[inside]
+
+    def bbox(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float, mask=None):
+        """Positions of points inside the bbox (inclusive); mask filters positions."""
+        positions = self._positions[self._bbox_slots(min_lon, min_lat, max_lon, max_lat)]
+        return positions if mask is None else positions[mask[positions]]
+
+    def radius(self, lon: float, lat: float, radius_m: float, mask=None):
+        """(positions, distances) within radius_m, nearest first; mask filters positions."""
+        slots = self._bbox_slots(*radius_bbox(lon, lat, radius_m))
+        if mask is not None:
+            slots = slots[mask[self._positions[slots]]]
+        dist = haversine_m_vec(lon, lat, self._lon[slots], self._lat[slots])
+        keep = dist <= radius_m
+        positions, dist = self._positions[slots[keep]], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return positions[order], dist[order]
+
+    def nearest(self, lon: float, lat: float, k: int, mask=None, max_radius_m: Optional[float] = None):
+        """
+        (positions, distances) of the k nearest points, nearest first.
+        Searches square rings of cells outward until the ring is provably farther than the
+        current k-th candidate.
+        """
+        if len(self._positions) == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        row_c, col_c = (int(v) for v in self._cell(lon, lat))
+        # Past this ring every indexed cell has been visited
+        max_ring = max(
+            row_c - self._row_range[0], self._row_range[1] - row_c,
+            col_c - self._col_range[0], self._col_range[1] - col_c, 0,
+        )
+        candidates: list = []
+        ring = 0
+        while True:
+            if ring == 0:
+                slots = self._slots_in_cells(row_c, row_c, col_c, col_c)
+            else:
+                top = self._slots_in_cells(row_c + ring, row_c + ring, col_c - ring, col_c + ring)
+                bottom = self._slots_in_cells(row_c - ring, row_c - ring, col_c - ring, col_c + ring)
+                left = self._slots_in_cells(row_c - ring + 1, row_c + ring - 1, col_c - ring, col_c - ring)
+                right = self._slots_in_cells(row_c - ring + 1, row_c + ring - 1, col_c + ring, col_c + ring)
+                slots = np.concatenate((top, bottom, left, right))
+            positions = self._positions[slots]
+            if mask is not None:
+                keep = mask[positions]
+                slots, positions = slots[keep], positions[keep]
+            if len(positions):
+                candidates.append((positions, haversine_m_vec(lon, lat, self._lon[slots], self._lat[slots])))
+            # Everything outside the rings searched so far is at least `ring` cells away; size a cell
+            # by its narrowest side at the ring's poleward edge (longitude degrees shrink with latitude)
+            edge_lat = min(abs(lat) + (ring + 1) * self.cell_deg, 89.9)
+            reach = ring * self.cell_deg * METERS_PER_DEG_LAT * math.cos(math.radians(edge_lat))
+            if max_radius_m is not None and reach > max_radius_m:
+                break
+            found = sum(len(p) for p, _ in candidates)
+            if found >= k:
+                dists = np.concatenate([d for _, d in candidates])
+                if np.partition(dists, k - 1)[k - 1] <= reach:
+                    break
+            if ring >= max_ring:
+                break
+            if ring >= MAX_RINGS:
+                return self._nearest_scan(lon, lat, k, mask, max_radius_m)
+            ring += 1
+        if not candidates:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        positions = np.concatenate([p for p, _ in candidates])
+        dists = np.concatenate([d for _, d in candidates])
+        if max_radius_m is not None:
+            keep = dists <= max_radius_m
+            positions, dists = positions[keep], dists[keep]
+        order = np.argsort(dists, kind="stable")[:k]
+        return positions[order], dists[order]
+
+    def _nearest_scan(self, lon: float, lat: float, k: int, mask=None, max_radius_m: Optional[float] = None):
+        """nearest() by measuring every (masked) point: bounded cost when rings would not settle."""
+        positions, lons, lats = self._positions, self._lon, self._lat
+        if mask is not None:
+            keep = mask[positions]
+            positions, lons, lats = positions[keep], lons[keep], lats[keep]
+        dists = haversine_m_vec(lon, lat, lons, lats)
+        if max_radius_m is not None:
+            keep = dists <= max_radius_m
+            positions, dists = positions[keep], dists[keep]
+        if len(dists) > k:
+            top = np.argpartition(dists, k - 1)[:k]
+            positions, dists = positions[top], dists[top]
+        order = np.argsort(dists, kind="stable")
+        return positions[order], dists[order]
@@ -0,0 +1,122 @@
+"""
+Hexagonal binning of event locations at several resolutions, maintained incrementally.
+
+Hexes are pointy-top, laid out in web-mercator metres and addressed by axial (q, r)
+coordinates; HEX_SIZES_M holds the circumradius per resolution (0 = coarsest). On the
+ground a hex shrinks by cos(latitude), about 0.65x in Vancouver.
+
+Each event counts once per resolution, in the hex holding its location, on its day
+(start_date, else published_at, UTC). Counts live in a DayCounts (api.daycounts) with one
+layer per resolution: day -> {(type, q, r): count}, so a date-window query only sums the
+day buckets inside the window. Changed rows replace their previous contribution, so
+updates and moves never double-count.
+"""
+
+import math
+from collections import Counter
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from api.daycounts import DayCounts, event_day
+from api.geo.points import parse_point
+
+EARTH_RADIUS_M = 6_378_137.0  # web-mercator sphere
+HEX_SIZES_M = (3200.0, 1600.0, 800.0, 400.0, 200.0)
+_SQRT3 = math.sqrt(3.0)
+
+
+def to_mercator_m(lon, lat):
+    x = np.radians(lon) * EARTH_RADIUS_M
+    y = np.log(np.tan(math.pi / 4 + np.radians(np.clip(lat, -85.0511, 85.0511)) / 2)) * EARTH_RADIUS_M
+    return x, y
+
+
+def hex_axial(x, y, size: float):
+    """Axial (q, r) of the pointy-top hex containing mercator (x, y) arrays (cube rounding)."""
+    qf = (_SQRT3 / 3 * x - y / 3) / size
+    rf = (2.0 / 3 * y) / size
+    sf = -qf - rf
+    q, r, s = np.rint(qf), np.rint(rf), np.rint(sf)
+    dq, dr, ds = np.abs(q - qf), np.abs(r - rf), np.abs(s - sf)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    q = np.where(fix_q, -r - s, q)
+    r = np.where(fix_r, -q - s, r)
+    return q.astype(np.int64), r.astype(np.int64)
+
+
+def hex_center(q: int, r: int, size: float) -> tuple[float, float]:
+    """(lon, lat) of a hex centre."""
+    x = size * _SQRT3 * (q + r / 2)
+    y = size * 1.5 * r
+    lon = math.degrees(x / EARTH_RADIUS_M)
+    lat = math.degrees(2 * math.atan(math.exp(y / EARTH_RADIUS_M)) - math.pi / 2)
+    return lon, lat
+
+
+class HexBins:
+    """Per-resolution hex counts by day and type."""
+
+    def __init__(self, sizes: Iterable[float] = HEX_SIZES_M) -> None:
+        self.sizes = tuple(sizes)
+        self._counts = DayCounts(layers=len(self.sizes))
+
+    def reset(self) -> None:
+        self._counts.reset()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def apply(self, rows: list[dict[str, Any]]) -> None:
+        """Count new rows and recount changed ones (rows without a location or day drop out)."""
+        self.apply_contributions(self.contributions(rows))
+
+    def apply_contributions(self, contributions) -> None:
+        """Apply what contributions() computed, e.g. in another thread."""
+        self._counts.apply(contributions)
+
+    def contributions(self, rows: list[dict[str, Any]]) -> list[tuple[str, Optional[tuple]]]:
+        """Each row's (id, contribution); reads nothing but the rows, so it is safe off the loop."""
+        # Keyed by id so a row repeated within the batch is counted once (last copy wins)
+        contributions: dict[str, Optional[tuple]] = {}
+        located: dict[str, tuple[int, Optional[str], tuple[float, float]]] = {}
+        for row in rows:
+            event_id = str(row["id"])
+            contributions[event_id] = None
+            located.pop(event_id, None)
+            point = parse_point(row.get("location"))
+            day = event_day(row)
+            if point is not None and day is not None:
+                located[event_id] = (day, row.get("type"), point)
+        if located:
+            lon = np.array([p[2][0] for p in located.values()])
+            lat = np.array([p[2][1] for p in located.values()])
+            x, y = to_mercator_m(lon, lat)
+            per_res = [hex_axial(x, y, size) for size in self.sizes]
+            qr = [list(zip(q.tolist(), r.tolist())) for q, r in per_res]
+            for i, (event_id, (day, event_type, _)) in enumerate(located.items()):
+                contributions[event_id] = (day, tuple((event_type, *res_cells[i]) for res_cells in qr))
+        return list(contributions.items())
+
+    def counts(
+        self,
+        resolution: int,
+        start_day: Optional[int] = None,
+        end_day: Optional[int] = None,
+        event_type: Optional[str] = None,
+    ) -> Counter:
+        """(q, r) -> count at a resolution, optionally within [start_day, end_day] and for one type."""
+        out: Counter = Counter()
+        for counter in self._counts.counters(resolution, start_day, end_day):
+            for (t, q, r), n in counter.items():
+                if event_type is None or t == event_type:
+                    out[(q, r)] += n
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "events": len(self._counts),
+            "resolutions": len(self.sizes),
+            "bins": [self._counts.keys(res) for res in range(len(self.sizes))],
+        }
@@ -0,0 +1,203 @@
+"""
+Minimal Mapbox Vector Tile (v2.1) encoder plus the web-mercator tile math it needs.
+
+Only what /tiles needs: point and polygon features, string/number properties, and
+polygon clipping to the (buffered) tile square. The protobuf wire format is written by hand:
+
+  Tile    { repeated Layer layers = 3; }
+  Layer   { uint32 version = 15; string name = 1; repeated Feature features = 2;
+            repeated string keys = 3; repeated Value values = 4; uint32 extent = 5; }
+  Feature { repeated uint32 tags = 2 [packed]; GeomType type = 3; repeated uint32 geometry = 4 [packed]; }
+  Value   { string string_value = 1; double double_value = 3; sint64 sint_value = 6; bool bool_value = 7; }
+"""
+
+import math
+import struct
+from typing import Any, Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # only mercator_xy needs it; /tiles is disabled without numpy
+    np = None
+
+EXTENT = 4096
+BUFFER = 64
+POINT, POLYGON = 1, 3
+_MOVE_TO, _LINE_TO, _CLOSE_PATH = 1, 2, 7
+
+TilePoint = tuple[int, int]
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of a tile."""
+    n = 2 ** z
+
+    def lat(row: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+
+def mercator_xy(lon, lat):
+    """Lon/lat (scalars or arrays) -> web-mercator world coords in [0, 1], y down."""
+    lat = np.clip(lat, -85.0511, 85.0511)
+    mx = (np.asarray(lon) + 180.0) / 360.0
+    my = (1.0 - np.log(np.tan(np.radians(lat)) + 1.0 / np.cos(np.radians(lat))) / math.pi) / 2.0
+    return mx, my
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _field(number: int, payload: bytes) -> bytes:
+    """Length-delimited field."""
+    return _varint((number << 3) | 2) + _varint(len(payload)) + payload
+
+
+def _uint_field(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _packed(number: int, values: Iterable[int]) -> bytes:
+    return _field(number, b"".join(_varint(v) for v in values))
+
+
+def _command(command: int, count: int) -> int:
+    return (command & 0x7) | (count << 3)
+
+
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, bool):
+        return _uint_field(7, int(value))
+    if isinstance(value, int):
+        return _uint_field(6, _zigzag(value))
+    if isinstance(value, float):
+        return _varint((3 << 3) | 1) + struct.pack("<d", value)
+    return _field(1, str(value).encode())
+
+
+def _ring_area(ring: list[TilePoint]) -> float:
+    """Shoelace area in tile coords (y down): positive = clockwise on screen = exterior in MVT."""
+    total = 0
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+        total += x1 * y2 - x2 * y1
+    return total / 2
+
+
+def clip_ring(ring: list[tuple[float, float]], lo: float, hi: float) -> list[tuple[float, float]]:
+    """Sutherland-Hodgman clip of a ring (unclosed) to the square [lo, hi]^2."""
+    for axis, bound, keep_above in ((0, lo, True), (0, hi, False), (1, lo, True), (1, hi, False)):
+        if not ring:
+            break
+        clipped = []
+        prev = ring[-1]
+        prev_in = (prev[axis] >= bound) if keep_above else (prev[axis] <= bound)
+        for point in ring:
+            point_in = (point[axis] >= bound) if keep_above else (point[axis] <= bound)
+            if point_in != prev_in:
+                t = (bound - prev[axis]) / (point[axis] - prev[axis])
+                crossing = (prev[0] + t * (point[0] - prev[0]), prev[1] + t * (point[1] - prev[1]))
+                clipped.append(crossing)
+            if point_in:
+                clipped.append(point)
+            prev, prev_in = point, point_in
+        ring = clipped
+    return ring
+
+
+def _snap(ring: Iterable[tuple[float, float]]) -> list[TilePoint]:
+    """Round to integer tile coords, dropping repeats (and the closing point)."""
+    out: list[TilePoint] = []
+    for x, y in ring:
+        p = (int(round(x)), int(round(y)))
+        if not out or out[-1] != p:
+            out.append(p)
+    if len(out) > 1 and out[0] == out[-1]:
+        out.pop()
+    return out
+
+
+class LayerBuilder:
+    """Accumulates features for one layer, sharing key/value tables across them."""
+
+    def __init__(self, name: str, extent: int = EXTENT) -> None:
+        self.name = name
+        self.extent = extent
+        self._keys: dict[str, int] = {}
+        self._values: dict[tuple[type, Any], int] = {}
+        self._features: list[bytes] = []
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def _tags(self, properties: dict[str, Any]) -> list[int]:
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            k = self._keys.setdefault(key, len(self._keys))
+            v = self._values.setdefault((type(value), value), len(self._values))
+            tags.extend((k, v))
+        return tags
+
+    def _add(self, geom_type: int, geometry: list[int], properties: dict[str, Any]) -> None:
+        feature = _packed(2, self._tags(properties)) + _uint_field(3, geom_type) + _packed(4, geometry)
+        self._features.append(feature)
+
+    def add_point(self, x: int, y: int, properties: dict[str, Any]) -> None:
+        self._add(POINT, [_command(_MOVE_TO, 1), _zigzag(x), _zigzag(y)], properties)
+
+    def add_polygon(self, polygons: list[list[list[tuple[float, float]]]], properties: dict[str, Any]) -> bool:
+        """
+        Add a (multi)polygon given in float tile coords as polygons -> rings (exterior first).
+        Rings are clipped to the buffered tile and rewound as MVT requires. Returns False when
+        nothing is left inside the tile.
+        """
+        geometry: list[int] = []
+        cx = cy = 0
+        for rings in polygons:
+            for i, ring in enumerate(rings):
+                snapped = _snap(clip_ring(ring, -BUFFER, self.extent + BUFFER))
+                area = _ring_area(snapped) if len(snapped) >= 3 else 0
+                if area == 0:
+                    if i == 0:
+                        break  # exterior gone: skip its holes too
+                    continue
+                if (i == 0) != (area > 0):
+                    snapped.reverse()
+                x0, y0 = snapped[0]
+                geometry += [_command(_MOVE_TO, 1), _zigzag(x0 - cx), _zigzag(y0 - cy)]
+                geometry.append(_command(_LINE_TO, len(snapped) - 1))
+                cx, cy = x0, y0
+                for x, y in snapped[1:]:
+                    geometry += [_zigzag(x - cx), _zigzag(y - cy)]
+                    cx, cy = x, y
+                geometry.append(_command(_CLOSE_PATH, 1))
+        if not geometry:
+            return False
+        self._add(POLYGON, geometry, properties)
+        return True
+
+    def encode(self) -> Optional[bytes]:
+        if not self._features:
+            return None
+        parts = [_uint_field(15, 2), _field(1, self.name.encode())]
+        parts += [_field(2, f) for f in self._features]
+        parts += [_field(3, k.encode()) for k in self._keys]
+        parts += [_field(4, _encode_value(value)) for _, value in self._values]
+        parts.append(_uint_field(5, self.extent))
+        return b"".join(parts)
+
+
+def encode_tile(layers: Iterable[LayerBuilder]) -> bytes:
+    return b"".join(_field(3, encoded) for layer in layers if (encoded := layer.encode()) is not None)
@@ -0,0 +1,51 @@
+"""
+Point helpers shared by the spatial endpoints: GeoJSON Point parsing and distances.
+Coordinates are WGS84 lon/lat (GeoJSON order: [lng, lat]).
+"""
+
+import json
+import math
+from typing import Any, Optional
+
+EARTH_RADIUS_M = 6_371_008.8
+METERS_PER_DEG_LAT = 111_320.0
+
+
+def parse_point(location: Any) -> Optional[tuple[float, float]]:
+    """
+    (lon, lat) from a GeoJSON Point dict or its JSON string (events.location is Text).
+    Returns None for missing, non-Point or out-of-range values.
+    """
+    if location is None:
+        return None
+    if isinstance(location, str):
+        try:
+            location = json.loads(location)
+        except ValueError:
+            return None
+    if not isinstance(location, dict) or location.get("type") != "Point":
+        return None
+    coords = location.get("coordinates")
+    try:
+        lon, lat = float(coords[0]), float(coords[1])
+    except (TypeError, ValueError, IndexError):
+        return None
+    if not (-180.0 <= lon <= 180.0 and -90.0 <= lat <= 90.0):
+        return None
+    return lon, lat
+
+
+def haversine_m(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Great-circle distance in metres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def radius_bbox(lon: float, lat: float, radius_m: float) -> tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) enclosing a circle of radius_m around (lon, lat)."""
+    dlat = radius_m / METERS_PER_DEG_LAT
+    dlon = radius_m / (METERS_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+    return lon - dlon, lat - dlat, lon + dlon, lat + dlat
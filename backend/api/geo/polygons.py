@@ -0,0 +1,161 @@
+"""
+Prepared point-in-polygon index for a set of non-overlapping polygons (neighbourhoods).
+
+A G x G grid covers the polygons' combined bbox. At build time every cell centre is
+classified by scanline fill (which polygon, if any, contains it) and every polygon edge is
+attached to the cells its bbox touches. A lookup then:
+  - returns the centre's owner directly when the cell holds no edges (interior cells), or
+  - walks the segment from the cell centre to the point and flips each candidate polygon's
+    inside/outside status once per edge of that polygon it crosses (few edges per cell).
+Rings are even-odd, so holes and MultiPolygons need no special casing.
+"""
+
+import json
+from typing import Any, Optional
+
+import numpy as np
+
+Ring = list[tuple[float, float]]
+
+
+def polygon_rings(geometry: Any) -> list[Ring]:
+    """All rings (outer and holes) of a GeoJSON Polygon/MultiPolygon, dict or JSON string."""
+    if isinstance(geometry, str):
+        try:
+            geometry = json.loads(geometry)
+        except ValueError:
+            return []
+    if not isinstance(geometry, dict):
+        return []
+    coords = geometry.get("coordinates") or []
+    if geometry.get("type") == "Polygon":
+        polygons = [coords]
+    elif geometry.get("type") == "MultiPolygon":
+        polygons = coords
+    else:
+        return []
+    rings: list[Ring] = []
+    for polygon in polygons:
+        for ring in polygon:
+            points = [(float(p[0]), float(p[1])) for p in ring]
+            if len(points) >= 3:
+                rings.append(points)
+    return rings
+
+
+def _edges(rings: list[Ring]) -> np.ndarray:
+    """(n, 4) array of x1, y1, x2, y2 for every ring edge (rings closed implicitly)."""
+    parts = []
+    for ring in rings:
+        pts = np.asarray(ring, dtype=np.float64)
+        parts.append(np.hstack((pts, np.roll(pts, -1, axis=0))))
+    return np.vstack(parts) if parts else np.empty((0, 4))
+
+
+def _segments_cross(ax: float, ay: float, bx: float, by: float, cx: float, cy: float, dx: float, dy: float) -> bool:
+    """Proper intersection of segments AB and CD (orientation test)."""
+    d1 = (dx - cx) * (ay - cy) - (dy - cy) * (ax - cx)
+    d2 = (dx - cx) * (by - cy) - (dy - cy) * (bx - cx)
+    if (d1 > 0) == (d2 > 0):
+        return False
+    d3 = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    d4 = (bx - ax) * (dy - ay) - (by - ay) * (dx - ax)
+    return (d3 > 0) != (d4 > 0)
+
+
+class PolygonIndex:
+    """Locate which polygon (by list index) contains a point."""
+
+    def __init__(self, geometries: list[Any], grid: int = 256) -> None:
+        self.size = grid
+        polygon_edges = [_edges(polygon_rings(g)) for g in geometries]
+        all_edges = [e for e in polygon_edges if len(e)]
+        self.count = len(geometries)
+        if not all_edges:
+            self.bounds = None
+            return
+        stacked = np.vstack(all_edges)
+        xs, ys = stacked[:, [0, 2]], stacked[:, [1, 3]]
+        self.bounds = (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+        min_x, min_y, max_x, max_y = self.bounds
+        self.cell_w = (max_x - min_x) / grid or 1e-9
+        self.cell_h = (max_y - min_y) / grid or 1e-9
+
+        # Centre owner per cell via scanline fill at each row's centre latitude
+        owner = np.full((grid, grid), -1, dtype=np.int32)
+        centres_x = min_x + (np.arange(grid) + 0.5) * self.cell_w
+        for p, edges in enumerate(polygon_edges):
+            if not len(edges):
+                continue
+            x1, y1, x2, y2 = edges.T
+            for row in range(grid):
+                y = min_y + (row + 0.5) * self.cell_h
+                crossing = (y1 > y) != (y2 > y)
+                if not crossing.any():
+                    continue
+                t = (y - y1[crossing]) / (y2[crossing] - y1[crossing])
+                xings = np.sort(x1[crossing] + t * (x2[crossing] - x1[crossing]))
+                inside = (np.searchsorted(xings, centres_x) % 2) == 1
+                owner[row, inside] = p
+        self.owner = owner
+
+        # Edges attached to every cell their bbox overlaps
+        cell_edges: dict[int, list[tuple]] = {}
+        for p, edges in enumerate(polygon_edges):
+            for x1, y1, x2, y2 in edges.tolist():
+                c0, r0 = self._cell(min(x1, x2), min(y1, y2))
+                c1, r1 = self._cell(max(x1, x2), max(y1, y2))
+                for r in range(r0, r1 + 1):
+                    for c in range(c0, c1 + 1):
+                        cell_edges.setdefault(r * grid + c, []).append((p, x1, y1, x2, y2))
+        self.cell_edges = cell_edges
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        min_x, min_y, _, _ = self.bounds
+        col = min(max(int((x - min_x) / self.cell_w), 0), self.size - 1)
+        row = min(max(int((y - min_y) / self.cell_h), 0), self.size - 1)
+        return col, row
+
+    def locate(self, x: float, y: float) -> Optional[int]:
+        """Index of the polygon containing (x, y) = (lon, lat), or None."""
+        if self.bounds is None:
+            return None
+        min_x, min_y, max_x, max_y = self.bounds
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return None
+        col, row = self._cell(x, y)
+        centre_owner = int(self.owner[row, col])
+        edges = self.cell_edges.get(row * self.size + col)
+        if edges is None:
+            return centre_owner if centre_owner >= 0 else None
+        cx = min_x + (col + 0.5) * self.cell_w
+        cy = min_y + (row + 0.5) * self.cell_h
+        # Parity of crossings between the centre and the point, per polygon
+        flips: dict[int, int] = {}
+        for p, x1, y1, x2, y2 in edges:
+            if _segments_cross(cx, cy, x, y, x1, y1, x2, y2):
+                flips[p] = flips.get(p, 0) ^ 1
+        for p in set(flips) | {centre_owner}:
+            if p >= 0 and ((p == centre_owner) ^ bool(flips.get(p, 0))):
+                return p
+        return None
+
+    def locate_many(self, xs, ys) -> list[Optional[int]]:
+        """Vectorized over interior cells; only points in boundary cells take the edge walk."""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        out: list[Optional[int]] = [None] * len(xs)
+        if self.bounds is None or not len(xs):
+            return out
+        min_x, min_y, max_x, max_y = self.bounds
+        in_box = (xs >= min_x) & (xs <= max_x) & (ys >= min_y) & (ys <= max_y)
+        cols = np.clip(((xs - min_x) / self.cell_w).astype(np.int64), 0, self.size - 1)
+        rows = np.clip(((ys - min_y) / self.cell_h).astype(np.int64), 0, self.size - 1)
+        owners = self.owner[rows, cols]
+        keys = rows * self.size + cols
+        for i in np.nonzero(in_box)[0].tolist():
+            if int(keys[i]) in self.cell_edges:
+                out[i] = self.locate(float(xs[i]), float(ys[i]))
+            elif owners[i] >= 0:
+                out[i] = int(owners[i])
+        return out
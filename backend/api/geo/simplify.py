@@ -0,0 +1,248 @@
+"""
+Topology-preserving simplification of a polygon coverage (neighbourhood boundaries).
+
+Neighbouring polygons share their boundary, so simplifying each polygon on its own opens
+gaps and overlaps along the shared edges. Instead the rings are cut into arcs at junctions
+(vertices where the set of neighbouring polygons changes), each arc is stored once and
+simplified once with Douglas-Peucker (endpoints fixed), and the rings are reassembled from
+the simplified arcs. A shared edge therefore simplifies identically on both sides.
+
+Coordinates are snapped to a 1e-7 degree integer grid first so that vertices the source data
+repeats with float noise match exactly, and any vertex lying on another ring's edge (a
+T-junction: one side of a shared edge has a vertex the other lacks) is inserted into that
+edge, so both sides of every shared edge carry the same vertices.
+"""
+
+import json
+import math
+from typing import Any, Optional
+
+import numpy as np
+
+from api.geo.polygons import polygon_rings
+
+SCALE = 10_000_000
+# Vertices within this many grid units (~0.5 m) of an edge are treated as lying on it
+NODE_TOLERANCE = 50
+Point = tuple[int, int]
+
+
+def _polygons(geometry: Any) -> list[list[list[Point]]]:
+    """GeoJSON Polygon/MultiPolygon -> polygons -> rings of snapped, open (unclosed) points."""
+    if isinstance(geometry, str):
+        try:
+            geometry = json.loads(geometry)
+        except ValueError:
+            return []
+    if isinstance(geometry, dict) and geometry.get("type") == "MultiPolygon":
+        parts = [{"type": "Polygon", "coordinates": c} for c in geometry.get("coordinates") or []]
+    else:
+        parts = [geometry]
+    polygons = []
+    for part in parts:
+        rings = []
+        for ring in polygon_rings(part):
+            snapped: list[Point] = []
+            for x, y in ring:
+                p = (round(x * SCALE), round(y * SCALE))
+                if not snapped or snapped[-1] != p:
+                    snapped.append(p)
+            if len(snapped) > 1 and snapped[0] == snapped[-1]:
+                snapped.pop()
+            if len(snapped) >= 3:
+                rings.append(snapped)
+        if rings:
+            polygons.append(rings)
+    return polygons
+
+
+def _on_edges(a, b, pts, tolerance: float):
+    """(edge index, point index, t) of points lying strictly inside edges a[i] -> b[i]."""
+    d = b - a
+    seg2 = (d ** 2).sum(axis=1)
+    rel = pts[None, :, :] - a[:, None, :]
+    t = (rel * d[:, None, :]).sum(axis=2) / np.where(seg2 > 0, seg2, 1)[:, None]
+    cross = d[:, None, 0] * rel[:, :, 1] - d[:, None, 1] * rel[:, :, 0]
+    on_edge = (t > 0) & (t < 1) & (cross * cross <= tolerance * tolerance * seg2[:, None])
+    edge, point = np.nonzero(on_edge)
+    return edge, point, t[edge, point]
+
+
+def _near(pts, lo, hi, tolerance: float):
+    """Indices of points inside the box [lo, hi] grown by tolerance."""
+    return np.flatnonzero(((pts >= lo - tolerance) & (pts <= hi + tolerance)).all(axis=1))
+
+
+def _node(
+    polygons: list[list[list[list[Point]]]], tolerance: float = NODE_TOLERANCE, chunk: int = 256
+) -> None:
+    """
+    Insert every vertex that lies on another ring's edge into that edge, in place.
+    Edges are tested a chunk at a time against only the vertices inside the chunk's bbox,
+    so work and memory follow the local vertex density, not the size of the coverage.
+    """
+    vertices = sorted({p for geometry in polygons for rings in geometry for ring in rings for p in ring})
+    if not vertices:
+        return
+    pts = np.array(vertices, dtype=np.float64)
+    for geometry in polygons:
+        for rings in geometry:
+            for r, ring in enumerate(rings):
+                a = np.array(ring, dtype=np.float64)
+                b = np.roll(a, -1, axis=0)
+                candidates = _near(pts, np.minimum(a, b).min(axis=0), np.maximum(a, b).max(axis=0), tolerance)
+                inserts: dict[int, list[tuple[float, int]]] = {}
+                for start in range(0, len(a), chunk):
+                    ca, cb = a[start:start + chunk], b[start:start + chunk]
+                    lo, hi = np.minimum(ca, cb).min(axis=0), np.maximum(ca, cb).max(axis=0)
+                    near = candidates[_near(pts[candidates], lo, hi, tolerance)]
+                    edge, point, t = _on_edges(ca, cb, pts[near], tolerance)
+                    for i, j, at in zip((edge + start).tolist(), near[point].tolist(), t.tolist()):
+                        inserts.setdefault(i, []).append((at, j))
+                if not inserts:
+                    continue
+                noded: list[Point] = []
+                for i, p in enumerate(ring):
+                    noded.append(p)
+                    for _, j in sorted(inserts.get(i, ())):
+                        if vertices[j] != noded[-1] and vertices[j] != ring[(i + 1) % len(ring)]:
+                            noded.append(vertices[j])
+                rings[r] = noded
+
+
+def douglas_peucker(points: list[Point], tolerance: float) -> list[Point]:
+    """Keep the first and last point and every point farther than tolerance from the simplified line."""
+    if len(points) <= 2:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    tol2 = tolerance * tolerance
+    while stack:
+        first, last = stack.pop()
+        ax, ay = points[first]
+        bx, by = points[last]
+        dx, dy = bx - ax, by - ay
+        seg2 = dx * dx + dy * dy
+        worst, worst_d2 = -1, tol2
+        for i in range(first + 1, last):
+            px, py = points[i]
+            if seg2 == 0:
+                d2 = (px - ax) ** 2 + (py - ay) ** 2
+            else:
+                cross = dx * (py - ay) - dy * (px - ax)
+                d2 = cross * cross / seg2
+            if d2 > worst_d2:
+                worst, worst_d2 = i, d2
+        if worst >= 0:
+            keep[worst] = True
+            stack.append((first, worst))
+            stack.append((worst, last))
+    return [p for p, k in zip(points, keep) if k]
+
+
+class Coverage:
+    """Arc topology of a list of polygon geometries, simplified on demand per tolerance."""
+
+    def __init__(self, geometries: list[Any]) -> None:
+        self.polygons = [_polygons(g) for g in geometries]
+        _node(self.polygons)
+        neighbours: dict[Point, set] = {}
+        for polygons in self.polygons:
+            for rings in polygons:
+                for ring in rings:
+                    n = len(ring)
+                    for i, p in enumerate(ring):
+                        neighbours.setdefault(p, set()).add(frozenset((ring[i - 1], ring[(i + 1) % n])))
+        junctions = {p for p, pairs in neighbours.items() if len(pairs) > 1}
+
+        self.arcs: list[list[Point]] = []
+        arc_ids: dict[tuple, int] = {}
+
+        def add_arc(arc: list[Point]) -> tuple[int, bool]:
+            forward, backward = tuple(arc), tuple(reversed(arc))
+            key, reversed_ = (forward, False) if forward <= backward else (backward, True)
+            if key not in arc_ids:
+                arc_ids[key] = len(self.arcs)
+                self.arcs.append(list(key))
+            return arc_ids[key], reversed_
+
+        # geometry -> polygons -> rings -> [(arc id, reversed)]
+        self.rings: list[list[list[list[tuple[int, bool]]]]] = []
+        for polygons in self.polygons:
+            out_polygons = []
+            for rings in polygons:
+                out_rings = []
+                for ring in rings:
+                    cuts = [i for i, p in enumerate(ring) if p in junctions]
+                    if not cuts:
+                        # Closed arc: rotate to a canonical start so a duplicated ring dedupes
+                        start = ring.index(min(ring))
+                        rotated = ring[start:] + ring[:start]
+                        out_rings.append([add_arc(rotated + [rotated[0]])])
+                        continue
+                    rotated = ring[cuts[0]:] + ring[:cuts[0]]
+                    offsets = [c - cuts[0] for c in cuts] + [len(ring)]
+                    rotated.append(rotated[0])
+                    out_rings.append([add_arc(rotated[a:b + 1]) for a, b in zip(offsets, offsets[1:])])
+                out_polygons.append(out_rings)
+            self.rings.append(out_polygons)
+
+    @property
+    def vertex_count(self) -> int:
+        return sum(len(ring) for polygons in self.polygons for rings in polygons for ring in rings)
+
+    @property
+    def mid_lat(self) -> float:
+        lats = [y for arc in self.arcs for _, y in arc]
+        return (min(lats) + max(lats)) / 2 / SCALE if lats else 0.0
+
+    def simplified(self, tolerance_deg: float, decimals: int) -> list[Optional[dict]]:
+        """
+        GeoJSON geometry per input geometry (None when it collapses), with arcs simplified to
+        tolerance_deg and coordinates rounded to `decimals` places.
+        """
+        arcs = []
+        for arc in self.arcs:
+            rounded: list[tuple[float, float]] = []
+            for x, y in douglas_peucker(arc, tolerance_deg * SCALE):
+                p = (round(x / SCALE, decimals), round(y / SCALE, decimals))
+                if not rounded or rounded[-1] != p:
+                    rounded.append(p)
+            arcs.append(rounded)
+
+        geometries: list[Optional[dict]] = []
+        for polygons in self.rings:
+            out_polygons = []
+            for rings in polygons:
+                out_rings = []
+                for ring in rings:
+                    coords: list[tuple[float, float]] = []
+                    for arc_id, reversed_ in ring:
+                        points = arcs[arc_id][::-1] if reversed_ else arcs[arc_id]
+                        coords.extend(points if not coords else points[1:])
+                    if len(coords) >= 4 and len(set(coords)) >= 3:
+                        if coords[0] != coords[-1]:
+                            coords.append(coords[0])
+                        out_rings.append([list(p) for p in coords])
+                    elif not out_rings:
+                        break  # outer ring collapsed: drop the whole part
+                if out_rings:
+                    out_polygons.append(out_rings)
+            if not out_polygons:
+                geometries.append(None)
+            elif len(out_polygons) == 1:
+                geometries.append({"type": "Polygon", "coordinates": out_polygons[0]})
+            else:
+                geometries.append({"type": "MultiPolygon", "coordinates": out_polygons})
+        return geometries
+
+
+def pixel_tolerance_deg(zoom: int, lat: float, pixels: float = 1.0) -> float:
+    """Degrees spanned by `pixels` 256px web-mercator pixels at this zoom, on the shorter (latitude) axis."""
+    return pixels * 360.0 / (256 * 2 ** zoom) * math.cos(math.radians(lat))
+
+
+def decimals_for(tolerance_deg: float) -> int:
+    """Fewest decimal places whose rounding step is at most half the tolerance."""
+    return max(0, math.ceil(-math.log10(tolerance_deg / 2)))
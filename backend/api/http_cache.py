@@ -0,0 +1,92 @@
+"""
+HTTP validators for cacheable responses: strong ETags from a content hash,
+If-None-Match handling (304 Not Modified) and Cache-Control headers.
+Pre-serialized bodies can carry precompressed variants (api.compression), sent as they are
+to clients that accept them. Each coding has its own ETag ("abc-gzip", "abc-br"), and
+If-None-Match accepts any of them.
+"""
+
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from api.compression import add_vary, choose_encoding, coded_etag
+
+EVENTS_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+NEIGHBOURHOODS_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+# Every coding an ETag may carry, whether or not this process can produce it
+_CODINGS = ("br", "gzip")
+
+
+def content_etag(payload: Any) -> str:
+    """Strong ETag: quoted 128-bit BLAKE2b of the payload's canonical JSON."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest() + '"'
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag of an already-serialized body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> Optional[str]:
+    """
+    The validator the client holds when If-None-Match names this ETag, in any coding, or
+    is *; else None. If-None-Match uses weak comparison, so W/"x" matches "x".
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    variants = (etag, *(coded_etag(etag, coding) for coding in _CODINGS))
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return etag
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in variants:
+            return candidate
+    return None
+
+
+def set_validators(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 carrying the validator the client holds, and the same Cache-Control."""
+    response = Response(status_code=304)
+    set_validators(response, etag, cache_control)
+    return response
+
+
+def json_body_response(
+    request: Request,
+    body: bytes | memoryview,
+    etag: str,
+    cache_control: str,
+    encoded: Optional[dict[str, bytes | memoryview]] = None,
+    media_type: str = "application/json",
+) -> Response:
+    """
+    Pre-serialized body (JSON unless media_type says otherwise) with validators, or 304
+    when the client already has it. With `encoded` (encoding -> compressed body), the
+    variant the client prefers is sent.
+    """
+    matched = etag_matches(request, etag)
+    if matched:
+        return not_modified(matched, cache_control)
+    encoding = choose_encoding(request.headers.get("accept-encoding")) if encoded else None
+    if encoding in (encoded or {}):
+        response = Response(content=encoded[encoding], media_type=media_type)
+        response.headers["Content-Encoding"] = encoding
+        etag = coded_etag(etag, encoding)
+    else:
+        response = Response(content=body, media_type=media_type)
+    if encoded:
+        add_vary(response.headers, "Accept-Encoding")
+    set_validators(response, etag, cache_control)
+    return response
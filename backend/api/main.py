@@ -1,8 +1,68 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from api.routes import events, neighbourhoods
+from api.addresses import address_store
+from api.boundaries import boundary_store
+from api.compression import CompressionMiddleware
+from api.deps import close_supabase, open_supabase
+from api.generation import generation_watcher
+from api.replica import event_replica
+from api.routes import (
+    addresses,
+    changes,
+    clusters,
+    events,
+    export,
+    heatmap,
+    metrics,
+    neighbourhoods,
+    search,
+    spatial,
+    stats,
+    stream,
+    tiles,
+)
+from api.warmer import event_warmer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the pooled Supabase client once per process, start tailing ingest notifications,
+    load the neighbourhood boundaries, the address index and the event replica and start
+    the event warmer; stop them and close the client's connections on shutdown.
+    """
+    app.state.supabase = await open_supabase()
+    generation_watcher.start()
+    await boundary_store.ensure(app.state.supabase)
+    await address_store.ensure(app.state.supabase)
+    await event_replica.start(app.state.supabase)
+    await event_warmer.start(app.state.supabase)
+    try:
+        yield
+    finally:
+        await event_warmer.stop()
+        await event_replica.stop()
+        await generation_watcher.stop()
+        await close_supabase(app.state.supabase)
+        app.state.supabase = None
+
 
-app = FastAPI(title="Events API", description="Read-only API for Supabase events.")
+app = FastAPI(title="Events API", description="Read-only API for Supabase events.", lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
 
+# Fixed /events/... paths go before events.router so /events/{event_id} does not shadow them
+app.include_router(spatial.router, prefix="/api", tags=["events"])
+app.include_router(clusters.router, prefix="/api", tags=["events"])
+app.include_router(heatmap.router, prefix="/api", tags=["events"])
+app.include_router(stats.router, prefix="/api", tags=["events"])
+app.include_router(export.router, prefix="/api", tags=["events"])
+app.include_router(stream.router, prefix="/api", tags=["events"])
+app.include_router(changes.router, prefix="/api", tags=["events"])
+app.include_router(search.router, prefix="/api", tags=["events"])
 app.include_router(events.router, prefix="/api", tags=["events"])
 app.include_router(neighbourhoods.router, prefix="/api", tags=["neighbourhoods"])
+app.include_router(addresses.router, prefix="/api", tags=["addresses"])
+app.include_router(metrics.router, prefix="/api", tags=["metrics"])
+app.include_router(tiles.router, tags=["tiles"])
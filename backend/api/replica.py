@@ -0,0 +1,547 @@
+"""
+In-memory columnar replica of the events table for the API process.
+
+Filter columns live in NumPy arrays (int64 epoch microseconds for start/end/published,
+small-int codes for type, int32 indices for neighbourhood, float64 lon/lat), so the list_events overlap
+window, type and neighbourhood filters and the (published_at desc, id) ordering run as
+vectorized operations instead of a PostgREST round trip. Full rows are kept alongside for
+output.
+
+Refresh: a full load at startup, an incremental pull whenever a new ingest generation
+appears, and a full reload every EVENTS_REPLICA_FULL_RELOAD seconds (default 3600) to pick
+up deletions. load_events stamps every row it writes with its ingest generation
+(ingest_generation), so the pull asks for rows stamped after the generation the replica
+last loaded, whatever their source timestamps say. It reaches back a further
+EVENTS_REPLICA_PULL_OVERLAP seconds (default 300) for loads that overlapped: a load stamps
+its rows before writing them, so a slower concurrent load can commit rows stamped below a
+generation that is already current. Until the replica has caught up with the current
+generation, list_events falls back to PostgREST. On a database without the
+events.ingest_generation column (see the README's schema setup), every refresh is a full
+reload instead, and the pull is tried again after each scheduled full reload.
+
+A refresh never rebuilds in place. The new columns are built in a worker thread on a copy
+(or from scratch, for a full reload), each listener prepares its derived index from that
+copy in the same thread, and then, on the event loop with no await in between, the
+replica installs the copy and every listener commits its prepared result. Requests keep
+reading the previous state, consistent across all indexes, until that moment.
+
+Needs numpy; disabled (PostgREST only) when it is missing or EVENTS_REPLICA_ENABLED=0.
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+from api.geo.points import parse_point
+from api.generation import generation_watcher
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:  # optional: the API still serves from PostgREST
+    np = None
+
+PAGE_SIZE = 1000
+# Null start/end mean "open-ended": store as -inf/+inf so the overlap test needs no null checks
+_NEG_INF = -(2**63)
+_POS_INF = 2**63 - 1
+_NULL_CODE = -1
+
+
+def to_epoch_us(value: Any) -> Optional[int]:
+    """ISO string or datetime -> microseconds since epoch (naive values are UTC)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1_000_000)
+
+
+def epoch_day(value: Any) -> Optional[int]:
+    """ISO string or datetime -> days since 1970-01-01 (UTC); None stays None."""
+    us = to_epoch_us(value)
+    return None if us is None else us // 86_400_000_000
+
+
+def day_number(d: date) -> int:
+    """Date -> days since 1970-01-01, comparable with epoch_day."""
+    return (d - date(1970, 1, 1)).days
+
+
+def change_stamp(row: dict[str, Any]) -> Optional[int]:
+    """
+    Latest of a row's updated_at/created_at in epoch microseconds; its ingest_generation
+    when both are null; None when that is null too (rows written before it existed).
+    """
+    stamps = [us for us in (to_epoch_us(row.get("updated_at")), to_epoch_us(row.get("created_at"))) if us is not None]
+    return max(stamps) if stamps else row.get("ingest_generation")
+
+
+def missing_column(error: Exception, column: str) -> bool:
+    """True when a PostgREST error says `column` does not exist (Postgres 42703)."""
+    return getattr(error, "code", None) == "42703" or (column in str(error) and "does not exist" in str(error))
+
+
+def same_content(a: dict[str, Any], b: dict[str, Any]) -> bool:
+    """True when two copies of a row differ at most in the ingest generation that wrote them."""
+    return all(a.get(k) == b.get(k) for k in a.keys() | b.keys() if k != "ingest_generation")
+
+
+# Upserted rows' columns, copied before an incremental refresh changes them
+_COLUMNS = ("_start", "_end", "_published", "_changed", "_type", "_nbhd", "lon", "lat")
+# Everything a refresh replaces, installed together
+_STATE = (
+    "rows", "_pos", "_size", "_type_codes", "_nbhd_index", *_COLUMNS,
+    "_order", "_rank", "_ids", "_ids_sorted", "_published_sorted",
+    "_change_order", "_changed_sorted", "_change_ids_sorted",
+)
+
+# listener(rows, full, replica) -> commit or None; see EventReplica.subscribe
+Listener = Callable[[list[dict[str, Any]], bool, "EventReplica"], Optional[Callable[[], None]]]
+
+
+def swap_in(target: Any, built: Any) -> None:
+    """Make `target` take over the state of `built`, an instance of its class built off the loop."""
+    target.__dict__.update(built.__dict__)
+
+
+def day_bounds_us(start_date: date, end_date: date) -> tuple[int, int]:
+    """Query window [start of start_date, end of end_date] in epoch microseconds (UTC)."""
+    lo = to_epoch_us(datetime.combine(start_date, datetime.min.time()))
+    hi = to_epoch_us(datetime.combine(end_date, datetime.max.time()))
+    return lo, hi
+
+
+class EventReplica:
+    """Columnar copy of events; positions are stable between full reloads."""
+
+    def __init__(self, enabled: bool = True, full_reload_interval: float = 3600.0, pull_overlap: float = 300.0) -> None:
+        self.enabled = enabled and np is not None
+        self.full_reload_interval = full_reload_interval
+        self.pull_overlap_us = int(pull_overlap * 1_000_000)
+        self.generation = -1
+        self.ready = False
+        self.rows: list[dict[str, Any]] = []
+        self._pos: dict[str, int] = {}
+        self._type_codes: dict[str, int] = {}
+        self._nbhd_index: dict[str, int] = {}
+        self._listeners: list[Listener] = []
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._full_loaded_at = float("-inf")
+        self.refreshes = 0
+        self.served = 0
+        self.pull_supported = True
+        self._reset_columns(0)
+
+    @classmethod
+    def from_env(cls) -> "EventReplica":
+        return cls(
+            enabled=os.environ.get("EVENTS_REPLICA_ENABLED", "1").strip().lower() not in ("0", "false", "no"),
+            full_reload_interval=float(os.environ.get("EVENTS_REPLICA_FULL_RELOAD", 3600)),
+            pull_overlap=float(os.environ.get("EVENTS_REPLICA_PULL_OVERLAP", 300)),
+        )
+
+    # --- storage ---
+
+    def _reset_columns(self, capacity: int) -> None:
+        self.rows = []
+        self._pos = {}
+        self._size = 0
+        if np is None:
+            return
+        capacity = max(capacity, 1024)
+        self._start = np.empty(capacity, dtype=np.int64)
+        self._end = np.empty(capacity, dtype=np.int64)
+        self._published = np.empty(capacity, dtype=np.int64)
+        self._changed = np.empty(capacity, dtype=np.int64)
+        self._type = np.empty(capacity, dtype=np.int16)
+        self._nbhd = np.empty(capacity, dtype=np.int32)
+        self.lon = np.empty(capacity, dtype=np.float64)
+        self.lat = np.empty(capacity, dtype=np.float64)
+        self._order = np.empty(0, dtype=np.int64)
+        self._change_order = np.empty(0, dtype=np.int64)
+        self._ids = np.empty(0, dtype=str)
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._start)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in _COLUMNS:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    def type_code(self, event_type: Optional[str]) -> int:
+        if event_type is None:
+            return _NULL_CODE
+        return self._type_codes.setdefault(event_type, len(self._type_codes))
+
+    def type_names(self) -> dict[int, str]:
+        """Type code -> type name, for codes found in the type column."""
+        return {code: name for name, code in self._type_codes.items()}
+
+    @property
+    def types(self):
+        """Type code per position (-1 for untyped events)."""
+        return self._type[: self._size]
+
+    @property
+    def ends(self):
+        """end_date per position in epoch microseconds (max int64 for open-ended events)."""
+        return self._end[: self._size]
+
+    def neighbourhood_index(self, neighborhood_id: Optional[Any]) -> int:
+        if neighborhood_id is None:
+            return _NULL_CODE
+        return self._nbhd_index.setdefault(str(neighborhood_id), len(self._nbhd_index))
+
+    def _apply(self, rows: list[dict[str, Any]], previous: Optional["EventReplica"] = None) -> None:
+        """
+        Upsert rows into the columns and rebuild the global sort orders. `previous` is the
+        state a full reload replaces, consulted like the current one for change stamps.
+        """
+        self._grow(self._size + len(rows))
+        for row in rows:
+            event_id = str(row["id"])
+            pos = self._pos.get(event_id)
+            # Without source timestamps, a row keeps the stamp of the load that first wrote
+            # its content, so reloading it unchanged does not resend it to every sync
+            kept = None
+            if pos is None:
+                old = previous._pos.get(event_id) if previous is not None else None
+                if old is not None and same_content(previous.rows[old], row):
+                    kept = int(previous._changed[old])
+                pos = self._size
+                self._size += 1
+                self._pos[event_id] = pos
+                self.rows.append(row)
+            else:
+                if same_content(self.rows[pos], row):
+                    kept = int(self._changed[pos])
+                self.rows[pos] = row
+            start = to_epoch_us(row.get("start_date"))
+            end = to_epoch_us(row.get("end_date"))
+            self._start[pos] = _NEG_INF if start is None else start
+            self._end[pos] = _POS_INF if end is None else end
+            self._published[pos] = to_epoch_us(row["published_at"])
+            self._type[pos] = self.type_code(row.get("type"))
+            self._nbhd[pos] = self.neighbourhood_index(row.get("neighborhood_id"))
+            point = parse_point(row.get("location"))
+            self.lon[pos], self.lat[pos] = point if point is not None else (np.nan, np.nan)
+            stamp = kept if kept is not None and kept != _NEG_INF else change_stamp(row)
+            self._changed[pos] = _NEG_INF if stamp is None else stamp
+        n = self._size
+        # published_at desc, then id asc: lexsort sorts by the last key first
+        ids = self._ids = np.array([str(r["id"]) for r in self.rows[:n]])
+        self._order = np.lexsort((ids, -self._published[:n]))
+        self._rank = np.empty(n, dtype=np.int64)
+        self._rank[self._order] = np.arange(n)
+        self._ids_sorted = ids[self._order]
+        self._published_sorted = self._published[:n][self._order]
+        # (change stamp, id) asc, for delta sync
+        self._change_order = np.lexsort((ids, self._changed[:n]))
+        self._changed_sorted = self._changed[:n][self._change_order]
+        self._change_ids_sorted = ids[self._change_order]
+
+    def _staged(self, rows: list[dict[str, Any]], full: bool) -> "EventReplica":
+        """A new replica state with rows applied: a copy of this one, or from scratch when full."""
+        staged = EventReplica(self.enabled)
+        if full:
+            staged._reset_columns(len(rows))
+        else:
+            staged.rows = list(self.rows)
+            staged._pos = dict(self._pos)
+            staged._size = self._size
+            for name in _COLUMNS:
+                setattr(staged, name, getattr(self, name).copy())
+        # Codes stay stable across reloads
+        staged._type_codes = dict(self._type_codes)
+        staged._nbhd_index = dict(self._nbhd_index)
+        staged._apply(rows, previous=self if full else None)
+        return staged
+
+    def _install(self, staged: "EventReplica") -> None:
+        for name in _STATE:
+            setattr(self, name, getattr(staged, name))
+
+    def subscribe(self, listener: Listener) -> None:
+        """
+        listener(rows, full, replica) is called after each refresh with the rows that changed.
+        It runs in a worker thread, before the new state is installed: `replica` is that new
+        state, so read it, not event_replica. It may return a commit, a callable run on the
+        event loop as the state is installed, which should only swap in what was prepared.
+        """
+        self._listeners.append(listener)
+
+    def _prepare(self, rows: list[dict[str, Any]], full: bool):
+        """New state and listener commits for a refresh; runs in a worker thread."""
+        staged = self._staged(rows, full) if rows or full else self
+        commits = []
+        for listener in self._listeners:
+            try:
+                commit = listener(rows, full, staged)
+            except Exception as e:
+                logger.warning("Replica listener failed: %s", e)
+                continue
+            if commit is not None:
+                commits.append(commit)
+        return staged, commits
+
+    # --- refresh ---
+
+    async def _fetch_all(self, client, since: Optional[int]) -> list[dict[str, Any]]:
+        """Page through events by id; with `since`, only rows stamped with a later ingest generation."""
+        rows: list[dict[str, Any]] = []
+        last_id: Optional[str] = None
+        while True:
+            q = client.table("events").select("*")
+            if since is not None:
+                q = q.gt("ingest_generation", since)
+            if last_id is not None:
+                q = q.gt("id", last_id)
+            r = await q.order("id").limit(PAGE_SIZE).execute()
+            batch = r.data or []
+            rows.extend(batch)
+            if len(batch) < PAGE_SIZE:
+                return rows
+            last_id = batch[-1]["id"]
+
+    async def _pull(self, client) -> Optional[list[dict[str, Any]]]:
+        """Rows stamped since the loaded generation, or None when the database cannot say."""
+        try:
+            return await self._fetch_all(client, self.generation - self.pull_overlap_us)
+        except Exception as e:
+            if not missing_column(e, "ingest_generation"):
+                raise
+        logger.warning("events.ingest_generation is missing; the event replica reloads fully instead")
+        self.pull_supported = False
+        return None
+
+    async def refresh(self, client, full: bool = False) -> None:
+        if not self.enabled:
+            return
+        async with self._lock:
+            # Read before pulling: every load up to this generation has written its rows
+            generation = await generation_watcher.current(client)
+            full = full or not self.ready or not self.pull_supported
+            rows = None if full else await self._pull(client)
+            if rows is None:
+                full = True
+                rows = await self._fetch_all(client, None)
+            staged, commits = await asyncio.to_thread(self._prepare, rows, full)
+            # Publish the columns and every derived index together: no await from here on
+            self._install(staged)
+            if full:
+                self._full_loaded_at = time.monotonic()
+            self.generation = generation
+            self.ready = True
+            self.refreshes += 1
+            for commit in commits:
+                try:
+                    commit()
+                except Exception as e:
+                    logger.warning("Replica listener commit failed: %s", e)
+            logger.info(
+                "Event replica %s refresh: %s row(s), %s total",
+                "full" if full else "incremental", len(rows), self._size,
+            )
+
+    async def _run(self, client) -> None:
+        while True:
+            await generation_watcher.wait(generation_watcher.poll_interval)
+            try:
+                if time.monotonic() - self._full_loaded_at >= self.full_reload_interval:
+                    # The column may have been added since
+                    self.pull_supported = True
+                    await self.refresh(client, full=True)
+                elif await generation_watcher.current(client) > self.generation:
+                    await self.refresh(client)
+            except Exception as e:
+                logger.warning("Event replica refresh failed: %s", e)
+
+    async def start(self, client) -> None:
+        if not self.enabled:
+            if np is None:
+                logger.info("numpy not installed; event replica disabled")
+            return
+        try:
+            await self.refresh(client, full=True)
+        except Exception as e:
+            logger.warning("Initial event replica load failed: %s", e)
+        self._task = asyncio.ensure_future(self._run(client))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # --- queries ---
+
+    @property
+    def version(self) -> int:
+        """
+        Bumps on every applied refresh, including full reloads that leave the generation
+        alone; tag anything derived from the replica's rows with it.
+        """
+        return self.refreshes
+
+    def snapshot(self) -> "EventReplica":
+        """
+        The current state, for reading off the loop: refreshes install new arrays and row
+        lists instead of changing these, so the snapshot stays consistent.
+        """
+        return copy.copy(self)
+
+    def can_serve(self, generation: Optional[int]) -> bool:
+        return self.enabled and self.ready and (generation is None or self.generation >= generation)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def filter_mask(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        event_type: Optional[str] = None,
+        neighborhood_id: Optional[UUID] = None,
+    ):
+        """Boolean mask over positions [0, size) for the overlap window, type and neighbourhood."""
+        n = self._size
+        mask = np.ones(n, dtype=bool)
+        if start_date is not None and end_date is not None:
+            lo, hi = day_bounds_us(start_date, end_date)
+            mask &= (self._start[:n] <= hi) & (self._end[:n] >= lo)
+        if event_type is not None:
+            code = self._type_codes.get(event_type)
+            if code is None:
+                return np.zeros(n, dtype=bool)
+            mask &= self._type[:n] == code
+        if neighborhood_id is not None:
+            idx = self._nbhd_index.get(str(neighborhood_id))
+            if idx is None:
+                return np.zeros(n, dtype=bool)
+            mask &= self._nbhd[:n] == idx
+        return mask
+
+    def in_order(self, positions):
+        """Sort positions into (published_at desc, id) order."""
+        return positions[np.argsort(self._rank[positions], kind="stable")]
+
+    def select_positions(
+        self,
+        start_date: date,
+        end_date: date,
+        event_type: Optional[str] = None,
+        neighborhood_id: Optional[UUID] = None,
+    ):
+        """Row positions overlapping the window, in (published_at desc, id) order."""
+        mask = self.filter_mask(start_date, end_date, event_type, neighborhood_id)
+        return self._order[mask[self._order]]
+
+    def project(self, positions, columns: Optional[list[str]] = None) -> list[dict[str, Any]]:
+        if columns is None:
+            return [self.rows[p] for p in positions]
+        return [{c: self.rows[p].get(c) for c in columns} for p in positions]
+
+    def _seek(self, after: tuple[str, str]) -> int:
+        """Index in the global order of the first row strictly after the (published_at, id) cursor."""
+        published = to_epoch_us(after[0])
+        # _published_sorted is descending: count rows published later than the cursor
+        k = int(np.searchsorted(-self._published_sorted, -published, side="left"))
+        tie_end = int(np.searchsorted(-self._published_sorted, -published, side="right"))
+        k += int(np.searchsorted(self._ids_sorted[k:tie_end], after[1], side="right"))
+        return k
+
+    def query(
+        self,
+        start_date: date,
+        end_date: date,
+        event_type: Optional[str] = None,
+        neighborhood_id: Optional[UUID] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple[str, str]] = None,
+        columns: Optional[list[str]] = None,
+    ) -> list[dict[str, Any]]:
+        """Same rows, order and paging as the PostgREST path in list_events (limit + 1 rows when paged)."""
+        self.served += 1
+        if self._size == 0:
+            return []
+        positions = self.select_positions(start_date, end_date, event_type, neighborhood_id)
+        if after is not None:
+            positions = positions[self._rank[positions] >= self._seek(after)]
+        if limit is not None:
+            positions = positions[: limit + 1]
+        return self.project(positions, columns)
+
+    def positions_of(self, event_ids) -> Any:
+        """Positions of the given ids; ids not in the replica are skipped."""
+        return np.array([self._pos[i] for i in event_ids if i in self._pos], dtype=np.int64)
+
+    def _change_seek(self, after: tuple[int, str]) -> int:
+        """Index in the change order of the first row strictly after the (change stamp, id) position."""
+        k = int(np.searchsorted(self._changed_sorted, after[0], side="left"))
+        tie_end = int(np.searchsorted(self._changed_sorted, after[0], side="right"))
+        k += int(np.searchsorted(self._change_ids_sorted[k:tie_end], after[1], side="right"))
+        return k
+
+    def changed_after(self, mask, after: Optional[tuple[int, str]] = None, limit: Optional[int] = None):
+        """
+        Positions under `mask` in (change stamp, id) order, strictly after the `after` keyset
+        position when given (limit + 1 positions when limited). Rows without any stamp
+        sort first and never come after a watermark.
+        """
+        k = 0 if after is None else self._change_seek(after)
+        order = self._change_order[k:]
+        if limit is None:
+            return order[mask[order]]
+        # Walk the order in growing chunks until the page is full
+        found, chunk = [], max(4 * (limit + 1), 1024)
+        wanted = limit + 1
+        while len(order) and wanted > 0:
+            hits = order[:chunk][mask[order[:chunk]]][:wanted]
+            found.append(hits)
+            wanted -= len(hits)
+            order = order[chunk:]
+            chunk *= 2
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def change_key(self, pos: int) -> tuple[int, str]:
+        """(change stamp, id) keyset position of a row, as changed_after takes it."""
+        return int(self._changed[pos]), str(self._ids[pos])
+
+    def last_change_key(self) -> Optional[tuple[int, str]]:
+        """Largest (change stamp, id) in the replica, or None when it is empty."""
+        if self._size == 0:
+            return None
+        return int(self._changed_sorted[-1]), str(self._change_ids_sorted[-1])
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "rows": self._size,
+            "generation": self.generation,
+            "refreshes": self.refreshes,
+            "pull_supported": self.pull_supported,
+            "served": self.served,
+        }
+
+
+event_replica = EventReplica.from_env()
@@ -0,0 +1,118 @@
+"""
+Event count rollups for /api/events/stats, kept up to date from the event replica.
+
+Every event is counted once, on its day (start_date, else published_at, UTC), under its
+(type, neighborhood_id, source), in a DayCounts (api.daycounts): day -> {key: count},
+updated from the rows each replica refresh hands its listeners. A changed row replaces
+its previous contribution, and a full reload rebuilds everything (in the replica's
+refresh thread, swapped in with the replica's new state). A query sums only the
+day buckets in its window, so a year-long timeline costs the number of distinct
+(day, type, neighbourhood, source) combinations, not the number of events.
+"""
+
+import logging
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Iterable, Optional
+
+from api.daycounts import DayCounts, event_day
+from api.replica import event_replica, swap_in
+
+logger = logging.getLogger(__name__)
+
+GROUP_FIELDS = ("type", "neighborhood_id", "source")
+_EPOCH = date(1970, 1, 1)
+
+Key = tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def bucket_start(day: int, bucket: Optional[str]) -> Optional[date]:
+    """First day of the day/week (ISO, Monday)/month bucket holding an epoch day."""
+    if bucket is None:
+        return None
+    d = _EPOCH + timedelta(days=day)
+    if bucket == "week":
+        return d - timedelta(days=d.weekday())
+    if bucket == "month":
+        return d.replace(day=1)
+    return d
+
+
+class EventRollups:
+    """Per-day counts by (type, neighborhood_id, source)."""
+
+    def __init__(self) -> None:
+        self._counts = DayCounts()
+
+    def reset(self) -> None:
+        self._counts.reset()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def apply(self, rows: list[dict[str, Any]]) -> None:
+        """Count new rows and recount changed ones; a row repeated in the batch counts once."""
+        self.apply_contributions(self.contributions(rows))
+
+    def apply_contributions(self, contributions) -> None:
+        """Apply what contributions() computed, e.g. in another thread."""
+        self._counts.apply(contributions)
+
+    def contributions(self, rows: list[dict[str, Any]]) -> list[tuple[str, Optional[tuple]]]:
+        """Each row's (id, contribution); reads nothing but the rows, so it is safe off the loop."""
+        contributions = []
+        for row in rows:
+            day = event_day(row)
+            nbhd = row.get("neighborhood_id")
+            key: Key = (row.get("type"), None if nbhd is None else str(nbhd), row.get("source"))
+            contributions.append((str(row["id"]), None if day is None else (day, (key,))))
+        return contributions
+
+    def query(
+        self,
+        start_day: Optional[int],
+        end_day: Optional[int],
+        group_by: Iterable[str] = (),
+        bucket: Optional[str] = None,
+        filters: Optional[dict[str, Optional[str]]] = None,
+    ) -> Counter:
+        """
+        (bucket start, *group values) -> count over [start_day, end_day] (None = all days).
+        group_by picks from GROUP_FIELDS; filters maps a field to the value it must equal.
+        """
+        picks = [GROUP_FIELDS.index(f) for f in group_by]
+        wanted = [(GROUP_FIELDS.index(f), v) for f, v in (filters or {}).items()]
+        out: Counter = Counter()
+        for day, counter in self._counts.days(0, start_day, end_day):
+            start = bucket_start(day, bucket)
+            for key, n in counter.items():
+                if all(key[i] == v for i, v in wanted):
+                    out[(start, *(key[i] for i in picks))] += n
+        return out
+
+    def stats(self) -> dict:
+        return {"events": len(self._counts), "days": self._counts.day_count()}
+
+
+event_rollups = EventRollups()
+
+
+def _update(rows, full: bool, replica):
+    """Count off the loop: a full reload builds new rollups, a pull only its contributions."""
+    if full:
+        rollups = EventRollups()
+        rollups.apply(rows)
+    else:
+        contributions = event_rollups.contributions(rows)
+
+    def commit() -> None:
+        if full:
+            swap_in(event_rollups, rollups)
+        else:
+            event_rollups.apply_contributions(contributions)
+        logger.info("Event rollups updated: %s event(s)", len(event_rollups))
+
+    return commit
+
+
+event_replica.subscribe(_update)
@@ -0,0 +1,60 @@
+"""
+GET /api/addresses/suggest: address autocomplete from addresses seen by ingest, answered
+from the in-memory index in api.addresses, each with the neighbourhood that contains it.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel
+
+from api.addresses import address_store
+from api.boundaries import boundary_store
+from api.deps import get_supabase
+from api.routes.neighbourhoods import NeighbourhoodResponse
+
+router = APIRouter()
+
+SUGGEST_CACHE_CONTROL = "public, max-age=300"
+
+
+class AddressSuggestion(BaseModel):
+    address: str
+    lon: float
+    lat: float
+    neighbourhood: Optional[NeighbourhoodResponse] = None
+
+
+@router.get("/addresses/suggest", response_model=list[AddressSuggestion])
+async def suggest_addresses(
+    response: Response,
+    prefix: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=25, description="Max suggestions"),
+    client=Depends(get_supabase),
+) -> list[AddressSuggestion]:
+    """
+    Return addresses starting with prefix (or whose street does), with coordinates and the
+    neighbourhood containing them (null when none does, or while boundaries are loading).
+    Street words may be typed in full or abbreviated: "1200 west broad" and "hastings street"
+    find 1200 W BROADWAY and 55 E HASTINGS ST.
+    """
+    await address_store.ensure(client)
+    await boundary_store.ensure(client)
+    if not address_store.ready:
+        raise HTTPException(status_code=503, detail="Address index is not ready", headers={"Retry-After": "5"})
+    matches = address_store.suggest(prefix, limit)
+    if matches and boundary_store.ready:
+        located = boundary_store.locate_many([a.lon for a in matches], [a.lat for a in matches])
+    else:
+        located = [None] * len(matches)
+    suggestions = [
+        AddressSuggestion(
+            address=address.label,
+            lon=address.lon,
+            lat=address.lat,
+            neighbourhood=NeighbourhoodResponse(id=found.id, name=found.name) if found else None,
+        )
+        for address, found in zip(matches, located)
+    ]
+    response.headers["Cache-Control"] = SUGGEST_CACHE_CONTROL
+    return suggestions
@@ -0,0 +1,143 @@
+"""
+GET /api/events/changes: delta sync for clients that keep a local copy of the events.
+Without `since`, pages through every event that has not ended (optionally filtered by type
+and neighbourhood); with the token from the previous response, returns only what changed
+since: upserts for new or updated events, tombstones for events the copy should drop.
+Served from the event replica and the change log in api.changes.
+"""
+
+import base64
+import json
+from typing import Literal, NamedTuple, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from api.changes import change_log, now_us
+from api.replica import event_replica
+from api.routes.events import MAX_PAGE_SIZE, EventResponse, EventType
+
+router = APIRouter()
+
+
+class Tombstone(BaseModel):
+    """
+    An event to drop: deleted upstream, ended (expired), or changed so that it no longer
+    matches the sync's filters. Ids the copy does not hold can be ignored.
+    """
+
+    id: UUID
+    reason: Literal["deleted", "expired", "filtered"]
+
+
+class ChangesResponse(BaseModel):
+    upserts: list[EventResponse]
+    tombstones: list[Tombstone]
+    token: str
+    has_more: bool
+
+
+# Keyset position before every row: where a full sync of an empty replica leaves off
+START = (-(2**63), str(UUID(int=0)))
+
+
+class SyncToken(NamedTuple):
+    after: Optional[tuple[int, str]]  # keyset position: (change stamp, id) of the last row sent
+    synced_us: int  # when the page was served, epoch microseconds
+    full: bool  # still paging through a full sync
+    issuer: Optional[str] = None  # change_log.issuer of the process that served the page
+
+
+def encode_token(token: SyncToken) -> str:
+    """Opaque sync token: base64url JSON of [change stamp, id, synced at, full, issuer]."""
+    stamp, event_id = token.after if token.after is not None else (None, None)
+    raw = json.dumps([stamp, event_id, token.synced_us, token.full, token.issuer], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> SyncToken:
+    """Inverse of encode_token; raises 400 on anything that is not a token we issued."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        stamp, event_id, synced_us, full, *rest = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if len(rest) > 1 or not isinstance(full, bool) or not all(isinstance(i, str) for i in rest):
+            raise ValueError("malformed sync token")
+        after = None if stamp is None else (int(stamp), str(UUID(str(event_id))))
+        return SyncToken(after, int(synced_us), full, rest[0] if rest else None)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid sync token") from e
+
+
+@router.get("/events/changes", response_model=ChangesResponse, response_model_exclude_unset=True)
+async def event_changes(
+    since: Optional[str] = Query(None, description="token from the previous response; omit for a full sync"),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Max rows per page"),
+    event_type: Optional[EventType] = Query(None, description="Only events of this EVENT_TYPE"),
+    neighborhood_id: Optional[UUID] = Query(None, description="Only events in this neighborhood"),
+) -> ChangesResponse:
+    """
+    Return events changed since the token, oldest change first, and the token to pass next.
+    Keep calling with the new token while has_more is true; pass the same filters each time.
+    Answers 410 when the token is older than the change history (sync again without
+    `since`) and 503 while the event replica is disabled or still loading.
+    """
+    token = decode_token(since) if since else None
+    if not (event_replica.enabled and event_replica.ready):
+        raise HTTPException(status_code=503, detail="Event changes are not available", headers={"Retry-After": "5"})
+    now = now_us()
+    # Another worker's token is replayed from earlier: its log was filled at other times
+    replay_us = change_log.replay_from(token.synced_us, token.issuer) if token is not None else None
+    if token is not None and not change_log.covers(replay_us, now):
+        raise HTTPException(status_code=410, detail="Sync token has expired; sync again without since")
+
+    matches = event_replica.filter_mask(
+        event_type=event_type.value if event_type else None,
+        neighborhood_id=neighborhood_id,
+    )
+    live = event_replica.ends >= now
+    full = token is None or token.full
+    after = token.after if token is not None else None
+    # A full sync only walks the events it sends; an incremental one walks every changed
+    # row, so rows that stopped matching or ended come back as tombstones
+    positions = event_replica.changed_after(matches & live if full else event_replica.filter_mask(), after, limit)
+    has_more = len(positions) > limit
+    page = [int(pos) for pos in positions[:limit]]
+
+    tombstones, passed = [], []
+    if token is not None and after is not None:
+        # Rows the keyset has already passed are only found through the change log
+        for event_id in change_log.deleted_between(replay_us, now):
+            tombstones.append(Tombstone(id=event_id, reason="deleted"))
+        changed = event_replica.positions_of(change_log.changed_between(replay_us, now))
+        ended = (matches & (event_replica.ends > replay_us) & ~live).nonzero()[0]
+        passed = [int(pos) for pos in (*changed, *ended) if event_replica.change_key(int(pos)) <= after]
+
+    upserts, sent = [], set()
+    for pos in (*page, *passed):
+        if pos in sent:
+            continue
+        sent.add(pos)
+        row = event_replica.rows[pos]
+        if not (matches[pos] and live[pos]) and not (
+            token is not None and change_log.could_have_sent(str(row["id"]), token.synced_us, token.issuer)
+        ):
+            continue  # new since the token and never sendable: nothing for the copy to drop
+        if not matches[pos]:
+            tombstones.append(Tombstone(id=row["id"], reason="filtered"))
+        elif not live[pos]:
+            tombstones.append(Tombstone(id=row["id"], reason="expired"))
+        else:
+            upserts.append(EventResponse(**row))
+
+    if full and not has_more:
+        # Everything past here was skipped as not matching; don't walk it again
+        after = event_replica.last_change_key() or START
+    elif page:
+        after = event_replica.change_key(page[-1])
+    return ChangesResponse(
+        upserts=upserts,
+        tombstones=tombstones,
+        token=encode_token(SyncToken(after, now, full and has_more, change_log.issuer)),
+        has_more=has_more,
+    )
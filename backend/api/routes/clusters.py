@@ -0,0 +1,88 @@
+"""
+GET /api/events/clusters: zoom-aware clusters of located events inside a bbox, with counts
+and per-type breakdowns, walked from the precomputed hierarchy in api.spatial.
+Prefix sums for recent filter combinations are cached per hierarchy build.
+"""
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from api.cache import MISSING, TTLCache
+from api.replica import event_replica
+from api.routes.events import EventType
+from api.routes.spatial import parse_bbox
+from api.spatial import event_clusters, spatial_ready
+
+router = APIRouter()
+
+MAX_ZOOM = 22
+MAX_RESULTS = 5000
+
+prefix_cache = TTLCache.from_env("CLUSTER_PREFIX_CACHE", maxsize=32, ttl=300.0)
+
+
+class ClusterResponse(BaseModel):
+    """
+    A cluster (count > 1) or a single event (count == 1, event_id set).
+    expansion_zoom: zoom at which the cluster splits; null when its events share one spot.
+    """
+
+    lng: float
+    lat: float
+    count: int
+    types: dict[str, int]
+    event_id: Optional[str] = None
+    expansion_zoom: Optional[int] = None
+
+
+@router.get("/events/clusters", response_model=list[ClusterResponse], response_model_exclude_unset=True)
+async def event_clusters_in_bbox(
+    bbox: str = Query(..., description="min_lng,min_lat,max_lng,max_lat"),
+    zoom: int = Query(..., ge=0, le=MAX_ZOOM, description="Map zoom level"),
+    start_date: Optional[date] = Query(None, description="Start of date range (inclusive); needs end_date"),
+    end_date: Optional[date] = Query(None, description="End of date range (inclusive); needs start_date"),
+    event_type: Optional[EventType] = Query(None, description="Filter by EVENT_TYPE"),
+) -> list[ClusterResponse]:
+    """
+    Return clusters of events for the map view at this zoom. `types` counts events per
+    EVENT_TYPE (untyped events count toward `count` only). Answers 400 when the bbox holds
+    more than MAX_RESULTS clusters at this zoom.
+    """
+    if (start_date is None) != (end_date is None):
+        raise HTTPException(status_code=400, detail="start_date and end_date go together")
+    box = parse_bbox(bbox)
+    if not spatial_ready():
+        raise HTTPException(status_code=503, detail="Spatial index is not ready", headers={"Retry-After": "5"})
+
+    key = (event_clusters.version, start_date, end_date, event_type)
+    prefix = prefix_cache.get(key, event_replica.generation)
+    if prefix is MISSING:
+        mask = None
+        if start_date is not None or event_type is not None:
+            mask = event_replica.filter_mask(start_date, end_date, event_type.value if event_type else None)
+        prefix = event_clusters.prefix(mask)
+        prefix_cache.set(key, prefix, event_replica.generation)
+
+    items = event_clusters.clusters(*box, zoom, prefix, limit=MAX_RESULTS + 1)
+    if len(items) > MAX_RESULTS:
+        raise HTTPException(
+            status_code=400, detail=f"More than {MAX_RESULTS} clusters in bbox; zoom out or narrow the bbox"
+        )
+    names = event_replica.type_names()
+    out = []
+    for item in items:
+        cluster = ClusterResponse(
+            lng=item["lon"],
+            lat=item["lat"],
+            count=item["count"],
+            types={names[code]: n for code, n in item["types"].items() if code in names},
+        )
+        if "position" in item:
+            cluster.event_id = str(event_replica.rows[item["position"]]["id"])
+        else:
+            cluster.expansion_zoom = item["expansion_zoom"]
+        out.append(cluster)
+    return out
@@ -1,20 +1,73 @@
 """
 GET /api/events: query Supabase events by date range and optional event type.
-Read-only; ordered by published_at desc.
+Read-only; ordered by published_at desc, id.
+Optional keyset pagination: pass limit (and cursor from the previous page's X-Next-Cursor).
+Optional projection: fields=a,b,c or view=map, pushed down into the PostgREST select.
+Results are cached per normalized query until the TTL or the next ingest generation;
+concurrent misses for the same query share one upstream call. Hot windows are
+precomputed by api.warmer and served stale-while-revalidate; with several workers they
+are read zero-copy from api.shared_cache. Misses are answered from the in-memory
+columnar replica (api.replica) when it is current, else from PostgREST.
+Responses carry a strong ETag; If-None-Match with a current ETag gets 304.
+EVENTS_FAST_JSON=1 skips per-row model validation: fetched rows are serialized once,
+straight to JSON bytes, and cached pages are sent as they are.
+Accept: application/x-ndjson or application/geo+json streams the whole window instead,
+fetched page by page, so memory stays flat however many rows it holds.
+GET /api/events/{id}: one event with all columns.
 """
 
+import base64
+import json
+import os
+from dataclasses import dataclass, replace
 from datetime import date, datetime
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, AsyncIterator, NamedTuple, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 
+from api.cache import MISSING, events_cache, events_flight
 from api.deps import get_supabase
+from api.generation import generation_watcher
+from api.geo.points import parse_point
+from api.compression import add_vary, precompress
+from api.http_cache import (
+    EVENTS_CACHE_CONTROL,
+    body_etag,
+    content_etag,
+    etag_matches,
+    json_body_response,
+    not_modified,
+    set_validators,
+)
+from api.replica import event_replica
+from api.serialize import dumps
+from api.shared_cache import shared_cache
+from api.warmer import event_warmer
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+STREAM_PAGE_SIZE = MAX_PAGE_SIZE
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+STREAM_MEDIA_TYPES = (NDJSON_MEDIA_TYPE, GEOJSON_MEDIA_TYPE)
+
+EVENT_FIELDS = (
+    "id", "neighborhood_id", "title", "type", "summary", "source",
+    "location", "start_date", "end_date", "published_at", "updated_at", "created_at",
+)
+# Always selected: required by EventResponse and by the pagination cursor
+REQUIRED_FIELDS = ("id", "published_at")
+
+# Trust loader rows as already shaped like EventResponse and serialize them directly
+FAST_JSON = os.environ.get("EVENTS_FAST_JSON", "0").strip().lower() in ("1", "true", "yes")
+
 
 class EventType(str, Enum):
     ROAD_CLOSURE = "ROAD_CLOSURE"
@@ -25,6 +78,16 @@ class EventType(str, Enum):
     VOTE = "VOTE"
 
 
+class EventView(str, Enum):
+    FULL = "full"
+    MAP = "map"  # what the map needs to place and date markers; no title/summary text
+
+
+VIEW_FIELDS = {
+    EventView.MAP: ("id", "type", "location", "start_date", "end_date", "published_at"),
+}
+
+
 class EventResponse(BaseModel):
     """Response shape aligned with db.models.events.Event."""
 
@@ -44,36 +107,343 @@ class EventResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
-@router.get("/events", response_model=list[EventResponse])
-def list_events(
+def encode_cursor(row: dict[str, Any]) -> str:
+    """Opaque cursor for the keyset position after `row`: base64url JSON of [published_at, id]."""
+    raw = json.dumps([row["published_at"], str(row["id"])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Inverse of encode_cursor; raises 400 on anything that is not a cursor we issued."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, event_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        datetime.fromisoformat(str(published_at).replace("Z", "+00:00"))
+        return str(published_at), str(UUID(str(event_id)))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def select_columns(fields: Optional[str], view: EventView) -> str:
+    """
+    PostgREST select list for the requested projection.
+    Explicit fields win over view; id and published_at are always included.
+    """
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = sorted(set(requested) - set(EVENT_FIELDS))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    elif view in VIEW_FIELDS:
+        requested = list(VIEW_FIELDS[view])
+    else:
+        return "*"
+    # Keep table column order so equal projections share one select string
+    wanted = set(requested) | set(REQUIRED_FIELDS)
+    return ",".join(f for f in EVENT_FIELDS if f in wanted)
+
+
+@dataclass(frozen=True)
+class EventQuery:
+    """Normalized events query; hashable so it can key caches."""
+
+    start_date: date
+    end_date: date
+    event_type: Optional[EventType] = None
+    neighborhood_id: Optional[UUID] = None
+    columns: str = "*"
+    limit: Optional[int] = None
+    after: Optional[tuple[str, str]] = None  # decoded cursor: (published_at, id)
+
+    def cache_key(self) -> str:
+        """Stable string key, identical across worker processes."""
+        return "events:" + json.dumps(
+            [
+                self.start_date.isoformat(),
+                self.end_date.isoformat(),
+                self.event_type.value if self.event_type else None,
+                str(self.neighborhood_id) if self.neighborhood_id else None,
+                self.columns,
+                self.limit,
+                self.after,
+            ],
+            separators=(",", ":"),
+        )
+
+
+class EventPage(NamedTuple):
+    items: list[EventResponse]
+    next_cursor: Optional[str]
+    etag: str
+    body: Optional[bytes] = None  # set on the fast path instead of items, and on warmed pages
+    encoded: Optional[dict[str, bytes]] = None  # precompressed body, on warmed pages
+
+    def to_json(self) -> bytes:
+        if self.body is not None:
+            return self.body
+        return _EVENT_LIST.dump_json(self.items, exclude_unset=True)
+
+    def precompressed(self) -> "EventPage":
+        """This page with its serialized body and the body's compressed variants."""
+        body = self.to_json()
+        return self._replace(body=body, encoded=precompress(body))
+
+
+_EVENT_LIST = TypeAdapter(list[EventResponse])
+
+
+def stream_media_type(request: Request) -> Optional[str]:
+    """
+    The streamed format the Accept header prefers over plain JSON, or None.
+    Ranges are ordered by q (ties keep header order); q=0 excludes a type.
+    """
+    ranked = []
+    for i, part in enumerate(request.headers.get("accept", "").split(",")):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media_type and q > 0:
+            ranked.append((-q, i, media_type.lower()))
+    for _, _, media_type in sorted(ranked):
+        if media_type in STREAM_MEDIA_TYPES:
+            return media_type
+        if media_type in ("application/json", "application/*", "*/*"):
+            return None
+    return None
+
+
+@router.get("/events", response_model=list[EventResponse], response_model_exclude_unset=True)
+async def list_events(
+    request: Request,
+    response: Response,
     start_date: date = Query(..., description="Start of date range (inclusive), e.g. startOfDay(now)"),
     end_date: date = Query(..., description="End of date range (inclusive), e.g. endOfDay(now)"),
     event_type: Optional[EventType] = Query(None, description="Filter by EVENT_TYPE"),
     neighborhood_id: Optional[UUID] = Query(None, description="Filter by neighborhood (events in this neighborhood only)"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables keyset pagination"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,type,location"),
+    view: EventView = Query(EventView.FULL, description="Preset projection; map drops title and summary"),
+    client=Depends(get_supabase),
 ) -> list[EventResponse]:
     """
     Return events that overlap the query window [from, to].
     Overlap: (start_date is null OR start_date <= to) AND (end_date is null OR end_date >= from).
     Covers: no start + end only, start only, both, or neither (always active).
-    Ordered by published_at descending.
+    Ordered by published_at descending, then id.
+
+    With limit, returns one page and sets the X-Next-Cursor header when more rows remain.
+    fields / view narrow the select so unrequested columns are never read or serialized.
+    Pages seek past the cursor's (published_at, id) instead of using OFFSET, so deep pages
+    cost the same as the first one.
     """
+    streamed = stream_media_type(request)
+    if cursor is not None and limit is None and streamed is None:
+        raise HTTPException(status_code=400, detail="cursor requires limit")
+    query = EventQuery(
+        start_date=start_date,
+        end_date=end_date,
+        event_type=event_type,
+        neighborhood_id=neighborhood_id,
+        columns=select_columns(fields, view),
+        limit=limit,
+        after=decode_cursor(cursor) if cursor is not None else None,
+    )
+    if streamed is not None:
+        return await stream_events(client, query, streamed)
+
+    generation = await generation_watcher.current(client)
+    shared = shared_cache.get(query.cache_key(), generation)
+    if shared is not None:
+        response = json_body_response(request, shared.body, shared.etag, EVENTS_CACHE_CONTROL, shared.encoded)
+        add_vary(response.headers, "Accept")
+        if shared.next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = shared.next_cursor
+        return response
+
+    page = event_warmer.get(query, generation)
+    if page is None:
+        page = events_cache.get(query, generation)
+    if page is MISSING:
+
+        async def load() -> EventPage:
+            fetched = await fetch_events(client, query, generation)
+            events_cache.set(query, fetched, generation)
+            return fetched
+
+        page = await events_flight.do((query, generation), load)
+
+    if page.body is not None:
+        response = json_body_response(request, page.body, page.etag, EVENTS_CACHE_CONTROL, page.encoded)
+        add_vary(response.headers, "Accept")
+        if page.next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        return response
+    matched = etag_matches(request, page.etag)
+    if matched:
+        response = not_modified(matched, EVENTS_CACHE_CONTROL)
+        add_vary(response.headers, "Accept")
+        return response
+    set_validators(response, page.etag, EVENTS_CACHE_CONTROL)
+    add_vary(response.headers, "Accept")
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+
+async def fetch_events(client, query: EventQuery, generation: Optional[int] = None) -> EventPage:
+    """
+    Run one events query and shape the result page. Served from the in-memory replica when it
+    has caught up with `generation`, otherwise from PostgREST.
+    """
+    return _shape_page(await fetch_rows(client, query, generation), query)
+
+
+async def fetch_rows(client, query: EventQuery, generation: Optional[int] = None) -> list[dict[str, Any]]:
+    """Raw rows for one events query (limit + 1 when paged), from the replica or PostgREST."""
+    if event_replica.can_serve(generation):
+        return event_replica.query(
+            query.start_date,
+            query.end_date,
+            event_type=query.event_type.value if query.event_type else None,
+            neighborhood_id=query.neighborhood_id,
+            limit=query.limit,
+            after=query.after,
+            columns=None if query.columns == "*" else query.columns.split(","),
+        )
+    return await _fetch_rows_postgrest(client, query)
+
+
+async def _fetch_rows_postgrest(client, query: EventQuery) -> list[dict[str, Any]]:
     # Query window: from = start of day, to = end of day
-    query_from_iso = datetime.combine(start_date, datetime.min.time()).isoformat()
-    query_to_iso = datetime.combine(end_date, datetime.max.time()).replace(microsecond=999999).isoformat()
+    query_from_iso = datetime.combine(query.start_date, datetime.min.time()).isoformat()
+    query_to_iso = datetime.combine(query.end_date, datetime.max.time()).replace(microsecond=999999).isoformat()
 
-    client = get_supabase()
     # PostgREST: or=(cond1,cond2) with quoted timestamps for reserved chars
     q = (
         client.table("events")
-        .select("*")
+        .select(query.columns)
         .or_(f'end_date.gte."{query_from_iso}",end_date.is.null')
         .or_(f'start_date.lte."{query_to_iso}",start_date.is.null')
     )
-    if event_type is not None:
-        q = q.eq("type", event_type.value)
-    if neighborhood_id is not None:
-        q = q.eq("neighborhood_id", str(neighborhood_id))
-    q = q.order("published_at", desc=True)
-    r = q.execute()
-
-    return [EventResponse(**row) for row in (r.data or [])]
+    if query.event_type is not None:
+        q = q.eq("type", query.event_type.value)
+    if query.neighborhood_id is not None:
+        q = q.eq("neighborhood_id", str(query.neighborhood_id))
+    if query.after is not None:
+        after_published, after_id = query.after
+        # Keyset seek: rows strictly after (published_at desc, id asc)
+        q = q.or_(
+            f'published_at.lt."{after_published}",'
+            f'and(published_at.eq."{after_published}",id.gt.{after_id})'
+        )
+    q = q.order("published_at", desc=True).order("id")
+    if query.limit is not None:
+        # One extra row tells us whether another page exists
+        q = q.limit(query.limit + 1)
+    r = await q.execute()
+    return r.data or []
+
+
+def _shape_page(rows: list[dict[str, Any]], query: EventQuery, fast: Optional[bool] = None) -> EventPage:
+    next_cursor = None
+    if query.limit is not None and len(rows) > query.limit:
+        rows = rows[:query.limit]
+        next_cursor = encode_cursor(rows[-1])
+    if FAST_JSON if fast is None else fast:
+        # Rows come from our own select, so only unknown columns (select *) need dropping
+        if query.columns == "*":
+            rows = [{k: row[k] for k in EVENT_FIELDS if k in row} for row in rows]
+        body = dumps(rows)
+        etag = body_etag(body if next_cursor is None else body + next_cursor.encode())
+        return EventPage([], next_cursor, etag, body)
+    # Hash once per fetch; cache hits reuse the ETag without re-serializing
+    etag = content_etag([rows, next_cursor])
+    return EventPage([EventResponse(**row) for row in rows], next_cursor, etag)
+
+
+async def iter_event_pages(
+    client, query: EventQuery, first: Optional[list[dict[str, Any]]] = None
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Every row of the query in list order, as keyset pages of STREAM_PAGE_SIZE rows.
+    query.after is where to start and query.limit caps the total (None = whole window).
+    `first` is the first page's fetch result when the caller already has it.
+    """
+    remaining = query.limit
+    after = query.after
+    while remaining is None or remaining > 0:
+        size = STREAM_PAGE_SIZE if remaining is None else min(STREAM_PAGE_SIZE, remaining)
+        if first is not None:
+            rows, first = first, None
+        else:
+            generation = await generation_watcher.current(client)
+            rows = await fetch_rows(client, replace(query, limit=size, after=after), generation)
+        more = len(rows) > size
+        rows = rows[:size]
+        if rows:
+            yield rows
+        if not more:
+            return
+        if remaining is not None:
+            remaining -= size
+        after = (str(rows[-1]["published_at"]), str(rows[-1]["id"]))
+
+
+def _ndjson_lines(rows: list[dict[str, Any]]) -> bytes:
+    return b"".join(EventResponse(**row).model_dump_json(exclude_unset=True).encode() + b"\n" for row in rows)
+
+
+def _geojson_features(rows: list[dict[str, Any]]) -> list[str]:
+    """One GeoJSON Feature per event; geometry is null when the event has no usable location."""
+    features = []
+    for row in rows:
+        properties = EventResponse(**row).model_dump(mode="json", exclude_unset=True)
+        point = parse_point(properties.pop("location", None))
+        geometry = {"type": "Point", "coordinates": list(point)} if point is not None else None
+        feature = {"type": "Feature", "id": properties["id"], "geometry": geometry, "properties": properties}
+        features.append(json.dumps(feature, separators=(",", ":")))
+    return features
+
+
+async def stream_events(client, query: EventQuery, media_type: str) -> StreamingResponse:
+    """
+    Stream the query as NDJSON (one event per line) or a GeoJSON FeatureCollection.
+    The first page is fetched before the response starts, so upstream errors on it still
+    surface as error statuses; after that each page is written as soon as it arrives.
+    """
+    size = STREAM_PAGE_SIZE if query.limit is None else min(STREAM_PAGE_SIZE, query.limit)
+    generation = await generation_watcher.current(client)
+    first = await fetch_rows(client, replace(query, limit=size), generation)
+    pages = iter_event_pages(client, query, first)
+
+    async def ndjson() -> AsyncIterator[bytes]:
+        async for rows in pages:
+            yield _ndjson_lines(rows)
+
+    async def geojson() -> AsyncIterator[bytes]:
+        yield b'{"type":"FeatureCollection","features":['
+        separator = ""
+        async for rows in pages:
+            yield (separator + ",".join(_geojson_features(rows))).encode()
+            separator = ","
+        yield b"]}"
+
+    body = ndjson() if media_type == NDJSON_MEDIA_TYPE else geojson()
+    return StreamingResponse(body, media_type=media_type, headers={"Cache-Control": "no-store", "Vary": "Accept"})
+
+
+@router.get("/events/{event_id}", response_model=EventResponse)
+async def get_event(event_id: UUID, client=Depends(get_supabase)) -> EventResponse:
+    """
+    Return one event with all columns (including summary), e.g. when a map marker is opened.
+    """
+    r = await client.table("events").select("*").eq("id", str(event_id)).limit(1).execute()
+    if not r.data:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return EventResponse(**r.data[0])
@@ -0,0 +1,170 @@
+"""
+GET /api/events/export?format=arrow|parquet: the list_events window as typed columns, for
+analytics clients that load events into dataframes.
+
+Rows are fetched in the same keyset pages as the streamed /api/events formats and written
+as they arrive. Arrow is the IPC file format, one record batch per page. Parquet gets one
+row group per PARQUET_ROW_GROUP_ROWS rows. Both end with a footer, so clients can
+memory-map the saved result. Needs pyarrow; without it the endpoint answers 503.
+"""
+
+from dataclasses import replace
+from datetime import date
+from enum import Enum
+from typing import Any, AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from api.deps import get_supabase
+from api.generation import generation_watcher
+from api.geo.points import parse_point
+from api.replica import to_epoch_us
+from api.routes.events import STREAM_PAGE_SIZE, EventQuery, EventType, fetch_rows, iter_event_pages
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: export answers 503
+    pa = pq = None
+
+router = APIRouter()
+
+PARQUET_ROW_GROUP_ROWS = 64 * STREAM_PAGE_SIZE
+STRING_FIELDS = ("id", "neighborhood_id", "title", "summary", "source")
+TIMESTAMP_FIELDS = ("start_date", "end_date", "published_at", "updated_at", "created_at")
+# Fixed dictionary so every batch shares it (the IPC file format allows no replacement)
+TYPE_VALUES = [t.value for t in EventType]
+_TYPE_INDEX = {value: i for i, value in enumerate(TYPE_VALUES)}
+
+
+class ExportFormat(str, Enum):
+    ARROW = "arrow"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ARROW: "application/vnd.apache.arrow.file",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def export_schema() -> "pa.Schema":
+    timestamp = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            pa.field("id", pa.string(), nullable=False),
+            ("neighborhood_id", pa.string()),
+            ("title", pa.string()),
+            ("type", pa.dictionary(pa.int8(), pa.string())),
+            ("summary", pa.string()),
+            ("source", pa.string()),
+            ("lon", pa.float64()),
+            ("lat", pa.float64()),
+            ("start_date", timestamp),
+            ("end_date", timestamp),
+            pa.field("published_at", timestamp, nullable=False),
+            ("updated_at", timestamp),
+            ("created_at", timestamp),
+        ]
+    )
+
+
+def record_batch(rows: list[dict[str, Any]], schema: "pa.Schema") -> "pa.RecordBatch":
+    """One page of rows as a batch; types outside EVENT_TYPE and unusable locations become null."""
+    columns: dict[str, Any] = {}
+    for name in STRING_FIELDS:
+        columns[name] = pa.array([None if r.get(name) is None else str(r[name]) for r in rows], pa.string())
+    columns["type"] = pa.DictionaryArray.from_arrays(
+        pa.array([_TYPE_INDEX.get(r.get("type")) for r in rows], pa.int8()), pa.array(TYPE_VALUES, pa.string())
+    )
+    points = [parse_point(r.get("location")) for r in rows]
+    columns["lon"] = pa.array([p[0] if p else None for p in points], pa.float64())
+    columns["lat"] = pa.array([p[1] if p else None for p in points], pa.float64())
+    for name in TIMESTAMP_FIELDS:
+        columns[name] = pa.array([to_epoch_us(r.get(name)) for r in rows], schema.field(name).type)
+    return pa.record_batch([columns[f.name] for f in schema], schema=schema)
+
+
+class _ChunkSink:
+    """Write-only file object whose bytes are handed to the response after each write call."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+async def _write(pages: AsyncIterator[list[dict[str, Any]]], fmt: ExportFormat) -> AsyncIterator[bytes]:
+    schema = export_schema()
+    sink = _ChunkSink()
+    out = pa.PythonFile(sink, mode="w")
+    if fmt is ExportFormat.ARROW:
+        writer = pa.ipc.new_file(out, schema)
+        async for rows in pages:
+            writer.write_batch(record_batch(rows, schema))
+            yield sink.drain()
+    else:
+        writer = pq.ParquetWriter(out, schema)
+        pending: list = []
+        pending_rows = 0
+        async for rows in pages:
+            pending.append(record_batch(rows, schema))
+            pending_rows += len(rows)
+            if pending_rows >= PARQUET_ROW_GROUP_ROWS:
+                writer.write_table(pa.Table.from_batches(pending, schema))
+                pending, pending_rows = [], 0
+                yield sink.drain()
+        if pending:
+            writer.write_table(pa.Table.from_batches(pending, schema))
+    writer.close()
+    yield sink.drain()
+
+
+@router.get("/events/export")
+async def export_events(
+    format: ExportFormat = Query(..., description="arrow (IPC file) or parquet"),
+    start_date: date = Query(..., description="Start of date range (inclusive)"),
+    end_date: date = Query(..., description="End of date range (inclusive)"),
+    event_type: Optional[EventType] = Query(None, description="Filter by EVENT_TYPE"),
+    neighborhood_id: Optional[UUID] = Query(None, description="Filter by neighborhood"),
+    client=Depends(get_supabase),
+) -> StreamingResponse:
+    """
+    Return the events list_events would return for these filters, in the same order, as an
+    Arrow IPC file or a Parquet file. Timestamps are timestamp[us, UTC], type is
+    dictionary-encoded and location is split into lon/lat.
+    """
+    if pa is None:
+        raise HTTPException(status_code=503, detail="Export needs pyarrow, which is not installed")
+    query = EventQuery(start_date=start_date, end_date=end_date, event_type=event_type, neighborhood_id=neighborhood_id)
+    # First page before the response starts, so upstream errors on it surface as error statuses
+    generation = await generation_watcher.current(client)
+    first = await fetch_rows(client, replace(query, limit=STREAM_PAGE_SIZE), generation)
+    filename = f"events_{start_date.isoformat()}_{end_date.isoformat()}.{format.value}"
+    return StreamingResponse(
+        _write(iter_event_pages(client, query, first), format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+    )
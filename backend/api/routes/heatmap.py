@@ -0,0 +1,73 @@
+"""
+GET /api/events/heatmap: event counts per hexagon at one of several resolutions, summed
+from the incrementally maintained bins in api.spatial (no per-request scan of events).
+Responses are cached per worker, tagged with the replica version (bumped by every refresh,
+full reloads included).
+"""
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from api.cache import MISSING, TTLCache
+from api.replica import day_number, event_replica
+from api.routes.events import EventType
+from api.routes.spatial import parse_bbox
+from api.spatial import event_hexbins, spatial_ready
+
+router = APIRouter()
+
+heatmap_cache = TTLCache.from_env("HEATMAP_CACHE", maxsize=128, ttl=300.0)
+
+
+class HeatmapResponse(BaseModel):
+    """bins: [lng, lat, count] per non-empty hexagon, lng/lat being the hexagon centre."""
+
+    resolution: int
+    hex_size_m: float
+    bins: list[tuple[float, float, int]]
+
+
+@router.get("/events/heatmap", response_model=HeatmapResponse)
+async def event_heatmap(
+    resolution: int = Query(2, ge=0, le=4, description="Hexagon resolution, 0 (coarsest) to 4"),
+    start_date: Optional[date] = Query(None, description="Start of date range (inclusive); needs end_date"),
+    end_date: Optional[date] = Query(None, description="End of date range (inclusive); needs start_date"),
+    event_type: Optional[EventType] = Query(None, description="Filter by EVENT_TYPE"),
+    bbox: Optional[str] = Query(None, description="min_lng,min_lat,max_lng,max_lat; hexagon centres inside"),
+) -> HeatmapResponse:
+    """
+    Return located event counts binned into hexagons. An event is counted on its start_date
+    (published_at when it has none); hex_size_m is the circumradius in web-mercator metres.
+    """
+    from api.geo.hexgrid import hex_center
+
+    if (start_date is None) != (end_date is None):
+        raise HTTPException(status_code=400, detail="start_date and end_date go together")
+    box = parse_bbox(bbox) if bbox is not None else None
+    if not spatial_ready():
+        raise HTTPException(status_code=503, detail="Spatial index is not ready", headers={"Retry-After": "5"})
+
+    key = (resolution, start_date, end_date, event_type, box)
+    version = event_replica.version
+    cached = heatmap_cache.get(key, version)
+    if cached is not MISSING:
+        return cached
+
+    size = event_hexbins.sizes[resolution]
+    counts = event_hexbins.counts(
+        resolution,
+        day_number(start_date) if start_date else None,
+        day_number(end_date) if end_date else None,
+        event_type.value if event_type else None,
+    )
+    bins = []
+    for (q, r), n in counts.items():
+        lng, lat = hex_center(q, r, size)
+        if box is None or (box[0] <= lng <= box[2] and box[1] <= lat <= box[3]):
+            bins.append((round(lng, 5), round(lat, 5), n))
+    response = HeatmapResponse(resolution=resolution, hex_size_m=size, bins=bins)
+    heatmap_cache.set(key, response, version)
+    return response
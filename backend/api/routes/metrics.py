@@ -0,0 +1,46 @@
+"""
+GET /api/metrics: in-process cache counters for this worker.
+"""
+
+from fastapi import APIRouter
+
+from api.addresses import address_store
+from api.boundaries import boundary_store
+from api.cache import events_cache, events_flight, neighbourhoods_cache
+from api.changes import change_log
+from api.feed import event_feed
+from api.replica import event_replica
+from api.rollups import event_rollups
+from api.search import event_search
+from api.routes.tiles import tiles_cache
+from api.shared_cache import shared_cache
+from api.warmer import event_warmer
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict:
+    """
+    Return hit/miss/eviction counters for the events, neighbourhoods and tile caches,
+    how many event requests were coalesced onto an in-flight upstream query,
+    and the state of the background warmer, the cross-worker shared cache, the event replica
+    the neighbourhood boundary index, the event stats rollups, the live event feed, the
+    change log behind /api/events/changes, the event search index and the address index.
+    Counters are per worker process and reset on restart.
+    """
+    return {
+        "events_cache": events_cache.stats(),
+        "neighbourhoods_cache": neighbourhoods_cache.stats(),
+        "events_singleflight": events_flight.stats(),
+        "events_warmer": event_warmer.stats(),
+        "shared_cache": shared_cache.stats(),
+        "events_replica": event_replica.stats(),
+        "neighbourhood_boundaries": boundary_store.stats(),
+        "tiles_cache": tiles_cache.stats(),
+        "event_rollups": event_rollups.stats(),
+        "event_feed": event_feed.stats(),
+        "event_changes": change_log.stats(),
+        "event_search": event_search.stats() if event_search is not None else None,
+        "addresses": address_store.stats(),
+    }
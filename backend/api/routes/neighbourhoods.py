@@ -1,16 +1,38 @@
 """
 GET /api/neighbourhoods: list all neighbourhoods with id and name.
+Cached in-process (and across workers via api.shared_cache when enabled);
+responses carry a strong ETag and honour If-None-Match.
+
+GET/POST /api/neighbourhoods/locate: neighbourhood containing a point (or each of a batch
+of points), answered from the in-memory boundary index in api.boundaries.
+
+GET /api/neighbourhoods/boundaries: boundary shapes as GeoJSON, simplified for a zoom level,
+served as bytes prepared by api.boundaries.
 """
 
+from typing import NamedTuple, Optional
 from uuid import UUID
 
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field, TypeAdapter
 
+from api.boundaries import boundary_store
+from api.cache import MISSING, neighbourhoods_cache
+from api.compression import precompress
 from api.deps import get_supabase
+from api.http_cache import (
+    NEIGHBOURHOODS_CACHE_CONTROL,
+    content_etag,
+    json_body_response,
+)
+from api.shared_cache import shared_cache
 
 router = APIRouter()
 
+# The boundary seed does not bump the ingest generation; the list only expires by TTL
+LIST_KEY = "neighbourhoods"
+_LIST_GENERATION = 0
+
 
 class NeighbourhoodResponse(BaseModel):
     """Response shape: id and name from neighborhoods table."""
@@ -21,11 +43,106 @@ class NeighbourhoodResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class NeighbourhoodList(NamedTuple):
+    items: list[NeighbourhoodResponse]
+    etag: str
+    body: bytes
+    encoded: dict[str, bytes]  # precompressed body
+
+    def to_json(self) -> bytes:
+        return self.body
+
+
+_NEIGHBOURHOOD_LIST = TypeAdapter(list[NeighbourhoodResponse])
+
+
+async def fetch_neighbourhoods(client) -> NeighbourhoodList:
+    r = await client.table("neighborhoods").select("id, name").execute()
+    rows = r.data or []
+    items = [NeighbourhoodResponse(**row) for row in rows]
+    body = _NEIGHBOURHOOD_LIST.dump_json(items)
+    return NeighbourhoodList(items, content_etag(rows), body, precompress(body))
+
+
 @router.get("/neighbourhoods", response_model=list[NeighbourhoodResponse])
-def list_neighbourhoods() -> list[NeighbourhoodResponse]:
+async def list_neighbourhoods(
+    request: Request,
+    client=Depends(get_supabase),
+) -> list[NeighbourhoodResponse]:
     """
     Return all neighbourhoods from the neighborhoods table (id and name).
     """
-    client = get_supabase()
-    r = client.table("neighborhoods").select("id, name").execute()
-    return [NeighbourhoodResponse(**row) for row in (r.data or [])]
+    shared = shared_cache.get(LIST_KEY)
+    if shared is not None:
+        return json_body_response(request, shared.body, shared.etag, NEIGHBOURHOODS_CACHE_CONTROL, shared.encoded)
+
+    listing = neighbourhoods_cache.get(LIST_KEY, _LIST_GENERATION)
+    if listing is MISSING:
+        listing = await fetch_neighbourhoods(client)
+        neighbourhoods_cache.set(LIST_KEY, listing, _LIST_GENERATION)
+
+    return json_body_response(request, listing.body, listing.etag, NEIGHBOURHOODS_CACHE_CONTROL, listing.encoded)
+
+
+MAX_LOCATE_BATCH = 10_000
+
+
+class LocatePoint(BaseModel):
+    lat: float = Field(ge=-90, le=90)
+    lng: float = Field(ge=-180, le=180)
+
+
+class LocateBatch(BaseModel):
+    points: list[LocatePoint] = Field(max_length=MAX_LOCATE_BATCH)
+
+
+async def _boundaries_ready(client) -> None:
+    await boundary_store.ensure(client)
+    if not boundary_store.ready:
+        raise HTTPException(status_code=503, detail="Boundary index is not ready", headers={"Retry-After": "5"})
+
+
+@router.get("/neighbourhoods/boundaries")
+async def neighbourhood_boundaries(
+    request: Request,
+    zoom: int = Query(..., ge=0, le=22, description="Map zoom level the shapes will be drawn at"),
+    client=Depends(get_supabase),
+) -> Response:
+    """
+    Return a GeoJSON FeatureCollection of neighbourhood boundaries (properties: id, name),
+    simplified to about one pixel at this zoom. Neighbouring shapes share their simplified
+    edges, so no gaps or overlaps open between them.
+    """
+    await _boundaries_ready(client)
+    shapes = boundary_store.shapes_for(zoom)
+    return json_body_response(request, shapes.body, shapes.etag, NEIGHBOURHOODS_CACHE_CONTROL, shapes.encoded)
+
+
+@router.get("/neighbourhoods/locate", response_model=NeighbourhoodResponse)
+async def locate_neighbourhood(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    client=Depends(get_supabase),
+) -> NeighbourhoodResponse:
+    """
+    Return the neighbourhood whose boundary contains (lat, lng); 404 when none does.
+    """
+    await _boundaries_ready(client)
+    found = boundary_store.locate(lng, lat)
+    if found is None:
+        raise HTTPException(status_code=404, detail="No neighbourhood contains this point")
+    return NeighbourhoodResponse(id=found.id, name=found.name)
+
+
+@router.post("/neighbourhoods/locate", response_model=list[Optional[NeighbourhoodResponse]])
+async def locate_neighbourhoods(
+    batch: LocateBatch,
+    client=Depends(get_supabase),
+) -> list[Optional[NeighbourhoodResponse]]:
+    """
+    Locate up to 10,000 points at once. The result is aligned with `points`;
+    points outside every neighbourhood map to null.
+    """
+    await _boundaries_ready(client)
+    found = boundary_store.locate_many([p.lng for p in batch.points], [p.lat for p in batch.points])
+    return [None if b is None else NeighbourhoodResponse(id=b.id, name=b.name) for b in found]
@@ -0,0 +1,61 @@
+"""
+GET /api/events/search: full-text search over event titles and summaries, ranked by BM25
+from the in-memory index in api.search, combined with the /api/events filters.
+"""
+
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from api.replica import event_replica
+from api.routes.events import EventResponse, EventType
+from api.search import event_search, search_ready
+
+router = APIRouter()
+
+MAX_RESULTS = 100
+
+
+class SearchHit(EventResponse):
+    score: float
+
+
+class SearchResponse(BaseModel):
+    total: int
+    hits: list[SearchHit]
+
+
+@router.get("/events/search", response_model=SearchResponse, response_model_exclude_unset=True)
+async def search_events(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text; the last word also matches as a prefix"),
+    start_date: Optional[date] = Query(None, description="Start of date range (inclusive); needs end_date"),
+    end_date: Optional[date] = Query(None, description="End of date range (inclusive); needs start_date"),
+    event_type: Optional[EventType] = Query(None, description="Filter by EVENT_TYPE"),
+    neighborhood_id: Optional[UUID] = Query(None, description="Filter by neighborhood"),
+    limit: int = Query(20, ge=1, le=MAX_RESULTS, description="Results per page"),
+    offset: int = Query(0, ge=0, le=10_000, description="Results to skip"),
+) -> SearchResponse:
+    """
+    Return events whose title or summary contain every word of q, best match first, with
+    the total number of matches. The window uses the same overlap rule as /api/events.
+    Answers 503 while the event replica is disabled or still loading.
+    """
+    if (start_date is None) != (end_date is None):
+        raise HTTPException(status_code=400, detail="start_date and end_date go together")
+    if not search_ready():
+        raise HTTPException(status_code=503, detail="Event search is not ready", headers={"Retry-After": "5"})
+    mask = event_replica.filter_mask(
+        start_date,
+        end_date,
+        event_type.value if event_type else None,
+        neighborhood_id,
+    )
+    total, positions, scores = event_search.search(q, mask, limit=limit, offset=offset)
+    hits = [
+        SearchHit(**event_replica.rows[int(pos)], score=round(float(score), 4))
+        for pos, score in zip(positions, scores)
+    ]
+    return SearchResponse(total=total, hits=hits)
@@ -0,0 +1,80 @@
+"""
+GET /api/events/within: events by location, served from the in-memory grid index.
+One of:
+  bbox=min_lng,min_lat,max_lng,max_lat      events inside the box, newest first
+  lat, lng, radius_m                        events within radius_m metres, nearest first
+  lat, lng, k                               the k nearest events, nearest first
+Combines with the usual date window, event_type and neighborhood_id filters and projection.
+"""
+
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query
+
+from api.replica import event_replica
+from api.routes.events import EventResponse, EventType, EventView, select_columns
+from api.spatial import event_grid, spatial_ready
+
+router = APIRouter()
+
+MAX_RADIUS_M = 50_000
+MAX_K = 1000
+MAX_RESULTS = 5000
+
+
+def parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(v) for v in bbox.split(","))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="bbox must be min_lng,min_lat,max_lng,max_lat") from e
+    if min_lng > max_lng or min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="bbox min must not exceed max")
+    return min_lng, min_lat, max_lng, max_lat
+
+
+@router.get("/events/within", response_model=list[EventResponse], response_model_exclude_unset=True)
+async def events_within(
+    bbox: Optional[str] = Query(None, description="min_lng,min_lat,max_lng,max_lat"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius_m: Optional[float] = Query(None, gt=0, le=MAX_RADIUS_M, description="Radius in metres around lat/lng"),
+    k: Optional[int] = Query(None, ge=1, le=MAX_K, description="Number of nearest events to lat/lng"),
+    start_date: Optional[date] = Query(None, description="Start of date range (inclusive); needs end_date"),
+    end_date: Optional[date] = Query(None, description="End of date range (inclusive); needs start_date"),
+    event_type: Optional[EventType] = Query(None, description="Filter by EVENT_TYPE"),
+    neighborhood_id: Optional[UUID] = Query(None, description="Filter by neighborhood"),
+    limit: int = Query(500, ge=1, le=MAX_RESULTS, description="Max events for bbox/radius queries"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    view: EventView = Query(EventView.FULL, description="Preset projection; map drops title and summary"),
+) -> list[EventResponse]:
+    """
+    Return events located in a bbox, within a radius, or nearest to a point.
+    Events without a location are never returned.
+    """
+    has_point = lat is not None and lng is not None
+    modes = [bbox is not None, has_point and radius_m is not None, has_point and k is not None]
+    if sum(modes) != 1:
+        raise HTTPException(status_code=400, detail="Pass exactly one of: bbox, lat+lng+radius_m, lat+lng+k")
+    if (start_date is None) != (end_date is None):
+        raise HTTPException(status_code=400, detail="start_date and end_date go together")
+    columns = select_columns(fields, view)
+    if not spatial_ready():
+        raise HTTPException(status_code=503, detail="Spatial index is not ready", headers={"Retry-After": "5"})
+
+    mask = None
+    if start_date is not None or event_type is not None or neighborhood_id is not None:
+        mask = event_replica.filter_mask(
+            start_date, end_date, event_type.value if event_type else None, neighborhood_id
+        )
+    if bbox is not None:
+        positions = event_replica.in_order(event_grid.bbox(*parse_bbox(bbox), mask=mask))[:limit]
+    elif radius_m is not None:
+        positions, _ = event_grid.radius(lng, lat, radius_m, mask=mask)
+        positions = positions[:limit]
+    else:
+        positions, _ = event_grid.nearest(lng, lat, k, mask=mask)
+
+    rows = event_replica.project(positions, None if columns == "*" else columns.split(","))
+    return [EventResponse(**row) for row in rows]
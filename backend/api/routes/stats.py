@@ -0,0 +1,91 @@
+"""
+GET /api/events/stats: event counts over a window, grouped by type, neighborhood_id and/or
+source and optionally bucketed by day, week or month, answered from api.rollups.
+"""
+
+from datetime import date
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from api.replica import day_number, event_replica
+from api.rollups import GROUP_FIELDS, event_rollups
+from api.routes.events import EventType
+
+router = APIRouter()
+
+
+class StatsBucket(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class StatsRow(BaseModel):
+    """One group; bucket is the first day of its day/week/month, absent without bucketing."""
+
+    bucket: Optional[date] = None
+    type: Optional[str] = None
+    neighborhood_id: Optional[str] = None
+    source: Optional[str] = None
+    count: int
+
+
+class StatsResponse(BaseModel):
+    total: int
+    rows: list[StatsRow]
+
+
+def parse_group_by(group_by: Optional[str]) -> list[str]:
+    fields = [f.strip() for f in (group_by or "").split(",") if f.strip()]
+    unknown = sorted(set(fields) - set(GROUP_FIELDS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown group_by fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+
+@router.get("/events/stats", response_model=StatsResponse, response_model_exclude_unset=True)
+async def event_stats(
+    start_date: Optional[date] = Query(None, description="Start of date range (inclusive); needs end_date"),
+    end_date: Optional[date] = Query(None, description="End of date range (inclusive); needs start_date"),
+    group_by: Optional[str] = Query(None, description="Comma-separated: type, neighborhood_id, source"),
+    bucket: Optional[StatsBucket] = Query(None, description="Time bucket: day, week or month"),
+    event_type: Optional[EventType] = Query(None, description="Filter by EVENT_TYPE"),
+    neighborhood_id: Optional[UUID] = Query(None, description="Filter by neighborhood"),
+    source: Optional[str] = Query(None, description="Filter by source"),
+) -> StatsResponse:
+    """
+    Return event counts per group (and time bucket), ordered by bucket then count.
+    An event is counted on its start_date, or its published_at when it has none.
+    """
+    if (start_date is None) != (end_date is None):
+        raise HTTPException(status_code=400, detail="start_date and end_date go together")
+    fields = parse_group_by(group_by)
+    if not event_replica.ready:
+        raise HTTPException(status_code=503, detail="Event rollups are not ready", headers={"Retry-After": "5"})
+
+    filters = {}
+    if event_type is not None:
+        filters["type"] = event_type.value
+    if neighborhood_id is not None:
+        filters["neighborhood_id"] = str(neighborhood_id)
+    if source is not None:
+        filters["source"] = source
+    counts = event_rollups.query(
+        day_number(start_date) if start_date else None,
+        day_number(end_date) if end_date else None,
+        fields,
+        bucket.value if bucket else None,
+        filters,
+    )
+    ordered = sorted(counts.items(), key=lambda kv: (kv[0][0] or date.min, -kv[1]))
+    rows = []
+    for (start, *values), n in ordered:
+        row = StatsRow(count=n, **dict(zip(fields, values)))
+        if bucket is not None:
+            row.bucket = start
+        rows.append(row)
+    return StatsResponse(total=sum(counts.values()), rows=rows)
@@ -0,0 +1,96 @@
+"""
+GET /api/events/stream: Server-Sent Events feed of new and changed events from api.feed,
+optionally filtered by type and neighbourhood. One open connection replaces polling
+/api/events: rows are pushed only when ingest actually changed them. A client reconnecting
+with a Last-Event-ID older than the replica's generation may have missed rows in between,
+so it is sent a reset first. Every connection opens with a `hello` message carrying the
+current generation as its id, so every reconnect has a position to compare.
+"""
+
+import asyncio
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from api.feed import FeedMessage, event_feed
+from api.replica import event_replica
+from api.routes.events import EventResponse, EventType
+
+router = APIRouter()
+
+SSE_MEDIA_TYPE = "text/event-stream"
+HEARTBEAT_SECONDS = 15.0
+RETRY_MS = 5000
+
+
+def format_message(message: FeedMessage) -> bytes:
+    """
+    One SSE message per changed event (`event: upsert`, data = the event as in /api/events),
+    or `event: reset` when the client should refetch its window. id is the ingest generation.
+    """
+    if message.kind == "reset":
+        return f"id: {message.generation}\nevent: reset\ndata: {{}}\n\n".encode()
+    parts = []
+    for row in message.rows:
+        data = EventResponse(**row).model_dump_json(exclude_unset=True)
+        parts.append(f"id: {message.generation}\nevent: upsert\ndata: {data}\n\n")
+    return "".join(parts).encode()
+
+
+def missed_events(last_event_id: Optional[str], generation: int) -> bool:
+    """True when a reconnecting client's Last-Event-ID (a generation) predates `generation`."""
+    if last_event_id is None:
+        return False
+    try:
+        return int(last_event_id) < generation
+    except ValueError:
+        return True
+
+
+async def _events(
+    event_type: Optional[str], neighborhood_id: Optional[str], last_event_id: Optional[str]
+) -> AsyncIterator[bytes]:
+    # Subscribed only once the response is streamed, so a client gone before then leaks nothing
+    subscription = event_feed.subscribe(event_type, neighborhood_id)
+    try:
+        generation = event_replica.generation
+        # A message rather than a comment, so even a client that sees no upsert reconnects with an id
+        yield f"retry: {RETRY_MS}\nid: {generation}\nevent: hello\ndata: {{}}\n\n".encode()
+        if missed_events(last_event_id, generation):
+            yield format_message(FeedMessage("reset", generation, []))
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment line: keeps proxies from closing an idle connection
+                yield b": ping\n\n"
+                continue
+            yield format_message(message)
+    finally:
+        event_feed.unsubscribe(subscription)
+
+
+@router.get("/events/stream")
+async def stream_events(
+    request: Request,
+    event_type: Optional[EventType] = Query(None, description="Only events of this EVENT_TYPE"),
+    neighborhood_id: Optional[UUID] = Query(None, description="Only events in this neighborhood"),
+) -> StreamingResponse:
+    """
+    Push every event that ingest adds or changes from now on, as `upsert` messages.
+    Reconnecting with a Last-Event-ID older than the current generation gets a `reset` first.
+    Needs the event replica; answers 503 while it is disabled or still loading.
+    """
+    if not (event_replica.enabled and event_replica.ready):
+        raise HTTPException(status_code=503, detail="Event feed is not available", headers={"Retry-After": "5"})
+    return StreamingResponse(
+        _events(
+            event_type.value if event_type else None,
+            str(neighborhood_id) if neighborhood_id else None,
+            request.headers.get("last-event-id"),
+        ),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
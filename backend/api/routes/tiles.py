@@ -0,0 +1,157 @@
+"""
+GET /tiles/{z}/{x}/{y}.mvt: Mapbox Vector Tiles with two layers:
+  events          one point per event (id, title, type, start_date, end_date, neighborhood_id),
+                  from the event replica's grid index. Below DETAIL_ZOOM, events falling in
+                  the same 4x4 pixel cell are merged into the newest one with a `count`
+                  property, so a tile holds at most 64x64 points however many events exist.
+  neighbourhoods  boundary polygons (id, name), from the zoom band's simplified shapes,
+                  clipped to the tile.
+Encoded tiles are kept in an LRU (TILES_CACHE_MAXSIZE / TILES_CACHE_TTL), precompressed,
+tagged with the replica's version (bumped by every refresh, full reloads included), keyed
+by tile, filters and boundary load. A missing tile is built in a worker thread from
+snapshots of the replica, grid and shapes, so a low-zoom tile over every event does not
+hold up the event loop.
+"""
+
+import asyncio
+import copy
+from datetime import date
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from api.boundaries import boundary_store
+from api.cache import MISSING, TTLCache
+from api.deps import get_supabase
+from api.compression import precompress
+from api.geo.mvt import BUFFER, EXTENT, LayerBuilder, encode_tile, mercator_xy, tile_bounds
+from api.http_cache import EVENTS_CACHE_CONTROL, body_etag, json_body_response
+from api.replica import event_replica
+from api.routes.events import EventType
+from api.spatial import event_grid, spatial_ready
+
+try:
+    import numpy as np
+except ImportError:  # spatial_ready() stays False, so tiles answer 503
+    np = None
+
+router = APIRouter()
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+MAX_ZOOM = 22
+DETAIL_ZOOM = 14
+# Merge cell below DETAIL_ZOOM: 4 pixels of a 256px tile, in tile units
+_MERGE_CELL = EXTENT // 64
+EVENT_PROPERTIES = ["id", "title", "type", "start_date", "end_date", "neighborhood_id"]
+
+tiles_cache = TTLCache.from_env("TILES_CACHE", maxsize=4096, ttl=3600.0)
+
+
+def _to_tile(lon, lat, z: int, x: int, y: int):
+    mx, my = mercator_xy(lon, lat)
+    n = 2 ** z
+    return (mx * n - x) * EXTENT, (my * n - y) * EXTENT
+
+
+def _events_layer(z: int, x: int, y: int, mask, replica, grid) -> LayerBuilder:
+    layer = LayerBuilder("events")
+    min_lon, min_lat, max_lon, max_lat = tile_bounds(z, x, y)
+    pad_lon = (max_lon - min_lon) * BUFFER / EXTENT
+    pad_lat = (max_lat - min_lat) * BUFFER / EXTENT
+    positions = grid.bbox(min_lon - pad_lon, min_lat - pad_lat, max_lon + pad_lon, max_lat + pad_lat, mask=mask)
+    if not len(positions):
+        return layer
+    positions = replica.in_order(positions)
+    tx, ty = _to_tile(replica.lon[positions], replica.lat[positions], z, x, y)
+    tx, ty = np.rint(tx).astype(np.int64), np.rint(ty).astype(np.int64)
+    counts: Optional[np.ndarray] = None
+    if z < DETAIL_ZOOM:
+        # Newest event per cell (positions are newest first, so np.unique's first index is the newest)
+        cells = (tx // _MERGE_CELL) * (EXTENT * 4) + (ty // _MERGE_CELL)
+        _, first, counts = np.unique(cells, return_index=True, return_counts=True)
+        positions, tx, ty = positions[first], tx[first], ty[first]
+    rows = replica.project(positions, EVENT_PROPERTIES)
+    for i, row in enumerate(rows):
+        properties: dict[str, Any] = {k: (str(v) if v is not None else None) for k, v in row.items()}
+        if counts is not None and counts[i] > 1:
+            properties["count"] = int(counts[i])
+        layer.add_point(int(tx[i]), int(ty[i]), properties)
+    return layer
+
+
+def _neighbourhoods_layer(z: int, x: int, y: int, features) -> LayerBuilder:
+    layer = LayerBuilder("neighbourhoods")
+    for boundary, geometry in features:
+        parts = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+        polygons = []
+        for rings in parts:
+            projected = []
+            for ring in rings:
+                coords = np.asarray(ring[:-1], dtype=np.float64)
+                tx, ty = _to_tile(coords[:, 0], coords[:, 1], z, x, y)
+                projected.append(list(zip(tx.tolist(), ty.tolist())))
+            xs = [p[0] for p in projected[0]]
+            ys = [p[1] for p in projected[0]]
+            # Skip parts whose exterior bbox misses the buffered tile
+            if max(xs) < -BUFFER or min(xs) > EXTENT + BUFFER or max(ys) < -BUFFER or min(ys) > EXTENT + BUFFER:
+                continue
+            polygons.append(projected)
+        if polygons:
+            layer.add_polygon(polygons, {"id": boundary.id, "name": boundary.name})
+    return layer
+
+
+def build_tile(z: int, x: int, y: int, mask, replica, grid, features) -> bytes:
+    """Encoded tile; `features` are the zoom band's shapes, or None while boundaries load."""
+    layers = [_events_layer(z, x, y, mask, replica, grid)]
+    if features is not None:
+        layers.append(_neighbourhoods_layer(z, x, y, features))
+    return encode_tile(layers)
+
+
+def _build_cached(z: int, x: int, y: int, start_date, end_date, event_type, replica, grid, features):
+    """(body, ETag, precompressed variants) of a tile; runs in a worker thread."""
+    mask = None
+    if start_date is not None or event_type is not None:
+        mask = replica.filter_mask(start_date, end_date, event_type.value if event_type else None)
+    body = build_tile(z, x, y, mask, replica, grid, features)
+    return body, body_etag(body), precompress(body)
+
+
+@router.get("/tiles/{z}/{x}/{y}.mvt")
+async def get_tile(
+    request: Request,
+    z: int,
+    x: int,
+    y: int,
+    start_date: Optional[date] = Query(None, description="Start of date range (inclusive); needs end_date"),
+    end_date: Optional[date] = Query(None, description="End of date range (inclusive); needs start_date"),
+    event_type: Optional[EventType] = Query(None, description="Filter by EVENT_TYPE"),
+    client=Depends(get_supabase),
+) -> Response:
+    """
+    Return one vector tile with the `events` and `neighbourhoods` layers.
+    Date and type filters apply to the events layer.
+    """
+    if not (0 <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+    if (start_date is None) != (end_date is None):
+        raise HTTPException(status_code=400, detail="start_date and end_date go together")
+    if not spatial_ready():
+        raise HTTPException(status_code=503, detail="Spatial index is not ready", headers={"Retry-After": "5"})
+    await boundary_store.ensure(client)
+
+    key = (z, x, y, start_date, end_date, event_type, boundary_store.version)
+    version = event_replica.version
+    cached = tiles_cache.get(key, version)
+    if cached is MISSING:
+        # Snapshots taken together on the loop, so the thread sees one consistent refresh
+        features = boundary_store.shapes_for(z).features if boundary_store.ready else None
+        cached = await asyncio.to_thread(
+            _build_cached, z, x, y, start_date, end_date, event_type,
+            event_replica.snapshot(), copy.copy(event_grid), features,
+        )
+        tiles_cache.set(key, cached, version)
+
+    body, etag, encoded = cached
+    return json_body_response(request, body, etag, EVENTS_CACHE_CONTROL, encoded, media_type=MVT_MEDIA_TYPE)
@@ -0,0 +1,309 @@
+"""
+Full-text index over event titles and summaries for /api/events/search, kept up to date
+from the event replica.
+
+Text is case-folded, stripped of accents and split on word characters; a few English stop
+words are dropped. Postings are keyed by replica position, so a search combines with the
+replica's filter masks (date window, type, neighbourhood) directly.
+
+Like a Lucene index, it has two segments:
+  base   CSR postings (NumPy) over a sorted vocabulary, built on full reloads and merges
+  delta  dict postings for rows added or changed by incremental refreshes; base postings
+         of a changed row are masked out rather than rewritten
+The delta is merged into a new base once it outgrows max(MERGE_MIN_DOCS, MERGE_FRACTION of
+the base). Document frequencies count superseded base postings until then, as Lucene's
+count deleted documents until a merge. A new base (full reload or merge) is built in the
+replica's refresh thread from its new state and swapped in with it; until then searches
+keep using the old base and delta.
+
+Ranking is BM25 (k1=1.2, b=0.75), with title terms counted TITLE_WEIGHT times. Every query
+term must match; the last one also matches as a prefix (the MAX_EXPANSIONS most frequent
+terms it starts), so results follow the user as they type.
+"""
+
+import bisect
+import logging
+import math
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Optional
+
+from api.replica import event_replica, swap_in
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:  # optional: search needs the replica, which needs numpy
+    np = None
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+MAX_EXPANSIONS = 64
+MERGE_MIN_DOCS = 10_000
+MERGE_FRACTION = 0.1
+
+_WORD = re.compile(r"\w+")
+_ACCENTS = re.compile(r"[\u0300-\u036f]")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Searchable terms of a text, in order."""
+    if not text:
+        return []
+    folded = _ACCENTS.sub("", unicodedata.normalize("NFKD", text.casefold()))
+    return [t for t in _WORD.findall(folded) if t not in STOP_WORDS]
+
+
+@lru_cache(maxsize=4096)
+def _title_terms(title: Optional[str]) -> tuple[str, ...]:
+    # Titles repeat across events (311 titles come from a service catalogue)
+    return tuple(tokenize(title))
+
+
+def document_terms(row: dict[str, Any]) -> Counter:
+    """Weighted term frequencies of an event: title terms count TITLE_WEIGHT times."""
+    terms = Counter(tokenize(row.get("summary")))
+    for term in _title_terms(row.get("title")):
+        terms[term] += TITLE_WEIGHT
+    return terms
+
+
+class SearchIndex:
+    """BM25 inverted index over replica positions: a NumPy base segment plus a dict delta."""
+
+    def __init__(self) -> None:
+        self.merges = 0
+        self.searches = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._vocab: list[str] = []
+        self._term_ids: dict[str, int] = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._post_pos = np.empty(0, dtype=np.int32)
+        self._post_tf = np.empty(0, dtype=np.float32)
+        self._df = np.empty(0, dtype=np.int64)
+        self._base_size = 0
+        self._stale = np.zeros(0, dtype=bool)
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._total_len = 0.0
+        self._delta: dict[str, dict[int, float]] = {}
+        self._delta_docs: dict[int, Counter] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    # --- updates ---
+
+    def build(self, rows: list[dict[str, Any]]) -> None:
+        """Rebuild the base segment from rows in replica position order; empties the delta."""
+        self._reset()
+        term_ids: dict[str, int] = {}
+        post_term, post_pos, post_tf = [], [], []
+        doc_len = np.zeros(len(rows), dtype=np.float32)
+        for pos, row in enumerate(rows):
+            terms = document_terms(row)
+            doc_len[pos] = sum(terms.values())
+            post_term.extend([term_ids.setdefault(term, len(term_ids)) for term in terms])
+            post_pos.extend([pos] * len(terms))
+            post_tf.extend(terms.values())
+        # Renumber terms in sorted order so a prefix is a contiguous id range
+        vocab = sorted(term_ids)
+        remap = np.empty(len(vocab), dtype=np.int64)
+        for new_id, term in enumerate(vocab):
+            remap[term_ids[term]] = new_id
+        post_term = remap[np.array(post_term, dtype=np.int64)]
+        order = np.argsort(post_term, kind="stable")  # positions stay ascending per term
+        self._vocab = vocab
+        self._term_ids = {term: i for i, term in enumerate(vocab)}
+        self._df = np.bincount(post_term, minlength=len(vocab))
+        self._offsets = np.concatenate(([0], np.cumsum(self._df)))
+        self._post_pos = np.array(post_pos, dtype=np.int32)[order]
+        self._post_tf = np.array(post_tf, dtype=np.float32)[order]
+        self._base_size = len(rows)
+        self._stale = np.zeros(len(rows), dtype=bool)
+        self._doc_len = doc_len
+        self._total_len = float(doc_len.sum())
+
+    def update(self, positioned: list[tuple[int, dict[str, Any]]]) -> None:
+        """Index new or changed rows, given with their replica positions, into the delta."""
+        needed = max((pos for pos, _ in positioned), default=-1) + 1
+        if needed > len(self._doc_len):
+            grown = np.zeros(needed, dtype=np.float32)
+            grown[: len(self._doc_len)] = self._doc_len
+            self._doc_len = grown
+        for pos, row in positioned:
+            if pos < self._base_size:
+                self._stale[pos] = True
+            for term in self._delta_docs.pop(pos, ()):
+                postings = self._delta[term]
+                del postings[pos]
+                if not postings:
+                    del self._delta[term]
+            terms = document_terms(row)
+            for term, tf in terms.items():
+                self._delta.setdefault(term, {})[pos] = tf
+            self._delta_docs[pos] = terms
+            self._total_len += sum(terms.values()) - float(self._doc_len[pos])
+            self._doc_len[pos] = sum(terms.values())
+
+    def needs_merge(self, positions=()) -> bool:
+        """True when the delta, with `positions` added to it, has outgrown the base."""
+        docs = len(self._delta_docs.keys() | set(positions)) if len(positions) else len(self._delta_docs)
+        return docs > max(MERGE_MIN_DOCS, MERGE_FRACTION * self._base_size)
+
+    # --- queries ---
+
+    def _expand(self, prefix: str) -> list[str]:
+        """Up to MAX_EXPANSIONS terms starting with prefix, most frequent first."""
+        lo = bisect.bisect_left(self._vocab, prefix)
+        hi = bisect.bisect_left(self._vocab, prefix + "\U0010ffff")
+        ids = np.arange(lo, hi)
+        if len(ids) > MAX_EXPANSIONS:
+            ids = lo + np.argpartition(-self._df[lo:hi], MAX_EXPANSIONS)[:MAX_EXPANSIONS]
+        candidates = {self._vocab[i]: int(self._df[i]) for i in ids}
+        for term, postings in self._delta.items():
+            if term.startswith(prefix):
+                candidates[term] = candidates.get(term, 0) + len(postings)
+        return sorted(candidates, key=candidates.get, reverse=True)[:MAX_EXPANSIONS]
+
+    def _postings(self, term: str):
+        """(positions, weighted tf) of a term across both segments, superseded base postings removed."""
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            pos = np.empty(0, dtype=np.int32)
+            tf = np.empty(0, dtype=np.float32)
+        else:
+            lo, hi = self._offsets[term_id], self._offsets[term_id + 1]
+            pos, tf = self._post_pos[lo:hi], self._post_tf[lo:hi]
+            if self._delta_docs:
+                live = ~self._stale[pos]
+                pos, tf = pos[live], tf[live]
+        delta = self._delta.get(term)
+        if delta:
+            pos = np.concatenate((pos, np.fromiter(delta.keys(), dtype=np.int32, count=len(delta))))
+            tf = np.concatenate((tf, np.fromiter(delta.values(), dtype=np.float32, count=len(delta))))
+        return pos, tf
+
+    def _df_of(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        return (0 if term_id is None else int(self._df[term_id])) + len(self._delta.get(term, ()))
+
+    def _scored(self, expansions: list[str], n: int, avg_len: float):
+        """
+        (positions ascending, BM25 scores) of documents matching any expansion; a document
+        scores its best-matching expansion, not their sum.
+        """
+        parts, in_order = [], True
+        for expansion in expansions:
+            in_order = in_order and expansion not in self._delta
+            pos, tf = self._postings(expansion)
+            if not len(pos):
+                continue
+            df = self._df_of(expansion)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            norm = K1 * (1 - B + B * self._doc_len[pos] / avg_len)
+            parts.append((pos, idf * tf * (K1 + 1) / (tf + norm)))
+        if not parts:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        if len(parts) == 1 and in_order:
+            return parts[0]  # base postings are already sorted and unique
+        pos = np.concatenate([p for p, _ in parts])
+        score = np.concatenate([s for _, s in parts])
+        order = np.argsort(pos, kind="stable")
+        pos, score = pos[order], score[order]
+        starts = np.flatnonzero(np.r_[True, pos[1:] != pos[:-1]])
+        return pos[starts], np.maximum.reduceat(score, starts)
+
+    def search(self, query: str, mask=None, limit: int = 20, offset: int = 0, prefix: bool = True):
+        """
+        BM25 search restricted to positions where `mask` is true.
+        Returns (total matches, positions of the requested page, their scores), best first.
+        """
+        self.searches += 1
+        terms = list(dict.fromkeys(tokenize(query)))
+        n = len(self._doc_len)
+        empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        if not terms or n == 0:
+            return (0, *empty)
+        avg_len = self._total_len / n if self._total_len else 1.0
+        per_term = [
+            self._scored(self._expand(term) if prefix and i == len(terms) - 1 else [term], n, avg_len)
+            for i, term in enumerate(terms)
+        ]
+        # Intersect from the rarest term, so each step only probes the surviving candidates
+        per_term.sort(key=lambda hit: len(hit[0]))
+        matched, scores = per_term[0]
+        if mask is not None:
+            keep = mask[matched]
+            matched, scores = matched[keep], scores[keep]
+        for pos, score in per_term[1:]:
+            if not len(matched):
+                break
+            at = np.minimum(np.searchsorted(pos, matched), len(pos) - 1)
+            found = pos[at] == matched
+            matched, scores = matched[found], scores[found] + score[at[found]]
+
+        end = min(offset + limit, len(matched))
+        if offset >= end:
+            return (len(matched), *empty)
+        if end < len(matched):
+            top = np.argpartition(-scores, end - 1)[:end]
+        else:
+            top = np.arange(len(matched))
+        # Best score first; ties by position, so pages are stable
+        top = top[np.lexsort((matched[top], -scores[top]))][offset:end]
+        return len(matched), matched[top].astype(np.int64), scores[top]
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._doc_len),
+            "terms": len(self._vocab),
+            "delta_documents": len(self._delta_docs),
+            "merges": self.merges,
+            "searches": self.searches,
+        }
+
+
+event_search = SearchIndex() if np is not None else None
+
+
+def _update(rows, full: bool, replica):
+    """
+    Replica listener: builds a new base off the loop on full reloads and when the delta
+    would outgrow the base; otherwise the commit adds the changed rows to the delta.
+    """
+    positions = [] if full else [int(pos) for pos in replica.positions_of([str(row["id"]) for row in rows])]
+    if full or event_search.needs_merge(positions):
+        index = SearchIndex()
+        index.build(replica.rows)
+
+        def commit() -> None:
+            index.merges = event_search.merges + (not full)
+            index.searches = event_search.searches
+            swap_in(event_search, index)
+            logger.info("Event search index rebuilt: %s document(s)", len(event_search))
+
+        return commit
+    positioned = [(pos, replica.rows[pos]) for pos in positions]
+
+    def commit() -> None:
+        event_search.update(positioned)
+        logger.info("Event search index updated: %s document(s)", len(event_search))
+
+    return commit
+
+
+def search_ready() -> bool:
+    return event_search is not None and event_replica.ready
+
+
+if event_search is not None:
+    event_replica.subscribe(_update)
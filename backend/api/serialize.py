@@ -0,0 +1,20 @@
+"""
+JSON bytes for already-shaped rows, without building models: orjson when installed,
+else pydantic-core's compiled serializer (always available with FastAPI).
+Both emit compact UTF-8 JSON; values must be JSON types, UUID, datetime or date.
+"""
+
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # fall back to pydantic-core
+    orjson = None
+
+from pydantic_core import to_json
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return to_json(value)
@@ -0,0 +1,190 @@
+"""
+Cross-worker response cache for multi-worker uvicorn deployments.
+
+One worker (whoever holds an flock on <path>.lock) is the writer: its warmer serializes
+the warmed /api/events pages and the neighbourhood list into a snapshot file, then
+atomically renames it over SHARED_CACHE_PATH. Every worker mmaps the current snapshot
+read-only and serves response bodies as memoryview slices of it, so the bytes live once
+in the page cache no matter how many workers run, and a rename is seen by all workers
+on their next lookup. A snapshot older than the current ingest generation is not served,
+and an unreadable one is treated as absent.
+
+Snapshot layout: b"EVSC" | u32 index length | index JSON | body bytes.
+The index maps key -> [offset, length, etag, next_cursor, {encoding: [offset, length]}]
+(offsets relative to the body); the encodings are the entry's precompressed variants.
+
+Enable by setting SHARED_CACHE_PATH (preferably on tmpfs, e.g. /dev/shm/events-api.cache).
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"EVSC"
+_HEADER = struct.Struct("<4sI")
+
+
+class SharedEntry(NamedTuple):
+    body: memoryview
+    etag: str
+    next_cursor: Optional[str]
+    encoded: dict[str, memoryview]
+
+
+class SharedCache:
+    """Reader for every worker; writer for the worker holding the lock."""
+
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = path
+        self._lock_fd: Optional[int] = None
+        self._stamp: Optional[tuple[int, int]] = None
+        self._map: Optional[mmap.mmap] = None
+        self._index: dict[str, list] = {}
+        self._body_offset = 0
+        self.generation = -1
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.publishes = 0
+        self.remaps = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    @property
+    def is_writer(self) -> bool:
+        return self._lock_fd is not None
+
+    def try_become_writer(self) -> bool:
+        """Take the writer lock if no other worker holds it. Released when this process exits."""
+        if not self.enabled or self.is_writer:
+            return self.is_writer
+        import fcntl
+
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        logger.info("Worker %s is the shared cache writer", os.getpid())
+        return True
+
+    def publish(
+        self, entries: dict[str, tuple[bytes, str, Optional[str], dict[str, bytes]]], generation: int
+    ) -> None:
+        """
+        Write a complete snapshot of key -> (body, etag, next_cursor, encoded variants) and
+        swap it in atomically.
+        """
+        if not self.is_writer:
+            return
+        index: dict[str, list] = {}
+        blobs: list[bytes] = []
+        offset = 0
+        for key, (body, etag, next_cursor, encoded) in entries.items():
+            variants = {}
+            blobs.append(body)
+            at = offset + len(body)
+            for encoding, data in encoded.items():
+                variants[encoding] = [at, len(data)]
+                blobs.append(data)
+                at += len(data)
+            index[key] = [offset, len(body), etag, next_cursor, variants]
+            offset = at
+        index_bytes = json.dumps({"generation": generation, "entries": index}, separators=(",", ":")).encode()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, len(index_bytes)))
+                f.write(index_bytes)
+                for blob in blobs:
+                    f.write(blob)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.publishes += 1
+
+    def _refresh_map(self) -> bool:
+        """Map the current snapshot if the file was replaced since we last looked."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        stamp = (st.st_ino, st.st_mtime_ns)
+        if stamp == self._stamp:
+            return self._map is not None
+        try:
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_len = _HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC:
+                raise ValueError("bad magic")
+            meta = json.loads(mapped[_HEADER.size:_HEADER.size + index_len])
+            entries, generation = meta["entries"], int(meta["generation"])
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+            # Empty, truncated or foreign file: treat as absent until it is replaced
+            logger.warning("Ignoring unreadable shared cache file %s: %s", self.path, e)
+            self._map = None
+            self._index = {}
+            self._stamp = stamp
+            return False
+        # The previous map is closed by GC once in-flight responses release their views
+        self._map = mapped
+        self._index = entries
+        self.generation = generation
+        self._body_offset = _HEADER.size + index_len
+        self._stamp = stamp
+        self.remaps += 1
+        return True
+
+    def get(self, key: str, generation: Optional[int] = None) -> Optional[SharedEntry]:
+        """
+        Zero-copy view of a cached body, or None. With `generation`, a snapshot published
+        before that ingest generation is ignored (its writer may be late, or gone).
+        """
+        if not self.enabled or not self._refresh_map():
+            return None
+        if generation is not None and self.generation < generation:
+            self.stale += 1
+            return None
+        entry = self._index.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        offset, length, etag, next_cursor, variants = entry
+        view = memoryview(self._map)
+        start = self._body_offset + offset
+        encoded = {
+            encoding: view[self._body_offset + at:self._body_offset + at + size]
+            for encoding, (at, size) in variants.items()
+        }
+        self.hits += 1
+        return SharedEntry(view[start:start + length], etag, next_cursor, encoded)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "writer": self.is_writer,
+            "entries": len(self._index),
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "publishes": self.publishes,
+            "remaps": self.remaps,
+        }
+
+
+shared_cache = SharedCache(os.environ.get("SHARED_CACHE_PATH") or None)
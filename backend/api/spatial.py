@@ -0,0 +1,63 @@
+"""
+Spatial indexes over the event replica's coordinates, rebuilt after each replica refresh
+so they follow ingest:
+  event_grid      grid index for bbox/radius/kNN lookups; cell size via EVENTS_GRID_CELL_DEG
+                  (default 0.005 degrees, ~500 m)
+  event_clusters  quadtree cluster hierarchy for /api/events/clusters
+  event_hexbins   hex bin counts for /api/events/heatmap, updated from the changed rows only
+                  (rebuilt on full reloads)
+Each is built in the replica's refresh thread and swapped in with the replica's new state.
+"""
+
+import copy
+import logging
+import os
+
+from api.replica import event_replica, swap_in
+
+logger = logging.getLogger(__name__)
+
+try:
+    from api.geo.clusters import ClusterIndex
+    from api.geo.grid import GridIndex
+    from api.geo.hexgrid import HexBins
+except ImportError:  # numpy missing: the replica is disabled too
+    ClusterIndex = GridIndex = HexBins = None
+
+event_grid = GridIndex(float(os.environ.get("EVENTS_GRID_CELL_DEG", 0.005))) if GridIndex else None
+event_clusters = ClusterIndex() if ClusterIndex else None
+event_hexbins = HexBins() if HexBins else None
+
+
+def _rebuild(rows, full: bool, replica):
+    """Build the new indexes off the loop; the returned commit swaps them in."""
+    n = replica.size
+    grid = copy.copy(event_grid)
+    grid.build(replica.lon[:n], replica.lat[:n])
+    # The copy carries the version on, so prefix caches keyed by it stay correct
+    clusters = copy.copy(event_clusters)
+    clusters.build(replica.lon[:n], replica.lat[:n], replica.types)
+    if full:
+        hexbins = HexBins(event_hexbins.sizes)
+        hexbins.apply(rows)
+    else:
+        contributions = event_hexbins.contributions(rows)
+
+    def commit() -> None:
+        swap_in(event_grid, grid)
+        swap_in(event_clusters, clusters)
+        if full:
+            swap_in(event_hexbins, hexbins)
+        else:
+            event_hexbins.apply_contributions(contributions)
+        logger.info("Event spatial indexes rebuilt: %s located event(s)", len(event_grid))
+
+    return commit
+
+
+def spatial_ready() -> bool:
+    return event_grid is not None and event_replica.ready
+
+
+if event_grid is not None:
+    event_replica.subscribe(_rebuild)
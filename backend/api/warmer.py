@@ -0,0 +1,231 @@
+"""
+Background warmer: keeps the hottest /api/events queries precomputed in the API process.
+
+Warmed queries are whole-window, full-column reads for each configured day window
+(offsets from today in EVENTS_WARM_TIMEZONE, the clients' local date) across: all events, each EventType and each neighbourhood.
+They are served stale-while-revalidate: list_events returns the warmed page even while a
+newer ingest generation is being fetched, and the warmer replaces it once the refresh lands.
+Warmed pages are kept serialized and precompressed (gzip, and brotli when installed).
+With SHARED_CACHE_PATH set, only the worker holding the shared cache writer lock warms;
+it publishes the pages (and the neighbourhood list) for every worker to read.
+
+Configure via env:
+  EVENTS_WARM_ENABLED          1/0 (default 1)
+  EVENTS_WARM_WINDOWS          comma-separated start:end day offsets (default "0:0,1:1,0:6"
+                               = today, tomorrow, next 7 days)
+  EVENTS_WARM_INTERVAL         seconds between full refreshes (default 300)
+  EVENTS_WARM_CONCURRENCY      parallel upstream queries per refresh (default 4)
+  EVENTS_WARM_STARTUP_TIMEOUT  seconds startup waits for the first refresh (default 30)
+  EVENTS_WARM_TIMEZONE         IANA zone whose date is "today" (default America/Vancouver)
+"""
+
+import asyncio
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from api.generation import generation_watcher
+from api.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOWS = "0:0,1:1,0:6"
+DEFAULT_TIMEZONE = "America/Vancouver"
+
+
+def parse_windows(spec: str) -> list[tuple[int, int]]:
+    """'0:0,1:1,0:6' -> [(0, 0), (1, 1), (0, 6)]; malformed parts are skipped."""
+    windows: list[tuple[int, int]] = []
+    for part in spec.split(","):
+        try:
+            start, end = (int(x) for x in part.strip().split(":"))
+        except ValueError:
+            if part.strip():
+                logger.warning("Ignoring malformed warm window %r", part)
+            continue
+        if start <= end:
+            windows.append((start, end))
+    return windows
+
+
+def parse_timezone(name: str):
+    """IANA zone by name; UTC (with a warning) when the zone is unknown."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning("Unknown warm timezone %r; using UTC", name)
+        return timezone.utc
+
+
+def _today(tz=timezone.utc) -> date:
+    return datetime.now(tz).date()
+
+
+class EventWarmer:
+    """Owns the warmed pages and the task that refreshes them."""
+
+    def __init__(
+        self,
+        windows: list[tuple[int, int]],
+        interval: float = 300.0,
+        concurrency: int = 4,
+        enabled: bool = True,
+        startup_timeout: float = 30.0,
+        tz=timezone.utc,
+    ) -> None:
+        self.windows = windows
+        self.interval = interval
+        self.concurrency = concurrency
+        self.enabled = enabled
+        self.startup_timeout = startup_timeout
+        self.tz = tz
+        self._pages: dict = {}
+        self._generation = -1
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self.refreshes = 0
+        self.served = 0
+
+    @classmethod
+    def from_env(cls) -> "EventWarmer":
+        return cls(
+            windows=parse_windows(os.environ.get("EVENTS_WARM_WINDOWS", DEFAULT_WINDOWS)),
+            interval=float(os.environ.get("EVENTS_WARM_INTERVAL", 300)),
+            concurrency=int(os.environ.get("EVENTS_WARM_CONCURRENCY", 4)),
+            enabled=os.environ.get("EVENTS_WARM_ENABLED", "1").strip().lower() not in ("0", "false", "no"),
+            startup_timeout=float(os.environ.get("EVENTS_WARM_STARTUP_TIMEOUT", 30)),
+            tz=parse_timezone(os.environ.get("EVENTS_WARM_TIMEZONE", DEFAULT_TIMEZONE)),
+        )
+
+    def get(self, query, generation: int):
+        """
+        Warmed page for query, or None. Served even if built from an older generation
+        (stale-while-revalidate); in that case the refresh loop is woken up.
+        """
+        page = self._pages.get(query)
+        if page is None:
+            return None
+        if generation > self._generation:
+            self._wake.set()
+        self.served += 1
+        return page
+
+    def hot_queries(self, neighbourhoods) -> list:
+        from api.routes.events import EventQuery, EventType
+
+        today = _today(self.tz)
+        queries = []
+        for start, end in self.windows:
+            window = {"start_date": today + timedelta(days=start), "end_date": today + timedelta(days=end)}
+            queries.append(EventQuery(**window))
+            queries.extend(EventQuery(**window, event_type=t) for t in EventType)
+            queries.extend(EventQuery(**window, neighborhood_id=n.id) for n in neighbourhoods)
+        return queries
+
+    async def refresh(self, client) -> None:
+        """Re-fetch every hot query and swap in the new set of pages."""
+        from api.routes.events import fetch_events
+        from api.routes.neighbourhoods import fetch_neighbourhoods
+
+        generation = await generation_watcher.current(client)
+        listing = await fetch_neighbourhoods(client)
+        queries = self.hot_queries(listing.items)
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def warm(query):
+            async with sem:
+                page = await fetch_events(client, query, generation)
+                # Serialize and compress once per refresh, off the event loop
+                return query, await asyncio.to_thread(page.precompressed)
+
+        results = await asyncio.gather(*(warm(q) for q in queries), return_exceptions=True)
+        pages = dict(self._pages)
+        # Drop windows that rolled over (e.g. yesterday's "today")
+        wanted = set(queries)
+        for query in list(pages):
+            if query not in wanted:
+                del pages[query]
+        failed = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                failed += 1
+                continue
+            query, page = result
+            pages[query] = page
+        self._pages = pages
+        self._generation = generation
+        self.refreshes += 1
+        if shared_cache.is_writer:
+            self.publish(listing, generation)
+        logger.info("Warmed %s event queries (%s failed) at generation %s", len(queries) - failed, failed, generation)
+
+    def publish(self, listing, generation: int) -> None:
+        """Serialize warmed pages once and hand them to every worker through the shared cache."""
+        from api.routes.neighbourhoods import LIST_KEY
+
+        entries = {
+            query.cache_key(): (page.to_json(), page.etag, page.next_cursor, page.encoded or {})
+            for query, page in self._pages.items()
+        }
+        entries[LIST_KEY] = (listing.to_json(), listing.etag, None, listing.encoded)
+        shared_cache.publish(entries, generation)
+
+    def _should_refresh(self) -> bool:
+        """Without a shared cache every worker warms; with one, only the writer does."""
+        return not shared_cache.enabled or shared_cache.try_become_writer()
+
+    async def _run(self, client) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not self._should_refresh():
+                continue
+            try:
+                await self.refresh(client)
+            except Exception as e:
+                logger.warning("Event warm refresh failed: %s", e)
+
+    async def poll_generation(self, client) -> None:
+        """Wake the refresh loop as soon as a new ingest generation appears."""
+        while True:
+            await generation_watcher.wait(generation_watcher.poll_interval)
+            if await generation_watcher.current(client) > self._generation:
+                self._wake.set()
+
+    async def start(self, client) -> None:
+        """Warm once (bounded by startup_timeout) so a fresh deploy serves warm, then keep refreshing."""
+        if not self.enabled or not self.windows:
+            return
+        if self._should_refresh():
+            try:
+                await asyncio.wait_for(self.refresh(client), timeout=self.startup_timeout)
+            except Exception as e:
+                logger.warning("Initial event warm did not complete: %s", e)
+        self._task = asyncio.gather(self._run(client), self.poll_generation(client))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "enabled": self.enabled,
+            "queries": len(self._pages),
+            "generation": self._generation,
+            "refreshes": self.refreshes,
+            "served": self.served,
+            "interval_seconds": self.interval,
+        }
+
+
+event_warmer = EventWarmer.from_env()
@@ -0,0 +1,203 @@
+"""
+Benchmark: async request path vs the previous sync (threadpool) handlers for GET /api/events.
+
+Starts a local PostgREST stand-in that answers /rest/v1/events after a fixed upstream
+latency, then drives both API variants with 100, 500 and 1000 concurrent clients and
+reports throughput and p50/p99 latency.
+
+    cd backend && python benchmarks/bench_concurrency.py [--latency-ms 50] [--requests 2000]
+
+The "threadpool" variant mirrors the old `def list_events` handler: the sync Supabase client
+blocks one AnyIO worker thread (40 by default) for the whole PostgREST round trip.
+Each server runs in its own process; run on a multi-core host for meaningful numbers.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+import httpx
+import uvicorn
+from fastapi import Depends, FastAPI, Request
+from starlette.responses import JSONResponse
+
+CONCURRENCY_LEVELS = (100, 500, 1000)
+SAMPLE_ROW = {
+    "id": "7c9e6679-7425-40de-944b-e07fc1f90ae7",
+    "neighborhood_id": None,
+    "title": "Street Light Repair",
+    "type": "SERVICE_REQUEST",
+    "summary": "Street Light Repair happened at 100 Main St, Strathcona. Status: OPEN.",
+    "source": "311",
+    "location": {"type": "Point", "coordinates": [-123.1, 49.27]},
+    "start_date": "2026-02-01T10:00:00+00:00",
+    "end_date": None,
+    "published_at": "2026-02-01T10:00:00+00:00",
+    "updated_at": None,
+    "created_at": "2026-02-01T10:00:00+00:00",
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def postgrest_stand_in(latency_s: float, rows: int) -> FastAPI:
+    """Minimal PostgREST look-alike: every table read returns `rows` canned rows after `latency_s`."""
+    stub = FastAPI()
+    payload = [SAMPLE_ROW] * rows
+
+    @stub.get("/rest/v1/{table}")
+    async def read_table(table: str) -> JSONResponse:
+        await asyncio.sleep(latency_s)
+        return JSONResponse(payload)
+
+    return stub
+
+
+def threadpool_app() -> FastAPI:
+    """The pre-async model: sync handler + sync client, one worker thread held per request."""
+    import httpx as _httpx
+    from supabase import create_client
+    from supabase.lib.client_options import SyncClientOptions
+
+    from api.deps import PoolSettings, _credentials
+    from api.routes.events import EventResponse
+
+    bench = FastAPI()
+    settings = PoolSettings.from_env()
+    url, key = _credentials()
+    http_client = _httpx.Client(
+        limits=_httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+        ),
+        timeout=settings.timeout,
+    )
+    client = create_client(url, key, SyncClientOptions(httpx_client=http_client))
+
+    def get_client(request: Request):
+        return client
+
+    @bench.get("/api/events", response_model=list[EventResponse])
+    def list_events(client=Depends(get_client)) -> list[EventResponse]:
+        r = client.table("events").select("*").order("published_at", desc=True).execute()
+        return [EventResponse(**row) for row in (r.data or [])]
+
+    return bench
+
+
+def _serve(factory: str, port: int, env: dict[str, str]) -> None:
+    """Child-process entry point: build the named app and serve it."""
+    os.environ.update(env)
+    if factory == "async":
+        from api.main import app
+    elif factory == "threadpool":
+        app = threadpool_app()
+    else:
+        app = postgrest_stand_in(float(env["BENCH_LATENCY_S"]), int(env["BENCH_ROWS"]))
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+
+
+class _Server:
+    """Run a uvicorn server in its own process so it does not share a GIL with the load generator."""
+
+    def __init__(self, factory: str, port: int, env: dict[str, str]) -> None:
+        self.port = port
+        self.process = multiprocessing.Process(target=_serve, args=(factory, port, env), daemon=True)
+
+    def __enter__(self) -> "_Server":
+        self.process.start()
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.2):
+                    return self
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError(f"server on port {self.port} did not start")
+
+    def __exit__(self, *exc) -> None:
+        self.process.terminate()
+        self.process.join(timeout=10)
+
+
+async def _drive(base_url: str, concurrency: int, total: int) -> dict[str, float]:
+    """Fire `total` requests with at most `concurrency` in flight; return throughput and latency percentiles."""
+    latencies: list[float] = []
+    errors = 0
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    params = {"start_date": "2026-02-01", "end_date": "2026-02-01"}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def one() -> None:
+            nonlocal errors
+            async with sem:
+                t0 = time.perf_counter()
+                try:
+                    r = await client.get("/api/events", params=params)
+                    if r.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - t0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated PostgREST latency")
+    parser.add_argument("--rows", type=int, default=20, help="Rows returned per upstream query")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per concurrency level")
+    args = parser.parse_args()
+
+    stub_port = _free_port()
+    env = {
+        "SUPABASE_URL": f"http://127.0.0.1:{stub_port}",
+        "SUPABASE_SERVICE_ROLE_KEY": "bench",
+        # Size the pool like production: upstream connections, not client count, are the limit
+        "SUPABASE_POOL_MAX_CONNECTIONS": "100",
+        "SUPABASE_POOL_MAX_KEEPALIVE": "100",
+        "SUPABASE_HTTP2": "0",
+        "BENCH_LATENCY_S": str(args.latency_ms / 1000),
+        "BENCH_ROWS": str(args.rows),
+    }
+
+    with _Server("stand_in", stub_port, env):
+        print(f"{'model':<11} {'clients':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>6}")
+        for name in ("threadpool", "async"):
+            port = _free_port()
+            with _Server(name, port, env):
+                for concurrency in CONCURRENCY_LEVELS:
+                    res = asyncio.run(_drive(f"http://127.0.0.1:{port}", concurrency, args.requests))
+                    print(
+                        f"{name:<11} {concurrency:>7} {res['rps']:>9.0f} {res['p50_ms']:>9.1f} "
+                        f"{res['p99_ms']:>9.1f} {res['errors']:>6}"
+                    )
+
+if __name__ == "__main__":
+    main()
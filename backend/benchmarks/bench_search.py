@@ -0,0 +1,97 @@
+"""
+Benchmark: /api/events/search over the in-memory index (api.search).
+
+Builds the index from synthetic 311-style rows (titles from a small service catalogue,
+summaries with street addresses and local areas), then reports build time and the
+median/p95 latency of index searches, with and without a filter mask like the route's:
+
+  term      one common word
+  phrase    two words, both required
+  prefix    a partial last word, expanded against the vocabulary
+  address   house number and street
+
+    cd backend && python benchmarks/bench_search.py [--rows 100000 1000000] [--repeat 50]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+import numpy as np
+
+from api.search import SearchIndex
+
+ROW_COUNTS = (100_000, 1_000_000)
+QUERIES = {
+    "term": "graffiti",
+    "phrase": "street light",
+    "prefix": "abandoned veh",
+    "address": "1200 broadway",
+}
+TITLES = (
+    "Graffiti Removal", "Street Light Repair", "Pothole Repair", "Abandoned Vehicle",
+    "Missed Garbage Pickup", "Tree Maintenance", "Sidewalk Repair", "Noise Complaint",
+    "Water Main Break", "Illegal Dumping", "Parking Enforcement", "Sewer Backup",
+)
+STREETS = (
+    "Main St", "W Broadway", "E Hastings St", "Granville St", "Cambie St", "Commercial Dr",
+    "Kingsway", "W 4th Ave", "Fraser St", "Victoria Dr", "Oak St", "Knight St",
+)
+AREAS = (
+    "Downtown", "Kitsilano", "Strathcona", "Mount Pleasant", "Grandview-Woodland",
+    "Fairview", "Kensington-Cedar Cottage", "Hastings-Sunrise", "Riley Park", "Marpole",
+)
+STATUSES = ("OPEN", "CLOSED", "IN PROGRESS")
+
+
+def make_rows(n: int) -> list[dict]:
+    rng = random.Random(42)
+    rows = []
+    for i in range(n):
+        title = rng.choice(TITLES)
+        address = f"{rng.randint(1, 80) * 100 + rng.randint(0, 99)} {rng.choice(STREETS)}"
+        rows.append({
+            "id": str(i),
+            "title": title,
+            "summary": f"{title} happened at {address}, {rng.choice(AREAS)}. Status: {rng.choice(STATUSES)}.",
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=list(ROW_COUNTS))
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for n in args.rows:
+        rows = make_rows(n)
+        index = SearchIndex()
+        started = time.perf_counter()
+        index.build(rows)
+        print(f"{n:>9,} rows  build {time.perf_counter() - started:.1f}s  {index.stats()['terms']:,} terms")
+        # Roughly what a one-month window with a type filter keeps
+        mask = np.random.default_rng(0).random(n) < 0.1
+        for name, query in QUERIES.items():
+            for label, m in (("all", None), ("filtered", mask)):
+                times = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    total, _, _ = index.search(query, m, limit=20)
+                    times.append((time.perf_counter() - started) * 1000)
+                p95 = statistics.quantiles(times, n=20)[-1]
+                print(
+                    f"  {name:<8} {label:<9} {total:>9,} hits  "
+                    f"median {statistics.median(times):6.2f} ms  p95 {p95:6.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: GET /api/events response building, model path vs the EVENTS_FAST_JSON path.
+
+Serves the same in-memory rows through two minimal FastAPI routes, in process over
+httpx's ASGI transport (no sockets, no upstream), and reports rows/s at 10k and 100k rows:
+
+  miss  shape a freshly fetched page (_shape_page) and send it, as on a cache miss
+  hit   send a page that is already cached, as on a cache hit
+
+The model path builds EventResponse per row, hashes the rows for the ETag, and lets
+FastAPI revalidate the list against response_model and encode it. The fast path dumps the
+rows once (orjson when installed, else pydantic-core) and sends the bytes.
+
+    cd backend && python benchmarks/bench_serialization.py [--rows 10000 100000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:1")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench")
+
+import httpx
+from fastapi import FastAPI, Response
+
+from api.routes.events import EventQuery, EventResponse, _shape_page
+from api.serialize import orjson
+
+ROW_COUNTS = (10_000, 100_000)
+QUERY = EventQuery(start_date=date(2026, 1, 1), end_date=date(2026, 12, 31))
+
+
+def make_rows(n: int) -> list[dict]:
+    """Rows as PostgREST returns them: strings for UUIDs and timestamps, location as Text."""
+    base = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        at = (base - timedelta(minutes=i)).isoformat()
+        rows.append({
+            "id": str(uuid.UUID(int=i + 1)),
+            "neighborhood_id": str(uuid.UUID(int=i % 22 + 1)),
+            "title": "Street Light Repair",
+            "type": "SERVICE_REQUEST",
+            "summary": f"Street Light Repair happened at {100 + i} Main St, Strathcona. Status: OPEN.",
+            "source": "311",
+            "location": '{"type":"Point","coordinates":[-123.1,49.27]}',
+            "start_date": at,
+            "end_date": None,
+            "published_at": at,
+            "updated_at": None,
+            "created_at": at,
+        })
+    return rows
+
+
+def bench_app(rows: list[dict]) -> FastAPI:
+    app = FastAPI()
+    cached = {"model": _shape_page(rows, QUERY, fast=False), "fast": _shape_page(rows, QUERY, fast=True)}
+
+    @app.get("/model/miss", response_model=list[EventResponse], response_model_exclude_unset=True)
+    async def model_miss() -> list[EventResponse]:
+        return _shape_page(rows, QUERY, fast=False).items
+
+    @app.get("/model/hit", response_model=list[EventResponse], response_model_exclude_unset=True)
+    async def model_hit() -> list[EventResponse]:
+        return cached["model"].items
+
+    @app.get("/fast/miss")
+    async def fast_miss() -> Response:
+        return Response(_shape_page(rows, QUERY, fast=True).body, media_type="application/json")
+
+    @app.get("/fast/hit")
+    async def fast_hit() -> Response:
+        return Response(cached["fast"].body, media_type="application/json")
+
+    return app
+
+
+async def _time(client: httpx.AsyncClient, path: str, repeat: int) -> float:
+    """Best wall time of `repeat` requests (after one warm-up)."""
+    await client.get(path)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        r = await client.get(path)
+        best = min(best, time.perf_counter() - t0)
+        assert r.status_code == 200
+    return best
+
+
+async def run(row_counts: list[int], repeat: int) -> None:
+    print(f"serializer: {'orjson' if orjson is not None else 'pydantic-core'}")
+    print(f"{'rows':>8} {'case':<5} {'model rows/s':>13} {'fast rows/s':>13} {'speedup':>8}")
+    for n in row_counts:
+        app = bench_app(make_rows(n))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for case in ("miss", "hit"):
+                model = await _time(client, f"/model/{case}", repeat)
+                fast = await _time(client, f"/fast/{case}", repeat)
+                print(f"{n:>8} {case:<5} {n / model:>13,.0f} {n / fast:>13,.0f} {model / fast:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=list(ROW_COUNTS), help="Row counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed requests per case (best is reported)")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
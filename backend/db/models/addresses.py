@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, Float, Text
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.sql import func
+
+Base = declarative_base()
+
+
+class Address(Base):
+    """
+    Street addresses seen by ingest (services.ingest.addresses), for address autocomplete.
+    address: normalized form, e.g. "1200 w broadway"; label: as the source wrote it.
+    lon/lat: WGS84 position of the latest record at the address.
+    """
+
+    __tablename__ = "addresses"
+
+    address = Column(Text, primary_key=True)
+    label = Column(Text, nullable=False)
+    lon = Column(Float, nullable=False)
+    lat = Column(Float, nullable=False)
+    local_area = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=True)
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Text
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
@@ -15,6 +15,8 @@ class Event(Base):
     Normalized feed table (Supabase events).
     Schema: id, neighborhood_id (UUID), title, type, summary, source,
     location (GeoJSON Point), start_date, end_date, published_at, updated_at, created_at.
+    ingest_generation: the ingest_generations value of the load that last wrote the row, set
+    by services.ingest.load_events; the API pulls changed rows by it.
     """
 
     __tablename__ = "events"
@@ -34,3 +36,10 @@ class Event(Base):
 
     updated_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=True)
+    ingest_generation = Column(BigInteger, nullable=True)
+
+
+# Keyset pagination for GET /api/events seeks on (published_at desc, id)
+Index("ix_events_published_at_id", Event.published_at.desc(), Event.id)
+# The API replica pulls rows written since the generation it last loaded
+Index("ix_events_ingest_generation", Event.ingest_generation)
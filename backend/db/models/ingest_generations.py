@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.sql import func
+
+Base = declarative_base()
+
+
+class IngestGeneration(Base):
+    """
+    Append-only marker written by services.ingest.load_events after each upsert.
+    The API polls the latest generation to invalidate cached event responses.
+    generation: microseconds since epoch at upsert time (monotonic across runs).
+    """
+
+    __tablename__ = "ingest_generations"
+
+    generation = Column(BigInteger, primary_key=True)
+    row_count = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=True)
@@ -0,0 +1,94 @@
+"""
+Street addresses seen by ingest, kept for address autocomplete (/api/addresses/suggest).
+
+Sources that know a record's street address pass it as `address` in the event payload;
+load_events turns it into an addresses row: the normalized address (primary key), the
+address as the source wrote it, its coordinates and local area. Later records at the same
+address overwrite the coordinates, so each address keeps its latest known position.
+
+normalize_address is shared with the API, so typed prefixes and stored keys compare alike.
+"""
+
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ADDRESS_TABLE = "addresses"
+_NON_WORD = re.compile(r"[^\w/&]+")
+# Long forms -> the short form they are stored as (complete words only)
+ABBREVIATIONS = {
+    "avenue": "ave",
+    "boulevard": "blvd",
+    "court": "ct",
+    "crescent": "cres",
+    "drive": "dr",
+    "east": "e",
+    "highway": "hwy",
+    "lane": "ln",
+    "north": "n",
+    "place": "pl",
+    "road": "rd",
+    "south": "s",
+    "square": "sq",
+    "street": "st",
+    "west": "w",
+}
+
+
+def normalize_address(text: str | None, partial: bool = False) -> str:
+    """
+    Case-folded address with punctuation dropped, whitespace collapsed and common street
+    words abbreviated ("1200 West Broadway," -> "1200 w broadway").
+    With partial=True (a prefix being typed), the last word is kept as typed, and trailing
+    whitespace, which ends that word, is kept as a single space.
+    """
+    if not text:
+        return ""
+    words = _NON_WORD.sub(" ", text.casefold()).split()
+    finished = text[-1].isspace()
+    last = len(words) - 1 if partial and not finished else len(words)
+    key = " ".join(w if i == last else ABBREVIATIONS.get(w, w) for i, w in enumerate(words))
+    return key + " " if partial and finished and words else key
+
+
+def address_record(
+    address: str | None, location: dict[str, Any] | None, local_area: str | None = None
+) -> dict[str, Any] | None:
+    """addresses row for a located address, or None when the address or point is missing."""
+    key = normalize_address(address)
+    coordinates = location.get("coordinates") if isinstance(location, dict) else None
+    if not key or not coordinates or len(coordinates) < 2:
+        return None
+    try:
+        lon, lat = float(coordinates[0]), float(coordinates[1])
+    except (TypeError, ValueError):
+        return None
+    return {
+        "address": key,
+        "label": " ".join(str(address).split()),
+        "lon": lon,
+        "lat": lat,
+        "local_area": local_area.strip() if isinstance(local_area, str) and local_area.strip() else None,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def load_addresses(client, records: list[dict[str, Any]]) -> int:
+    """
+    Upsert address rows (latest record per address wins).
+    Failure is logged, not raised: the events are already loaded.
+    Returns the number of rows upserted.
+    """
+    deduped = {record["address"]: record for record in records if record}
+    if not deduped:
+        return 0
+    try:
+        client.table(ADDRESS_TABLE).upsert(list(deduped.values()), on_conflict="address").execute()
+    except Exception as e:
+        logger.warning("Could not upsert addresses: %s", e)
+        return 0
+    logger.info("Upserted %s address(es)", len(deduped))
+    return len(deduped)
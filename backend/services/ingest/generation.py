@@ -0,0 +1,57 @@
+"""
+Ingest generation marker: a cheap "data changed" signal for API caches.
+load_events bumps it after every upsert; the API compares the latest generation
+against the one its cached responses were built from.
+
+With INGEST_NOTIFY_PATH set, each bump is also appended as a JSON line to that file, a
+stand-in for Postgres LISTEN/NOTIFY when ingest and API share a filesystem: the API tails
+it and picks up new data at once instead of on its next poll.
+"""
+
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+GENERATION_TABLE = "ingest_generations"
+NOTIFY_PATH_ENV = "INGEST_NOTIFY_PATH"
+
+
+def new_generation() -> int:
+    """Microseconds since epoch: unique and increasing across ingest runs."""
+    return time.time_ns() // 1000
+
+
+def bump_generation(client, row_count: int = 0, generation: int | None = None) -> int | None:
+    """
+    Record a new generation (or `generation`, as stamped on the rows just loaded) in
+    Supabase ingest_generations.
+    Failure is logged, not raised: the events are already loaded and caches still expire by TTL.
+    Returns the generation written, or None on failure.
+    """
+    if generation is None:
+        generation = new_generation()
+    try:
+        client.table(GENERATION_TABLE).insert({"generation": generation, "row_count": row_count}).execute()
+    except Exception as e:
+        logger.warning("Could not bump ingest generation: %s", e)
+        return None
+    logger.info("Bumped ingest generation to %s", generation)
+    notify_generation(generation, row_count)
+    return generation
+
+
+def notify_generation(generation: int, row_count: int = 0) -> None:
+    """Append {"generation", "row_count"} to INGEST_NOTIFY_PATH, if set. Failure is logged, not raised."""
+    path = os.environ.get(NOTIFY_PATH_ENV)
+    if not path:
+        return
+    line = json.dumps({"generation": generation, "row_count": row_count}, separators=(",", ":")) + "\n"
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError as e:
+        logger.warning("Could not write ingest notification to %s: %s", path, e)
+
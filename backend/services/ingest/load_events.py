@@ -26,6 +26,9 @@ _load_dotenv()
 
 from supabase import create_client
 
+from services.ingest.addresses import address_record, load_addresses
+from services.ingest.generation import bump_generation, new_generation
+
 logger = logging.getLogger(__name__)
 
 # --- Event payload: exact keys sent to Supabase events table ---
@@ -49,6 +52,8 @@ class EventPayload(TypedDict, total=False):
     created_at: str | None
     # Optional: used by loader to resolve neighborhood_id (not sent to DB)
     neighborhood_name: str
+    # Optional: street address, kept in the addresses table (not sent to events)
+    address: str
 
 
 def get_supabase():
@@ -139,16 +144,26 @@ def load_events(
     id can be null so Supabase uses gen_random_uuid().
 
     Uses upsert on (title, type, location, start_date); conflicts update the existing row.
+    Payloads with an `address` and a location also upsert that address into the addresses
+    table (services.ingest.addresses) for address autocomplete.
+    Every row is stamped with this load's ingest generation (ingest_generation), and the
+    generation is bumped to it afterwards, so API caches drop responses built from older data
+    and the API replica pulls exactly the rows written since the generation it has (with
+    INGEST_NOTIFY_PATH set, the API is also notified so its live feed pushes the changes).
     Returns the number of rows upserted.
     """
     if not events:
         return 0
     client = get_supabase()
     rows: list[dict[str, Any]] = []
+    addresses: list[dict[str, Any]] = []
     for ev in events:
         if not isinstance(ev, dict):
             continue
         payload = dict(ev)
+        address = payload.pop("address", None)
+        if address:
+            addresses.append(address_record(address, payload.get("location"), payload.get("local_area")))
         if resolve_neighborhood_by_name and payload.get("neighborhood_id") is None:
             name = payload.pop("neighborhood_name", None) or payload.pop("local_area", None)
             if name:
@@ -172,7 +187,13 @@ def load_events(
 
     final_rows = list(deduped_rows.values())
     logger.info("Deduped %s event(s) to %s", len(rows), len(deduped_rows))
+    # Taken just before the upsert: readers that have seen an older generation pull these rows
+    generation = new_generation()
+    for row in final_rows:
+        row["ingest_generation"] = generation
     client.table("events").upsert(final_rows, on_conflict="title,type,location,start_date").execute()
     logger.info("Upserted %s event(s) into Supabase events", len(final_rows))
+    load_addresses(client, addresses)
+    bump_generation(client, row_count=len(final_rows), generation=generation)
     return len(final_rows)
 
@@ -1,6 +1,7 @@
 """
 Transform raw 311 API JSON into event payloads for Supabase events table.
-Output: dicts with type, start_date/end_date, location (GeoJSON), local_area for neighborhood resolution.
+Output: dicts with type, start_date/end_date, location (GeoJSON), local_area for neighborhood resolution
+and address for the address index.
 """
 
 import logging
@@ -58,7 +59,8 @@ def transform_record(raw: dict[str, Any]) -> dict[str, Any] | None:
     Convert a single raw 311 API record into an event payload dict for Supabase events.
 
     Output keys: id, neighborhood_id, title, type, summary, source, location (GeoJSON),
-    start_date, end_date, published_at, updated_at, created_at, local_area (for resolution).
+    start_date, end_date, published_at, updated_at, created_at, local_area (for resolution),
+    address (for the address index).
     """
     if not isinstance(raw, dict):
         return None
@@ -98,8 +100,9 @@ def transform_record(raw: dict[str, Any]) -> dict[str, Any] | None:
     # Action statement for frontend: "{event} happened {location}. Status: ... Closure reason: ..."
     event_label = title
     location_parts = []
-    if raw.get("address") and str(raw.get("address")).strip():
-        location_parts.append(str(raw.get("address")).strip())
+    address = str(raw.get("address")).strip() if raw.get("address") else ""
+    if address:
+        location_parts.append(address)
     if raw.get("local_area") and str(raw.get("local_area")).strip():
         location_parts.append(str(raw.get("local_area")).strip())
     if location_parts:
@@ -130,6 +133,7 @@ def transform_record(raw: dict[str, Any]) -> dict[str, Any] | None:
         "updated_at": updated_at,
         "created_at": created_at,
         "local_area": raw.get("local_area"),
+        "address": address or None,
     }
 
 
@@ -0,0 +1,8 @@
+"""Puts backend/ on sys.path, so `pytest` works from the repo root or from backend/."""
+
+import sys
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
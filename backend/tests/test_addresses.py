@@ -0,0 +1,64 @@
+"""Address normalization and autocomplete (services.ingest.addresses, api.addresses)."""
+
+import pytest
+
+from api.addresses import AddressIndex
+from services.ingest.addresses import normalize_address
+
+ROWS = [
+    {"address": normalize_address(label), "label": label, "lon": -123.1, "lat": 49.26}
+    for label in ("1200 W BROADWAY", "1250 W BROADWAY", "455 E HASTINGS ST", "3200 MAIN ST", "800 WESTMINSTER HWY")
+]
+
+
+def labels(results) -> list[str]:
+    return [a.label for a in results]
+
+
+@pytest.mark.parametrize(
+    "text, partial, key",
+    [
+        ("1200 West Broadway,", False, "1200 w broadway"),
+        ("455 East Hastings Street", False, "455 e hastings st"),
+        ("1200 West", True, "1200 west"),
+        ("1200 West ", True, "1200 w "),
+        ("", True, ""),
+    ],
+)
+def test_normalize_address(text, partial, key):
+    assert normalize_address(text, partial=partial) == key
+
+
+@pytest.fixture(scope="module")
+def index():
+    return AddressIndex(ROWS)
+
+
+@pytest.mark.parametrize(
+    "prefix, expected",
+    [
+        ("1200 w b", ["1200 W BROADWAY"]),
+        ("1200 west broadway", ["1200 W BROADWAY"]),
+        ("1200 West", ["1200 W BROADWAY"]),
+        ("455 east hastings street", ["455 E HASTINGS ST"]),
+        ("main street", ["3200 MAIN ST"]),
+    ],
+)
+def test_suggest_accepts_full_and_abbreviated_words(index, prefix, expected):
+    assert labels(index.suggest(prefix)) == expected
+
+
+def test_unfinished_last_word_is_a_prefix(index):
+    # "west" could still become "westminster", so both readings are searched
+    assert labels(index.suggest("800 west")) == ["800 WESTMINSTER HWY"]
+    assert labels(index.suggest("wes")) == ["800 WESTMINSTER HWY"]
+
+
+def test_whole_addresses_before_streets_without_duplicates(index):
+    assert labels(index.suggest("broadway")) == ["1200 W BROADWAY", "1250 W BROADWAY"]
+    assert labels(index.suggest("12")) == ["1200 W BROADWAY", "1250 W BROADWAY"]
+    assert labels(index.suggest("broadway", limit=1)) == ["1200 W BROADWAY"]
+
+
+def test_blank_prefix_matches_nothing(index):
+    assert index.suggest("  ") == []
@@ -0,0 +1,73 @@
+"""Keyset cursors (GET /api/events) and delta-sync tokens (GET /api/events/changes)."""
+
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from api.routes.changes import START, SyncToken, decode_token, encode_token
+from api.routes.events import decode_cursor, encode_cursor
+
+EVENT_ID = "0b1e4d4e-6a4c-4f43-9d51-3f0b8e9a2c11"
+
+
+def _b64(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor({"published_at": "2026-02-01T12:00:00+00:00", "id": EVENT_ID})
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("2026-02-01T12:00:00+00:00", EVENT_ID)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        _b64(["2026-02-01T12:00:00Z"]),
+        _b64(["yesterday", EVENT_ID]),
+        _b64(["2026-02-01T12:00:00Z", "not-a-uuid"]),
+        _b64({"published_at": "2026-02-01T12:00:00Z", "id": EVENT_ID}),
+    ],
+)
+def test_cursor_rejects_bad_input(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor)
+    assert e.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        SyncToken((1_700_000_000_000_000, EVENT_ID), 1_700_000_000_500_000, False, "a1b2c3"),
+        SyncToken(None, 1_700_000_000_500_000, True, "a1b2c3"),
+        SyncToken(START, 5, False, "a1b2c3"),
+    ],
+)
+def test_sync_token_round_trip(token):
+    assert decode_token(encode_token(token)) == token
+
+
+def test_sync_token_without_issuer_decodes_as_foreign():
+    token = decode_token(_b64([None, None, 5, False]))
+    assert token == SyncToken(None, 5, False, None)
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "garbage",
+        _b64([1, EVENT_ID, 5]),
+        _b64([1, "not-a-uuid", 5, False]),
+        _b64([1, EVENT_ID, "later", False]),
+        _b64([None, None, 5, "yes"]),
+        _b64([None, None, 5, False, 7]),
+        _b64([None, None, 5, False, "a1b2c3", "extra"]),
+    ],
+)
+def test_sync_token_rejects_bad_input(token):
+    with pytest.raises(HTTPException) as e:
+        decode_token(token)
+    assert e.value.status_code == 400
@@ -0,0 +1,88 @@
+"""Hand-written Mapbox Vector Tile encoding (api.geo.mvt)."""
+
+import pytest
+
+from api.geo.mvt import EXTENT, LayerBuilder, _ring_area, _varint, _zigzag
+
+
+def _read_varint(data: bytes, i: int = 0) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[i]
+        i += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            return value, i
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+@pytest.mark.parametrize(
+    "value, encoded",
+    [(0, b"\x00"), (1, b"\x01"), (127, b"\x7f"), (128, b"\x80\x01"), (300, b"\xac\x02"), (2**32, b"\x80\x80\x80\x80\x10")],
+)
+def test_varint(value, encoded):
+    assert _varint(value) == encoded
+    assert _read_varint(encoded) == (value, len(encoded))
+
+
+@pytest.mark.parametrize("value, encoded", [(0, 0), (-1, 1), (1, 2), (-2, 3), (2, 4), (-(2**31), 2**32 - 1)])
+def test_zigzag(value, encoded):
+    assert _zigzag(value) == encoded
+    assert _unzigzag(encoded) == value
+
+
+def _polygon_rings(layer: LayerBuilder) -> list[list[tuple[int, int]]]:
+    """Decode the geometry of the layer's only feature back into absolute rings."""
+    feature = layer._features[0]
+    i, fields = 0, {}
+    while i < len(feature):
+        key, i = _read_varint(feature, i)
+        length, i = _read_varint(feature, i)
+        fields[key >> 3] = feature[i:i + length] if key & 7 == 2 else length
+        i += length if key & 7 == 2 else 0
+    assert fields[3] == 3  # POLYGON
+    geometry, i = [], 0
+    while i < len(fields[4]):
+        value, i = _read_varint(fields[4], i)
+        geometry.append(value)
+    rings, x, y, i = [], 0, 0, 0
+    while i < len(geometry):
+        command, count = geometry[i] & 7, geometry[i] >> 3
+        i += 1
+        if command == 7:
+            continue
+        for _ in range(count):
+            x, y = x + _unzigzag(geometry[i]), y + _unzigzag(geometry[i + 1])
+            i += 2
+            if command == 1:
+                rings.append([(x, y)])
+            else:
+                rings[-1].append((x, y))
+    return rings
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_polygon_winding(reverse):
+    exterior = [(100, 100), (1000, 100), (1000, 1000), (100, 1000)]
+    hole = [(300, 300), (300, 600), (600, 600), (600, 300)]
+    if reverse:
+        exterior, hole = exterior[::-1], hole[::-1]
+    layer = LayerBuilder("test")
+    assert layer.add_polygon([[exterior, hole]], {"id": "a"})
+    outer, inner = _polygon_rings(layer)
+    # MVT, y down: exteriors are clockwise on screen (positive area), holes the opposite
+    assert _ring_area(outer) > 0
+    assert _ring_area(inner) < 0
+    assert sorted(outer) == sorted(exterior)
+    assert sorted(inner) == sorted(hole)
+
+
+def test_polygon_outside_tile_is_dropped():
+    layer = LayerBuilder("test")
+    far = [(EXTENT * 3, EXTENT * 3), (EXTENT * 4, EXTENT * 3), (EXTENT * 4, EXTENT * 4)]
+    assert not layer.add_polygon([[far]], {"id": "a"})
+    assert layer.encode() is None
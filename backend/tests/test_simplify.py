@@ -0,0 +1,52 @@
+"""Douglas-Peucker and arc topology of a polygon coverage (api.geo.simplify)."""
+
+from api.geo.simplify import Coverage, douglas_peucker
+
+
+def _square(x0: float, y0: float, size: float, steps: int = 1) -> dict:
+    """GeoJSON square with `steps` vertices per side."""
+    side = [i / steps for i in range(steps)]
+    ring = (
+        [(x0 + size * t, y0) for t in side]
+        + [(x0 + size, y0 + size * t) for t in side]
+        + [(x0 + size * (1 - t), y0 + size) for t in side]
+        + [(x0, y0 + size * (1 - t)) for t in side]
+    )
+    return {"type": "Polygon", "coordinates": [[*ring, ring[0]]]}
+
+
+def test_douglas_peucker_keeps_endpoints():
+    points = [(0, 0), (1, 1), (2, -1), (3, 1), (4, 0)]
+    assert douglas_peucker(points, 100) == [(0, 0), (4, 0)]
+    assert douglas_peucker(points, 0.5) == points
+    assert douglas_peucker([(0, 0), (5, 5)], 1) == [(0, 0), (5, 5)]
+
+
+def test_douglas_peucker_drops_only_near_points():
+    points = [(0, 0), (10, 1), (20, 0), (30, 50), (40, 0)]
+    assert douglas_peucker(points, 5) == [(0, 0), (20, 0), (30, 50), (40, 0)]
+
+
+def test_closed_loop_keeps_both_ends():
+    loop = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+    simplified = douglas_peucker(loop, 100)
+    assert simplified[0] == simplified[-1] == (0, 0)
+
+
+def test_shared_edge_is_one_arc():
+    # Side by side, sharing the edge x = 1; the right square lacks the shared edge's midpoints
+    coverage = Coverage([_square(0, 0, 1, steps=4), _square(1, 0, 1)])
+    left, right = coverage.rings[0][0][0], coverage.rings[1][0][0]
+    shared = {arc for arc, _ in left} & {arc for arc, _ in right}
+    assert len(shared) == 1
+    (arc,) = shared
+    # Both sides traverse it in opposite directions
+    assert dict(left)[arc] != dict(right)[arc]
+
+
+def test_shared_edge_simplifies_identically():
+    coverage = Coverage([_square(0, 0, 1, steps=8), _square(1, 0, 1, steps=8)])
+    left, right = coverage.simplified(0.3, 7)
+    edge = lambda geometry: {tuple(p) for p in geometry["coordinates"][0] if abs(p[0] - 1) < 1e-9}  # noqa: E731
+    assert edge(left) == edge(right)
+    assert {(1.0, 0.0), (1.0, 1.0)} <= edge(left)
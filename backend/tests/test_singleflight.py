@@ -0,0 +1,75 @@
+"""SingleFlight coalescing of identical in-flight calls (api.cache)."""
+
+import asyncio
+
+import pytest
+
+from api.cache import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def main():
+        flight, calls = SingleFlight(), []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "rows"
+
+        results = await asyncio.gather(*(flight.do("q", fetch) for _ in range(5)))
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(main())
+    assert results == ["rows"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_distinct_keys_and_later_calls_execute_again():
+    async def main():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0)
+            return object()
+
+        a, b = await asyncio.gather(flight.do("a", fetch), flight.do("b", fetch))
+        c = await flight.do("a", fetch)
+        return flight, a, b, c
+
+    flight, a, b, c = asyncio.run(main())
+    assert a is not b and a is not c
+    assert flight.executions == 3 and flight.coalesced == 0
+
+
+def test_error_reaches_every_waiter():
+    async def main():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        return await asyncio.gather(*(flight.do("q", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cancelled_waiter_does_not_cancel_the_call():
+    async def main():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "rows"
+
+        first = asyncio.ensure_future(flight.do("q", fetch))
+        second = asyncio.ensure_future(flight.do("q", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "rows"
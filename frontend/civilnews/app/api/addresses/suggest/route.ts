@@ -0,0 +1,42 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+export async function GET(request: NextRequest) {
+    const searchParams = request.nextUrl.searchParams;
+    const backendUrl = 'https://xhacks-2026-production.up.railway.app';
+
+    try {
+        // Forward the prefix to the backend's local address index
+        const url = `${backendUrl}/api/addresses/suggest?${searchParams.toString()}`;
+
+        const response = await fetch(url, {
+            method: 'GET',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+        });
+
+        if (!response.ok) {
+            return NextResponse.json(
+                { error: `Backend API error: ${response.status}` },
+                { status: response.status }
+            );
+        }
+
+        const data = await response.json();
+
+        return NextResponse.json(data, {
+            headers: {
+                'Cache-Control': response.headers.get('cache-control') ?? 'no-store',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type',
+            },
+        });
+    } catch (error) {
+        console.error('Proxy error:', error);
+        return NextResponse.json(
+            { error: 'Failed to fetch from backend', details: String(error) },
+            { status: 500 }
+        );
+    }
+}
@@ -8,13 +8,37 @@ export async function GET(request: NextRequest) {
         // Forward the request to the backend
         const url = `${backendUrl}/api/events?${searchParams.toString()}`;
 
+        // Revalidate with the backend's ETag so unchanged polls come back as an empty 304
+        const headers: Record<string, string> = { 'Content-Type': 'application/json' };
+        const ifNoneMatch = request.headers.get('if-none-match');
+        if (ifNoneMatch) {
+            headers['If-None-Match'] = ifNoneMatch;
+        }
+
         const response = await fetch(url, {
             method: 'GET',
-            headers: {
-                'Content-Type': 'application/json',
-            },
+            headers,
+            cache: 'no-store',
         });
 
+        const cacheHeaders: Record<string, string> = {};
+        for (const name of ['etag', 'cache-control', 'x-next-cursor']) {
+            const value = response.headers.get(name);
+            if (value) {
+                cacheHeaders[name] = value;
+            }
+        }
+
+        if (response.status === 304) {
+            return new NextResponse(null, {
+                status: 304,
+                headers: {
+                    ...cacheHeaders,
+                    'Access-Control-Allow-Origin': '*',
+                },
+            });
+        }
+
         if (!response.ok) {
             return NextResponse.json(
                 { error: `Backend API error: ${response.status}` },
@@ -27,9 +51,11 @@ export async function GET(request: NextRequest) {
         // Return the data with CORS headers
         return NextResponse.json(data, {
             headers: {
+                ...cacheHeaders,
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'GET, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type',
+                'Access-Control-Allow-Headers': 'Content-Type, If-None-Match',
+                'Access-Control-Expose-Headers': 'ETag, X-Next-Cursor',
             },
         });
     } catch (error) {
@@ -48,7 +74,7 @@ export async function OPTIONS() {
         headers: {
             'Access-Control-Allow-Origin': '*',
             'Access-Control-Allow-Methods': 'GET, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type',
+            'Access-Control-Allow-Headers': 'Content-Type, If-None-Match',
         },
     });
 }
@@ -2,8 +2,8 @@
 
 import { useState, useCallback, useRef, useEffect } from 'react';
 import { Search, MapPin, Navigation } from 'lucide-react';
-import { geocodeAddress, findNeighborhood } from '@/app/lib/geocoding';
-import type { GeocodeResult } from '@/app/lib/geocoding';
+import { geocodeAddress, findNeighborhood, suggestAddresses } from '@/app/lib/geocoding';
+import type { GeocodeResponse, GeocodeResult } from '@/app/lib/geocoding';
 import { useRouter } from 'next/navigation';
 
 interface AddressSearchProps {
@@ -39,7 +39,11 @@ export default function AddressSearch({ onLocationSelect }: AddressSearchProps)
         searchTimeout.current = setTimeout(async () => {
             setIsSearching(true);
             try {
-                const results = await geocodeAddress(value);
+                // Local address index first; Mapbox only when it has nothing
+                let results: GeocodeResponse = await suggestAddresses(value).catch(() => ({ features: [] }));
+                if (!results.features.length) {
+                    results = await geocodeAddress(value);
+                }
                 setSuggestions(results.features || []);
                 setShowSuggestions(true);
             } catch (error) {
@@ -12,6 +12,34 @@ export interface GeocodeResponse {
     features: GeocodeResult[];
 }
 
+interface AddressSuggestion {
+    address: string;
+    lon: number;
+    lat: number;
+    neighbourhood: { id: string; name: string } | null;
+}
+
+/**
+ * Suggest addresses from the backend's index of addresses seen in city data.
+ * No external calls; returns no features when the index has no match or is unavailable.
+ */
+export async function suggestAddresses(prefix: string): Promise<GeocodeResponse> {
+    const response = await fetch(`/api/addresses/suggest?prefix=${encodeURIComponent(prefix)}&limit=5`);
+
+    if (!response.ok) {
+        return { features: [] };
+    }
+
+    const suggestions: AddressSuggestion[] = await response.json();
+    return {
+        features: suggestions.map((s) => ({
+            text: s.address,
+            place_name: s.neighbourhood ? `${s.address}, ${s.neighbourhood.name}` : s.address,
+            center: [s.lon, s.lat],
+        })),
+    };
+}
+
 /**
  * Geocode an address using Mapbox Geocoding API
  */